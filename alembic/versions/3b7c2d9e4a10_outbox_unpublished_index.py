@@ -0,0 +1,32 @@
+"""outbox unpublished index
+
+Revision ID: 3b7c2d9e4a10
+Revises: f1095c4e099a
+Create Date: 2026-10-17 09:12:31.402117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '3b7c2d9e4a10'
+down_revision: Union[str, None] = 'f1095c4e099a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Partial index backing the relay's "oldest unpublished first" claim query
+    op.create_index(
+        'ix_outbox_unpublished_created_at',
+        'outbox',
+        ['created_at'],
+        unique=False,
+        postgresql_where=sa.text('published_at IS NULL'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_outbox_unpublished_created_at', table_name='outbox')
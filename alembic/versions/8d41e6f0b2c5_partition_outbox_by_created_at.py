@@ -0,0 +1,107 @@
+"""partition outbox by created_at
+
+Revision ID: 8d41e6f0b2c5
+Revises: 3b7c2d9e4a10
+Create Date: 2026-10-17 11:03:54.218760
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '8d41e6f0b2c5'
+down_revision: Union[str, None] = '3b7c2d9e4a10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PREMAKE_DAYS = 7
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE outbox RENAME TO outbox_legacy")
+    op.execute("ALTER TABLE outbox_legacy RENAME CONSTRAINT outbox_pkey TO outbox_legacy_pkey")
+    op.execute("ALTER INDEX ix_outbox_published_at RENAME TO ix_outbox_legacy_published_at")
+    op.execute("ALTER INDEX ix_outbox_unpublished_created_at RENAME TO ix_outbox_legacy_unpublished_created_at")
+
+    # The partition key must be part of the primary key
+    op.execute("""
+        CREATE TABLE outbox (
+            id UUID NOT NULL,
+            event_type VARCHAR(255) NOT NULL,
+            order_id UUID NOT NULL,
+            tenant_id VARCHAR(255) NOT NULL,
+            payload JSONB NOT NULL,
+            published_at TIMESTAMP WITH TIME ZONE,
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL,
+            CONSTRAINT outbox_pkey PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+    """)
+    op.create_index('ix_outbox_published_at', 'outbox', ['published_at'], unique=False)
+    op.create_index(
+        'ix_outbox_unpublished_created_at',
+        'outbox',
+        ['created_at'],
+        unique=False,
+        postgresql_where=sa.text('published_at IS NULL'),
+    )
+    op.execute("CREATE TABLE outbox_default PARTITION OF outbox DEFAULT")
+
+    # Daily partitions covering existing rows plus the premake window
+    op.execute(f"""
+        DO $$
+        DECLARE
+            day DATE := COALESCE(
+                (SELECT MIN(created_at AT TIME ZONE 'UTC')::date FROM outbox_legacy),
+                (now() AT TIME ZONE 'UTC')::date
+            );
+            last_day DATE := (now() AT TIME ZONE 'UTC')::date + {PREMAKE_DAYS};
+        BEGIN
+            WHILE day < last_day LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF outbox FOR VALUES FROM (%L) TO (%L)',
+                    'outbox_p' || to_char(day, 'YYYYMMDD'),
+                    day::text || ' 00:00:00+00',
+                    (day + 1)::text || ' 00:00:00+00'
+                );
+                day := day + 1;
+            END LOOP;
+        END $$;
+    """)
+
+    op.execute("""
+        INSERT INTO outbox (id, event_type, order_id, tenant_id, payload, published_at, created_at)
+        SELECT id, event_type, order_id, tenant_id, payload, published_at, created_at
+        FROM outbox_legacy
+    """)
+    op.execute("DROP TABLE outbox_legacy")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE outbox RENAME TO outbox_partitioned")
+    op.execute("ALTER TABLE outbox_partitioned RENAME CONSTRAINT outbox_pkey TO outbox_partitioned_pkey")
+    op.execute("ALTER INDEX ix_outbox_published_at RENAME TO ix_outbox_partitioned_published_at")
+    op.execute("ALTER INDEX ix_outbox_unpublished_created_at RENAME TO ix_outbox_partitioned_unpublished_created_at")
+
+    op.create_table('outbox',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('event_type', sa.String(length=255), nullable=False),
+    sa.Column('order_id', sa.UUID(), nullable=False),
+    sa.Column('tenant_id', sa.String(length=255), nullable=False),
+    sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('published_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_outbox_published_at', 'outbox', ['published_at'], unique=False)
+    op.create_index(
+        'ix_outbox_unpublished_created_at',
+        'outbox',
+        ['created_at'],
+        unique=False,
+        postgresql_where=sa.text('published_at IS NULL'),
+    )
+    op.execute("INSERT INTO outbox SELECT id, event_type, order_id, tenant_id, payload, published_at, created_at FROM outbox_partitioned")
+    op.execute("DROP TABLE outbox_partitioned")
@@ -0,0 +1,105 @@
+"""idempotency binary hash and raw response
+
+Revision ID: a7d3e9b15c62
+Revises: e4b18c7a9f52
+Create Date: 2026-10-17 18:41:12.306517
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d3e9b15c62'
+down_revision: Union[str, None] = 'e4b18c7a9f52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 5000
+
+# Fills the new columns from response_json whenever it is written, so rows
+# inserted by instances still on the previous release are converted too.
+# The backfill below reuses it by rewriting response_json in place.
+CONVERT_FUNCTION = """
+    CREATE FUNCTION idempotency_keys_convert_response_json() RETURNS trigger AS $$
+    BEGIN
+        IF NEW.response_json IS NOT NULL THEN
+            NEW.body_hash := CASE
+                WHEN NEW.response_json->>'body_hash' ~ '^[0-9a-f]{64}$'
+                THEN decode(NEW.response_json->>'body_hash', 'hex')
+                ELSE ''::bytea
+            END;
+            NEW.response_status := 201;
+            NEW.response_body := convert_to(COALESCE(NEW.response_json->'response', '{}'::jsonb)::text, 'UTF8');
+        END IF;
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+"""
+
+CONVERT_TRIGGER = """
+    CREATE TRIGGER idempotency_keys_convert_response_json
+    BEFORE INSERT OR UPDATE OF response_json ON idempotency_keys
+    FOR EACH ROW EXECUTE FUNCTION idempotency_keys_convert_response_json()
+"""
+
+BACKFILL_BATCH = sa.text("""
+    UPDATE idempotency_keys SET response_json = response_json
+    WHERE (tenant_id, key) IN (
+        SELECT tenant_id, key FROM idempotency_keys
+        WHERE body_hash IS NULL AND response_json IS NOT NULL
+        LIMIT :batch_size
+    )
+""")
+
+NEW_COLUMNS = ('body_hash', 'response_status', 'response_body')
+
+
+def upgrade() -> None:
+    # Nullable columns and a dropped NOT NULL are catalog-only changes
+    op.add_column('idempotency_keys', sa.Column('body_hash', sa.LargeBinary(), nullable=True))
+    op.add_column('idempotency_keys', sa.Column('response_status', sa.SmallInteger(), nullable=True))
+    op.add_column('idempotency_keys', sa.Column('response_body', sa.LargeBinary(), nullable=True))
+    op.alter_column('idempotency_keys', 'response_json', nullable=True)
+    op.execute(CONVERT_FUNCTION)
+    op.execute(CONVERT_TRIGGER)
+
+    # Backfill in short autocommitted batches so row locks are held briefly
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        while bind.execute(BACKFILL_BATCH, {"batch_size": BACKFILL_BATCH_SIZE}).rowcount:
+            pass
+
+        # SET NOT NULL skips its table scan when a validated CHECK already proves it;
+        # VALIDATE scans without blocking reads or writes
+        for column in NEW_COLUMNS:
+            op.execute(
+                f"ALTER TABLE idempotency_keys ADD CONSTRAINT ck_idempotency_{column}_not_null "
+                f"CHECK ({column} IS NOT NULL) NOT VALID"
+            )
+            op.execute(f"ALTER TABLE idempotency_keys VALIDATE CONSTRAINT ck_idempotency_{column}_not_null")
+            op.alter_column('idempotency_keys', column, nullable=False)
+            op.drop_constraint(f'ck_idempotency_{column}_not_null', 'idempotency_keys', type_='check')
+
+    # response_json and the trigger stay until no instance of the previous
+    # release is running; a later revision drops them.
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER idempotency_keys_convert_response_json ON idempotency_keys")
+    op.execute("DROP FUNCTION idempotency_keys_convert_response_json()")
+    # Digests taken with the current hash_body are not reproduced by the
+    # previous release, so retries of keys created since the upgrade get 409
+    # until those keys expire.
+    op.execute("""
+        UPDATE idempotency_keys
+        SET response_json = jsonb_build_object(
+            'response', CAST(convert_from(response_body, 'UTF8') AS jsonb),
+            'body_hash', encode(body_hash, 'hex')
+        )
+        WHERE response_json IS NULL
+    """)
+    op.alter_column('idempotency_keys', 'response_json', nullable=False)
+    for column in reversed(NEW_COLUMNS):
+        op.drop_column('idempotency_keys', column)
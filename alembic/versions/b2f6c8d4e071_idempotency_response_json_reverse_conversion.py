@@ -0,0 +1,110 @@
+"""idempotency response_json reverse conversion
+
+Revision ID: b2f6c8d4e071
+Revises: a7d3e9b15c62
+Create Date: 2026-10-17 21:07:45.118230
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2f6c8d4e071'
+down_revision: Union[str, None] = 'a7d3e9b15c62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 5000
+
+# Converts in both directions while both releases run. A write of
+# response_json (by the previous release, or the backfill rewriting it in
+# place) fills the new columns; a write of the new columns alone (by the
+# current release) fills response_json, so the previous release can read
+# every record. That release compares its own json.dumps digest with the
+# stored one, so it still answers 409 to retries of keys first written by
+# the current release.
+CONVERT_FUNCTION = """
+    CREATE OR REPLACE FUNCTION idempotency_keys_convert_response_json() RETURNS trigger AS $$
+    BEGIN
+        IF NEW.response_json IS NOT NULL AND (
+            TG_OP = 'INSERT'
+            OR NEW.body_hash IS NULL
+            OR NEW.response_json IS DISTINCT FROM OLD.response_json
+        ) THEN
+            NEW.body_hash := CASE
+                WHEN NEW.response_json->>'body_hash' ~ '^[0-9a-f]{64}$'
+                THEN decode(NEW.response_json->>'body_hash', 'hex')
+                ELSE ''::bytea
+            END;
+            NEW.response_status := 201;
+            NEW.response_body := convert_to(COALESCE(NEW.response_json->'response', '{}'::jsonb)::text, 'UTF8');
+        ELSIF NEW.body_hash IS NOT NULL AND NEW.response_status = 201 THEN
+            NEW.response_json := jsonb_build_object(
+                'response', CAST(convert_from(NEW.response_body, 'UTF8') AS jsonb),
+                'body_hash', encode(NEW.body_hash, 'hex')
+            );
+        END IF;
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+"""
+
+CONVERT_TRIGGER = """
+    CREATE TRIGGER idempotency_keys_convert_response_json
+    BEFORE INSERT OR UPDATE OF response_json, body_hash, response_status, response_body ON idempotency_keys
+    FOR EACH ROW EXECUTE FUNCTION idempotency_keys_convert_response_json()
+"""
+
+# Records written by the current release before this revision
+BACKFILL_BATCH = sa.text("""
+    UPDATE idempotency_keys SET body_hash = body_hash
+    WHERE (tenant_id, key) IN (
+        SELECT tenant_id, key FROM idempotency_keys
+        WHERE response_json IS NULL AND response_status = 201
+        LIMIT :batch_size
+    )
+""")
+
+PREVIOUS_CONVERT_FUNCTION = """
+    CREATE OR REPLACE FUNCTION idempotency_keys_convert_response_json() RETURNS trigger AS $$
+    BEGIN
+        IF NEW.response_json IS NOT NULL THEN
+            NEW.body_hash := CASE
+                WHEN NEW.response_json->>'body_hash' ~ '^[0-9a-f]{64}$'
+                THEN decode(NEW.response_json->>'body_hash', 'hex')
+                ELSE ''::bytea
+            END;
+            NEW.response_status := 201;
+            NEW.response_body := convert_to(COALESCE(NEW.response_json->'response', '{}'::jsonb)::text, 'UTF8');
+        END IF;
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+"""
+
+PREVIOUS_CONVERT_TRIGGER = """
+    CREATE TRIGGER idempotency_keys_convert_response_json
+    BEFORE INSERT OR UPDATE OF response_json ON idempotency_keys
+    FOR EACH ROW EXECUTE FUNCTION idempotency_keys_convert_response_json()
+"""
+
+
+def upgrade() -> None:
+    op.execute("DROP TRIGGER idempotency_keys_convert_response_json ON idempotency_keys")
+    op.execute(CONVERT_FUNCTION)
+    op.execute(CONVERT_TRIGGER)
+
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        while bind.execute(BACKFILL_BATCH, {"batch_size": BACKFILL_BATCH_SIZE}).rowcount:
+            pass
+
+
+def downgrade() -> None:
+    # response_json filled by this revision stays; the previous revision's
+    # downgrade only rebuilds rows where it is NULL
+    op.execute("DROP TRIGGER idempotency_keys_convert_response_json ON idempotency_keys")
+    op.execute(PREVIOUS_CONVERT_FUNCTION)
+    op.execute(PREVIOUS_CONVERT_TRIGGER)
@@ -0,0 +1,45 @@
+"""orders list filter indexes
+
+Revision ID: c6a9f2e17d38
+Revises: 8d41e6f0b2c5
+Create Date: 2026-10-17 14:22:08.531904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'c6a9f2e17d38'
+down_revision: Union[str, None] = '8d41e6f0b2c5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Built concurrently so large tenants keep writing while the indexes build
+    with op.get_context().autocommit_block():
+        # Status filter: keyset order within (tenant, status); amounts checked in the index
+        op.create_index(
+            'ix_orders_tenant_status_created_id',
+            'orders',
+            ['tenant_id', 'status', 'created_at', 'id', 'total_cents'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        # Amount filters: only priced (confirmed/closed) orders, in keyset order
+        op.create_index(
+            'ix_orders_tenant_priced_created_id',
+            'orders',
+            ['tenant_id', 'created_at', 'id', 'total_cents'],
+            unique=False,
+            postgresql_where=sa.text('total_cents IS NOT NULL'),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_orders_tenant_priced_created_id', table_name='orders', postgresql_concurrently=True)
+        op.drop_index('ix_orders_tenant_status_created_id', table_name='orders', postgresql_concurrently=True)
@@ -0,0 +1,45 @@
+"""tenant order stats
+
+Revision ID: e4b18c7a9f52
+Revises: c6a9f2e17d38
+Create Date: 2026-10-17 16:05:41.772013
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4b18c7a9f52'
+down_revision: Union[str, None] = 'c6a9f2e17d38'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'tenant_order_stats',
+        sa.Column('tenant_id', sa.String(length=255), nullable=False),
+        sa.Column(
+            'status',
+            postgresql.ENUM('DRAFT', 'CONFIRMED', 'CLOSED', name='orderstatus', create_type=False),
+            nullable=False,
+        ),
+        sa.Column('order_count', sa.BigInteger(), nullable=False),
+        sa.Column('total_cents', sa.BigInteger(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('tenant_id', 'status'),
+    )
+    # Backfill; writes racing with it are corrected by app.workers.reconcile_order_stats
+    op.execute("""
+        INSERT INTO tenant_order_stats (tenant_id, status, order_count, total_cents, updated_at)
+        SELECT tenant_id, status, count(*), COALESCE(sum(total_cents), 0), now()
+        FROM orders
+        GROUP BY tenant_id, status
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('tenant_order_stats')
@@ -6,6 +6,7 @@ tenant.py
 from typing import Annotated
 from fastapi import Header
 from app.core.exceptions import ValidationError
+from app.core.logging import set_tenant_id
 
 
 async def get_tenant_id(
@@ -14,4 +15,5 @@ async def get_tenant_id(
     """Extract tenant ID from X-Tenant-Id header."""
     if not x_tenant_id:
         raise ValidationError("X-Tenant-Id header is required")
+    set_tenant_id(x_tenant_id)
     return x_tenant_id
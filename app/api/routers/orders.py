@@ -3,40 +3,104 @@ Orders router
 orders.py
 """
 
+from datetime import datetime
 from typing import Annotated, Optional
-from fastapi import APIRouter, Depends, Query, Response, Body
+from fastapi import APIRouter, Depends, Header, Query, Response, Body
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
+from app.core.responses import FastJSONResponse
+from app.db.routing import CONSISTENCY_TOKEN_HEADER
 from app.db.session import get_db
 from app.api.dependencies import get_tenant_id, get_idempotency_key, get_if_match
-from app.schemas.order import DraftOrderResponse, OrderResponse, ConfirmOrderRequest, PaginatedOrdersResponse, ClosedOrderResponse
-from app.services import OrderService, get_order_service
+from app.schemas.order import DraftOrderResponse, OrderResponse, OrderDetailResponse, ConfirmOrderRequest, PaginatedOrdersResponse, ClosedOrderResponse
+from app.schemas.order import BatchCreateOrdersRequest, BatchCreateOrdersResponse
+from app.schemas.order import BulkConfirmOrdersRequest, BulkCloseOrdersRequest, BulkTransitionResponse, OrderStatsResponse
+from app.schemas.serializers import serialize_closed_order, serialize_order, serialize_order_detail, serialize_paginated_orders
+from app.utils.etag import make_etag, if_none_match_matches
+from app.models.order import OrderStatus
+from app.services import OrderService, get_order_service, get_read_order_service
 
 router = APIRouter(prefix="/orders", tags=["orders"])
 
 
+async def _consistency_headers(service: OrderService) -> dict:
+    """Headers carrying the read-your-writes token after a write (empty without replicas)."""
+    token = await service.consistency_token()
+    return {CONSISTENCY_TOKEN_HEADER: token} if token else {}
+
+
 @router.post("", response_model=DraftOrderResponse)
 async def create_order(
-    response: Response,
     tenant_id: Annotated[str, Depends(get_tenant_id)],
     idempotency_key: Annotated[str, Depends(get_idempotency_key)],
     service: Annotated[OrderService, Depends(get_order_service)],
     body: dict = Body(default={}),
 ):
     """Create draft order with idempotency."""
-    order_data, status_code = await service.create_order_idempotent(
+    response_body, status_code = await service.create_order_idempotent(
         tenant_id=tenant_id,
         key=idempotency_key,
         body=body
     )
     
-    
-    response.status_code = status_code
-    return order_data
+    # Serialized once when the order was created; replays send the stored bytes
+    headers = await _consistency_headers(service)
+    return Response(response_body, status_code=status_code, media_type="application/json", headers=headers)
+
+
+@router.post(":batch", response_model=BatchCreateOrdersResponse)
+async def create_orders_batch(
+    response: Response,
+    request: BatchCreateOrdersRequest,
+    tenant_id: Annotated[str, Depends(get_tenant_id)],
+    service: Annotated[OrderService, Depends(get_order_service)],
+):
+    """Create many draft orders with per-item idempotency keys."""
+    results = await service.create_orders_batch(
+        tenant_id=tenant_id,
+        items=[(item.idempotencyKey, item.body) for item in request.items]
+    )
+    response.headers.update(await _consistency_headers(service))
+    return BatchCreateOrdersResponse(results=results)
+
+
+@router.patch(":confirm", response_model=BulkTransitionResponse)
+async def bulk_confirm_orders(
+    response: Response,
+    request: BulkConfirmOrdersRequest,
+    tenant_id: Annotated[str, Depends(get_tenant_id)],
+    service: Annotated[OrderService, Depends(get_order_service)],
+):
+    """Confirm many orders, each with its expected version."""
+    results = await service.bulk_confirm_orders(
+        tenant_id=tenant_id,
+        items=[(item.id, item.version, item.totalCents) for item in request.items]
+    )
+    response.headers.update(await _consistency_headers(service))
+    return BulkTransitionResponse(results=results)
+
+
+@router.post(":close", response_model=BulkTransitionResponse)
+async def bulk_close_orders(
+    response: Response,
+    request: BulkCloseOrdersRequest,
+    tenant_id: Annotated[str, Depends(get_tenant_id)],
+    service: Annotated[OrderService, Depends(get_order_service)],
+):
+    """Close many confirmed orders and create their outbox entries."""
+    results = await service.bulk_close_orders(
+        tenant_id=tenant_id,
+        order_ids=request.ids
+    )
+    response.headers.update(await _consistency_headers(service))
+    return BulkTransitionResponse(results=results)
 
 
 @router.patch("/{order_id}/confirm", response_model=OrderResponse)
 async def confirm_order(
+    response: Response,
     order_id: str,
     request: ConfirmOrderRequest,
     tenant_id: Annotated[str, Depends(get_tenant_id)],
@@ -50,12 +114,16 @@ async def confirm_order(
         expected_version=expected_version,
         total_cents=request.totalCents
     )
-   
+    headers = await _consistency_headers(service)
+    if settings.fast_json_responses:
+        return FastJSONResponse(serialize_order(result), headers=headers)
+    response.headers.update(headers)
     return result
 
 
 @router.post("/{order_id}/close", response_model=ClosedOrderResponse)
 async def close_order(
+    response: Response,
     order_id: str,
     tenant_id: Annotated[str, Depends(get_tenant_id)],
     service: Annotated[OrderService, Depends(get_order_service)],
@@ -65,20 +133,98 @@ async def close_order(
         order_id=order_id,
         tenant_id=tenant_id
     )
+    headers = await _consistency_headers(service)
+    if settings.fast_json_responses:
+        return FastJSONResponse(serialize_closed_order(result), headers=headers)
+    response.headers.update(headers)
     return result
 
 
 @router.get("", response_model=PaginatedOrdersResponse)
 async def list_orders(
     tenant_id: Annotated[str, Depends(get_tenant_id)],
-    service: Annotated[OrderService, Depends(get_order_service)],
+    service: Annotated[OrderService, Depends(get_read_order_service)],
     limit: int = Query(default=10, ge=1, le=100),
-    cursor: Optional[str] = Query(default=None)
+    cursor: Optional[str] = Query(default=None),
+    status: Optional[OrderStatus] = Query(default=None),
+    createdFrom: Optional[datetime] = Query(default=None),
+    createdTo: Optional[datetime] = Query(default=None),
+    minTotalCents: Optional[int] = Query(default=None, ge=0),
+    maxTotalCents: Optional[int] = Query(default=None, ge=0),
+    x_consistency_token: Annotated[str | None, Header()] = None,
 ):
-    """List orders with keyset pagination."""
+    """List orders with keyset pagination and optional filters (served by a replica when configured)."""
     items, next_cursor = await service.list_orders(
         tenant_id=tenant_id,
         limit=limit,
-        cursor=cursor
+        cursor=cursor,
+        # Read-your-writes reads skip the first-page cache
+        use_cache=x_consistency_token is None,
+        status=status,
+        created_from=createdFrom,
+        created_to=createdTo,
+        min_total_cents=minTotalCents,
+        max_total_cents=maxTotalCents
     )
+    if settings.fast_json_responses:
+        return FastJSONResponse(serialize_paginated_orders({"items": items, "nextCursor": next_cursor}))
     return PaginatedOrdersResponse(items=items, nextCursor=next_cursor)
+
+
+@router.get("/export")
+async def export_orders(
+    tenant_id: Annotated[str, Depends(get_tenant_id)],
+    service: Annotated[OrderService, Depends(get_read_order_service)],
+    format: str = Query(default="ndjson", pattern="^(ndjson|csv)$"),
+    after: Optional[str] = Query(default=None),
+    status: Optional[OrderStatus] = Query(default=None),
+    createdFrom: Optional[datetime] = Query(default=None),
+    createdTo: Optional[datetime] = Query(default=None),
+):
+    """Stream all orders of a tenant as NDJSON or CSV."""
+    chunks = await service.export_orders(
+        tenant_id=tenant_id,
+        fmt=format,
+        after=after,
+        status=status,
+        created_from=createdFrom,
+        created_to=createdTo
+    )
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(chunks, media_type=media_type)
+
+
+@router.get("/stats", response_model=OrderStatsResponse)
+async def get_order_stats(
+    tenant_id: Annotated[str, Depends(get_tenant_id)],
+    service: Annotated[OrderService, Depends(get_read_order_service)],
+    estimate: bool = Query(default=False),
+):
+    """Order counts and total_cents sums per status, read from per-tenant counters."""
+    return await service.get_stats(tenant_id, estimate=estimate)
+
+
+# Declared after /export and /stats so those paths are not captured as an order id
+@router.get("/{order_id}", response_model=OrderDetailResponse, responses={304: {"description": "Not Modified"}})
+async def get_order(
+    response: Response,
+    order_id: str,
+    tenant_id: Annotated[str, Depends(get_tenant_id)],
+    service: Annotated[OrderService, Depends(get_read_order_service)],
+    if_none_match: Annotated[str | None, Header()] = None,
+    x_consistency_token: Annotated[str | None, Header()] = None,
+):
+    """Get one order; ETag is its version and a matching If-None-Match yields 304."""
+    order = await service.get_order(
+        order_id=order_id,
+        tenant_id=tenant_id,
+        # Read-your-writes reads skip the per-worker cache
+        use_cache=x_consistency_token is None
+    )
+    etag = make_etag(order["version"])
+    if if_none_match_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    if settings.fast_json_responses:
+        return FastJSONResponse(serialize_order_detail(order), headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return order
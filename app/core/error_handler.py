@@ -3,12 +3,12 @@ Global error handler
 error_handler.py
 """
 from fastapi import Request
-from fastapi.responses import JSONResponse
 from app.core.exceptions import DomainError
+from app.core.responses import TimedJSONResponse
 
 
 async def domain_error_handler(request: Request, exc: DomainError):
-    return JSONResponse(
+    return TimedJSONResponse(
         status_code=exc.status_code,
         content={
             "code": exc.code,
@@ -3,12 +3,25 @@ Structured logging
 logging.py
 """
 
+import atexit
+import copy
 import logging
+import logging.handlers
+import queue
+import random
 import sys
+import time
 from contextvars import ContextVar
-from typing import Optional
+from typing import Dict, Optional
+
+import orjson
+
+from app.core.config import settings
 
 correlation_id_var: ContextVar[Optional[str]] = ContextVar('correlation_id', default=None)
+tenant_id_var: ContextVar[Optional[str]] = ContextVar('tenant_id', default=None)
+
+_listener: Optional[logging.handlers.QueueListener] = None
 
 def get_correlation_id() -> Optional[str]:
     """Get current correlation ID from context."""  
@@ -18,20 +31,148 @@ def set_correlation_id(correlation_id: str) -> None:
     """Set correlation ID in context."""
     correlation_id_var.set(correlation_id)
 
+def set_tenant_id(tenant_id: str) -> None:
+    """Set tenant ID in context for log records."""
+    tenant_id_var.set(tenant_id)
+
 class CorrelationIdFilter(logging.Filter):
-    """Add correlation ID to log records."""
+    """Add correlation ID and tenant ID to log records."""
     def filter(self, record):
         record.correlation_id = get_correlation_id() or "none"
+        record.tenant_id = tenant_id_var.get()
         return True
 
-def setup_logging() -> None:
-    """Configure structured logging."""
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - [%(correlation_id)s] - %(message)s',
-        handlers=[logging.StreamHandler(sys.stdout)]
-    )
-    logging.getLogger().addFilter(CorrelationIdFilter())
+class SamplingFilter(logging.Filter):
+    """Keep only a fraction of INFO and lower records per logger name prefix.
+
+    Warnings and errors are never dropped. The longest matching prefix wins.
+    """
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = dict(rates)
+        self._resolved: Dict[str, float] = {}
+
+    def _rate(self, name: str) -> float:
+        rate = self._resolved.get(name)
+        if rate is None:
+            rate = 1.0
+            best = -1
+            for prefix, prefix_rate in self.rates.items():
+                matches = name == prefix or name.startswith(prefix + ".")
+                if matches and len(prefix) > best:
+                    rate, best = prefix_rate, len(prefix)
+            self._resolved[name] = rate
+        return rate
+
+    def filter(self, record):
+        if record.levelno > logging.INFO:
+            return True
+        rate = self._rate(record.name)
+        return rate >= 1.0 or random.random() < rate
+
+class JsonFormatter(logging.Formatter):
+    """Format records as compact single-line JSON."""
+    # Optional fields taken from `extra=` when present
+    extra_fields = ("latency_ms", "queries", "method", "path", "status")
+
+    def format(self, record):
+        entry = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created)) + f".{int(record.msecs):03d}Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "correlation_id": getattr(record, "correlation_id", None),
+        }
+        tenant_id = getattr(record, "tenant_id", None)
+        if tenant_id is not None:
+            entry["tenant_id"] = tenant_id
+        for field in self.extra_fields:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        # Queued records arrive with the traceback already rendered into exc_text
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc_info"] = record.exc_text
+        return orjson.dumps(entry).decode()
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that drops records instead of blocking when the queue is full."""
+    dropped = 0
+
+    def prepare(self, record):
+        """Render the message and traceback in the caller, keeping them as separate fields.
+
+        QueueHandler.prepare() would append the traceback to the message; the
+        listener's formatter instead finds it in exc_text, as in sync mode.
+        """
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = record.exc_text or self.formatter.formatException(record.exc_info)
+            # The rendered text is all the listener needs; do not keep the frames alive
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            DroppingQueueHandler.dropped += 1
+
+def _build_formatter(log_format: str) -> logging.Formatter:
+    if log_format == "json":
+        return JsonFormatter()
+    return logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - [%(correlation_id)s] - %(message)s')
+
+def setup_logging(
+    log_format: Optional[str] = None,
+    async_mode: Optional[bool] = None,
+    sample_rates: Optional[Dict[str, float]] = None,
+    stream=None,
+) -> None:
+    """Configure structured logging.
+
+    In async mode records are put on a bounded queue and written to the stream
+    by a QueueListener thread, so a slow stdout never blocks the event loop;
+    records are dropped (and counted) rather than waited on when it is full.
+    """
+    log_format = settings.log_format if log_format is None else log_format
+    async_mode = settings.log_async if async_mode is None else async_mode
+    sample_rates = settings.log_sample_rates if sample_rates is None else sample_rates
+
+    shutdown_logging()
+    stream_handler = logging.StreamHandler(stream or sys.stdout)
+    stream_handler.setFormatter(_build_formatter(log_format))
+
+    if async_mode:
+        global _listener
+        handler = DroppingQueueHandler(queue.Queue(settings.log_queue_size))
+        # prepare() renders the message and traceback once in the caller; the listener's formatter does the rest
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        _listener = logging.handlers.QueueListener(handler.queue, stream_handler)
+        _listener.start()
+    else:
+        handler = stream_handler
+
+    # Filters on the handler the caller's thread runs, so they see its contextvars
+    # and sampled-out records are never formatted or enqueued
+    handler.addFilter(CorrelationIdFilter())
+    if sample_rates:
+        handler.addFilter(SamplingFilter(sample_rates))
+
+    logging.basicConfig(level=settings.log_level, handlers=[handler], force=True)
+
+def shutdown_logging() -> None:
+    """Flush and stop the background listener, if any."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+atexit.register(shutdown_logging)
 
 def get_logger(name: str) -> logging.Logger:
     """Get logger instance with correlation ID support."""
@@ -0,0 +1,201 @@
+"""
+Metrics primitives
+metrics.py
+
+Counters and histograms are plain Python numbers mutated from the event loop
+thread only, so recording needs no locks. The registry renders the
+Prometheus text exposition format on demand.
+"""
+
+from bisect import bisect_left
+from typing import Dict, List, Sequence, Tuple
+
+# Latency buckets in seconds
+DEFAULT_LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Histogram:
+    """Fixed-bucket histogram with Prometheus (cumulative "le") semantics."""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        """Initialize with sorted upper bounds; an implicit +Inf bucket is added."""
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """Record one observation."""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> list:
+        """Return [(upper_bound, cumulative_count)] including +Inf."""
+        total = 0
+        result = []
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def snapshot(self) -> dict:
+        """Return histogram state as a JSON-friendly dict."""
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "buckets": {
+                ("+Inf" if bound == float("inf") else str(bound)): count
+                for bound, count in self.cumulative()
+            },
+        }
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_bound(bound: float) -> str:
+    return "+Inf" if bound == float("inf") else repr(float(bound))
+
+
+class Counter:
+    """Monotonic counter family keyed by a tuple of label values."""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        """Initialize with metric name, help text and label names."""
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, labels: Tuple[str, ...] = (), amount: float = 1) -> None:
+        """Add amount to the series identified by labels."""
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, labels: Tuple[str, ...] = ()) -> float:
+        """Return the current value of one series."""
+        return self._values.get(labels, 0)
+
+    def render(self) -> List[str]:
+        """Return exposition lines for this family."""
+        # Text format 0.0.4 types the sample name itself, so the family is named with _total
+        family = f"{self.name}_total"
+        lines = [f"# HELP {family} {self.documentation}", f"# TYPE {family} counter"]
+        for labels, value in self._values.items():
+            lines.append(f"{family}{_format_labels(self.labelnames, labels)} {value}")
+        return lines
+
+    def clear(self) -> None:
+        """Drop all series."""
+        self._values.clear()
+
+
+class HistogramFamily:
+    """Histogram family keyed by a tuple of label values."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ):
+        """Initialize with metric name, help text, label names and bucket bounds."""
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._series: Dict[Tuple[str, ...], Histogram] = {}
+
+    def labels(self, *values: str) -> Histogram:
+        """Return (creating once) the histogram for the given label values."""
+        histogram = self._series.get(values)
+        if histogram is None:
+            histogram = self._series[values] = Histogram(self.buckets)
+        return histogram
+
+    def observe(self, labels: Tuple[str, ...], value: float) -> None:
+        """Record one observation in the series identified by labels."""
+        self.labels(*labels).observe(value)
+
+    def render(self) -> List[str]:
+        """Return exposition lines for this family."""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for labels, histogram in self._series.items():
+            for bound, count in histogram.cumulative():
+                le = f'le="{_format_bound(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {count}")
+            suffix = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{suffix} {histogram.sum}")
+            lines.append(f"{self.name}_count{suffix} {histogram.count}")
+        return lines
+
+    def clear(self) -> None:
+        """Drop all series."""
+        self._series.clear()
+
+
+class Registry:
+    """Collection of metric families rendered together."""
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._families: list = []
+
+    def register(self, family):
+        """Add a family and return it."""
+        self._families.append(family)
+        return family
+
+    def render(self) -> str:
+        """Render all families in Prometheus text format."""
+        lines = []
+        for family in self._families:
+            lines.extend(family.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_request_duration_seconds = registry.register(HistogramFamily(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template and status code.",
+    ("method", "route", "status"),
+))
+db_statement_duration_seconds = registry.register(HistogramFamily(
+    "db_statement_duration_seconds",
+    "SQL statement latency by repository method.",
+    ("operation",),
+))
+idempotency_requests = registry.register(Counter(
+    "idempotency_requests",
+    "Idempotent create requests by outcome (created, replayed, conflict).",
+    ("outcome",),
+))
+outbox_events_inserted = registry.register(Counter(
+    "outbox_events_inserted",
+    "Outbox events written, by event type.",
+    ("event_type",),
+))
+list_cache_requests = registry.register(Counter(
+    "list_cache_requests",
+    "Cursorless GET /orders cache lookups by result (hit, miss).",
+    ("result",),
+))
+list_cache_invalidations = registry.register(Counter(
+    "list_cache_invalidations",
+    "First-page cache tenant invalidations by source (local, remote).",
+    ("source",),
+))
@@ -1,14 +1,90 @@
 """
-Middleware for correlation ID
+Middleware for correlation ID and request timing
+
+Both are plain ASGI middleware: they run in the request's own task (so
+contextvars set here are visible to the endpoint) and pass response
+messages straight through, which keeps streaming responses streaming.
 """
-from fastapi import Request
-from app.core.logging import set_correlation_id
 import uuid
 
-async def correlation_id_middleware(request: Request, call_next):
-    """Middleware for correlation ID"""
-    correlation_id = request.headers.get("X-Correlation-ID") or str(uuid.uuid4())
-    set_correlation_id(correlation_id)
-    response = await call_next(request)
-    response.headers["X-Correlation-ID"] = correlation_id
-    return response
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.logging import get_correlation_id, get_logger, set_correlation_id
+from app.core.metrics import http_request_duration_seconds
+from app.core.request_stats import start_request_stats
+
+logger = get_logger(__name__)
+
+CORRELATION_ID_HEADER = "X-Correlation-ID"
+
+
+class CorrelationIdMiddleware:
+    """Propagate X-Correlation-ID from the request (or a new UUID) to context and response."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        correlation_id = Headers(scope=scope).get(CORRELATION_ID_HEADER) or str(uuid.uuid4())
+        set_correlation_id(correlation_id)
+
+        async def send_with_correlation_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)[CORRELATION_ID_HEADER] = correlation_id
+            await send(message)
+
+        await self.app(scope, receive, send_with_correlation_id)
+
+
+def _route_template(scope: Scope) -> str:
+    """Return the matched route path (e.g. /orders/{order_id}) to bound label cardinality."""
+    return getattr(scope.get("route"), "path", "unmatched")
+
+
+class TimingMiddleware:
+    """Server-Timing header, query/latency budget logging and request latency metrics."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = start_request_stats(get_correlation_id())
+        status = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                MutableHeaders(scope=message)["Server-Timing"] = stats.server_timing(stats.elapsed())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            # Measured after the last body chunk, so streamed responses count in full
+            total = stats.elapsed()
+            http_request_duration_seconds.labels(
+                scope["method"], _route_template(scope), str(status)
+            ).observe(total)
+            if stats.queries > settings.request_query_budget or total * 1000 > settings.request_latency_budget_ms:
+                logger.warning(
+                    f"Request over budget: {scope['method']} {scope['path']} "
+                    f"queries={stats.queries} db_ms={stats.db_seconds * 1000:.1f} total_ms={total * 1000:.1f}",
+                    extra={
+                        "method": scope["method"],
+                        "path": scope["path"],
+                        "status": status,
+                        "queries": stats.queries,
+                        "latency_ms": round(total * 1000, 3),
+                    }
+                )
@@ -0,0 +1,49 @@
+"""
+Per-request query and timing statistics
+request_stats.py
+"""
+
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Optional
+
+
+@dataclass
+class RequestStats:
+    """SQL statement count and time split for one request."""
+
+    correlation_id: str
+    started: float = field(default_factory=time.perf_counter)
+    queries: int = 0
+    db_seconds: float = 0.0
+    serialize_seconds: float = 0.0
+
+    def elapsed(self) -> float:
+        """Seconds since the request started."""
+        return time.perf_counter() - self.started
+
+    def server_timing(self, total: float) -> str:
+        """Format a Server-Timing header value (milliseconds) for db, serialize and app time."""
+        app_seconds = max(total - self.db_seconds - self.serialize_seconds, 0.0)
+        return (
+            f'db;dur={self.db_seconds * 1000:.2f};desc="{self.queries} queries", '
+            f"serialize;dur={self.serialize_seconds * 1000:.2f}, "
+            f"app;dur={app_seconds * 1000:.2f}"
+        )
+
+
+# Set by the timing middleware for the current correlation id
+request_stats_var: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def start_request_stats(correlation_id: str) -> RequestStats:
+    """Begin collecting statistics for the current request."""
+    stats = RequestStats(correlation_id)
+    request_stats_var.set(stats)
+    return stats
+
+
+def get_request_stats() -> Optional[RequestStats]:
+    """Return statistics of the current request, if any."""
+    return request_stats_var.get()
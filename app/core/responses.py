@@ -0,0 +1,40 @@
+"""
+Response classes
+responses.py
+"""
+
+import time
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+from app.core.request_stats import get_request_stats
+
+
+class TimedJSONResponse(JSONResponse):
+    """JSON response that adds its render time to the request's serialize timing."""
+
+    def render(self, content: Any) -> bytes:
+        start = time.perf_counter()
+        body = self.encode(content)
+        stats = get_request_stats()
+        if stats is not None:
+            stats.serialize_seconds += time.perf_counter() - start
+        return body
+
+    def encode(self, content: Any) -> bytes:
+        """Serialize content to bytes."""
+        return super().render(content)
+
+
+class FastJSONResponse(TimedJSONResponse):
+    """orjson-backed response for content that is already in its response shape.
+
+    Routes return it directly so FastAPI skips response_model validation and
+    jsonable_encoder; content is serialized exactly once.
+    """
+
+    def encode(self, content: Any) -> bytes:
+        """Serialize content with orjson."""
+        return orjson.dumps(content)
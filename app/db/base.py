@@ -10,3 +10,4 @@ Base = declarative_base()
 from app.models.order import Order 
 from app.models.idempotency import IdempotencyKey 
 from app.models.outbox import Outbox 
+from app.models.order_stats import TenantOrderStats
@@ -0,0 +1,80 @@
+"""
+SQL statement instrumentation
+instrumentation.py
+"""
+
+import functools
+import inspect
+import time
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.metrics import db_statement_duration_seconds
+from app.core.request_stats import get_request_stats
+
+# Repository method currently issuing statements ("other" outside repositories)
+current_operation: ContextVar[str] = ContextVar("db_operation", default="other")
+
+
+def _wrap_coroutine(fn, operation: str):
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        token = current_operation.set(operation)
+        try:
+            return await fn(*args, **kwargs)
+        finally:
+            current_operation.reset(token)
+    return wrapper
+
+
+def _wrap_async_generator(fn, operation: str):
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        agen = fn(*args, **kwargs)
+        try:
+            while True:
+                # Statements run inside __anext__, so label only that step
+                token = current_operation.set(operation)
+                try:
+                    item = await agen.__anext__()
+                except StopAsyncIteration:
+                    return
+                finally:
+                    current_operation.reset(token)
+                yield item
+        finally:
+            await agen.aclose()
+    return wrapper
+
+
+def track_queries(cls):
+    """Class decorator labelling SQL issued by each public async method as Class.method."""
+    for name, fn in list(vars(cls).items()):
+        if name.startswith("_"):
+            continue
+        operation = f"{cls.__name__}.{name}"
+        if inspect.isasyncgenfunction(fn):
+            setattr(cls, name, _wrap_async_generator(fn, operation))
+        elif inspect.iscoroutinefunction(fn):
+            setattr(cls, name, _wrap_coroutine(fn, operation))
+    return cls
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._metrics_start = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = getattr(context, "_metrics_start", None)
+    if start is None:
+        return
+    elapsed = time.perf_counter() - start
+    db_statement_duration_seconds.labels(current_operation.get()).observe(elapsed)
+    stats = get_request_stats()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += elapsed
@@ -0,0 +1,102 @@
+"""
+Instrumented connection pool
+pool.py
+"""
+
+import time
+from dataclasses import dataclass, field
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool
+
+from app.core.metrics import Histogram
+
+
+@dataclass
+class PoolMetrics:
+    """Counters for one connection pool of a worker process."""
+
+    checkouts: int = 0
+    timeouts: int = 0
+    overflow_checkouts: int = 0
+    connects: int = 0
+    invalidations: int = 0
+    max_checked_out: int = 0
+    wait_seconds: Histogram = field(default_factory=Histogram)
+
+    def snapshot(self) -> dict:
+        """Return counters as a dict."""
+        return {
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "overflowCheckouts": self.overflow_checkouts,
+            "connects": self.connects,
+            "invalidations": self.invalidations,
+            "maxCheckedOut": self.max_checked_out,
+            "waitSeconds": self.wait_seconds.snapshot(),
+        }
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """Queue pool that records checkout wait time, timeouts and overflow use in its own metrics."""
+
+    # Log under sqlalchemy.* so pool messages follow SQLAlchemy's logging levels
+    _sqla_logger_namespace = "sqlalchemy.pool.impl.AsyncAdaptedQueuePool"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def recreate(self):
+        # engine.dispose() swaps in a new pool; keep counting into the same metrics
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.timeouts += 1
+            raise
+        self.metrics.wait_seconds.observe(time.perf_counter() - start)
+        self.metrics.checkouts += 1
+        self.metrics.max_checked_out = max(self.metrics.max_checked_out, self.checkedout())
+        return connection
+
+    def _inc_overflow(self):
+        acquired = super()._inc_overflow()
+        # Overflow starts at -pool_size; positive means beyond the core pool
+        if acquired and self._overflow > 0:
+            self.metrics.overflow_checkouts += 1
+        return acquired
+
+
+def instrument_pool(pool: InstrumentedAsyncPool) -> None:
+    """Count new connections and invalidations into the pool's metrics."""
+    metrics = pool.metrics
+
+    def on_connect(dbapi_connection, connection_record):
+        metrics.connects += 1
+
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.invalidations += 1
+
+    event.listen(pool, "connect", on_connect)
+    event.listen(pool, "invalidate", on_invalidate)
+
+
+def pool_status(pool: Pool) -> dict:
+    """Return live pool occupancy plus the pool's accumulated metrics."""
+    status = {}
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        status = {
+            "size": pool.size(),
+            "checkedOut": pool.checkedout(),
+            "checkedIn": pool.checkedin(),
+            "overflow": pool.overflow(),
+        }
+    if isinstance(pool, InstrumentedAsyncPool):
+        status.update(pool.metrics.snapshot())
+    return status
@@ -0,0 +1,127 @@
+"""
+Read replica routing
+routing.py
+
+Read-only requests use a replica session; writes use the primary. Writes
+return the primary's WAL LSN as a consistency token; a read that sends it back
+only uses a replica that has replayed up to that LSN (waiting up to
+replica_max_wait_ms), otherwise it is served from the primary.
+"""
+
+import asyncio
+import re
+import time
+from itertools import cycle
+from typing import Annotated, AsyncIterator, List, Optional
+
+from fastapi import Depends, Header
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.exceptions import ValidationError
+from app.core.logging import get_logger
+from app.db.session import get_db, replica_session_makers
+
+logger = get_logger(__name__)
+
+CONSISTENCY_TOKEN_HEADER = "X-Consistency-Token"
+
+_LSN_PATTERN = re.compile(r"^[0-9A-Fa-f]{1,8}/[0-9A-Fa-f]{1,8}$")
+
+# pg_last_wal_replay_lsn() is NULL on a primary, so a non-standby "replica" counts as caught up
+_REPLICA_CAUGHT_UP = text(
+    "SELECT COALESCE(pg_last_wal_replay_lsn(), pg_current_wal_lsn()) >= CAST(CAST(:lsn AS text) AS pg_lsn)"
+)
+_CURRENT_LSN = text("SELECT CAST(pg_current_wal_lsn() AS text)")
+
+# Session.info key marking replica sessions that were not checked against a consistency token
+_UNCHECKED_REPLICA = "unchecked_replica"
+
+
+class ReplicaRouter:
+    """Round-robin choice among replica session factories."""
+
+    def __init__(self, session_makers: List[async_sessionmaker]):
+        """Initialize with one session factory per replica."""
+        self.configure(session_makers)
+
+    def configure(self, session_makers: List[async_sessionmaker]) -> None:
+        """Replace the replica set."""
+        self.session_makers = list(session_makers)
+        self._next = cycle(self.session_makers) if self.session_makers else None
+
+    @property
+    def enabled(self) -> bool:
+        """Whether any replica is configured."""
+        return bool(self.session_makers)
+
+    def next_session(self) -> AsyncSession:
+        """Open a session on the next replica."""
+        return next(self._next)()
+
+
+replica_router = ReplicaRouter(replica_session_makers)
+
+
+def parse_consistency_token(token: str) -> str:
+    """Validate a consistency token (a pg_lsn such as 0/16B3748)."""
+    token = token.strip()
+    if not _LSN_PATTERN.match(token):
+        raise ValidationError(f"{CONSISTENCY_TOKEN_HEADER} must be a WAL LSN like 0/16B3748, got: {token}")
+    return token
+
+
+async def consistency_token(db: AsyncSession) -> Optional[str]:
+    """Return the primary's current WAL LSN, or None when no replicas are configured."""
+    if not replica_router.enabled:
+        return None
+    result = await db.execute(_CURRENT_LSN)
+    return result.scalar_one()
+
+
+def may_lag_primary(db: AsyncSession) -> bool:
+    """Whether db is a replica session that may not have replayed recent writes yet."""
+    return db.info.get(_UNCHECKED_REPLICA, False)
+
+
+async def replica_caught_up(replica: AsyncSession, lsn: str) -> bool:
+    """Wait up to replica_max_wait_ms for the replica to replay lsn; return whether it did."""
+    deadline = time.monotonic() + settings.replica_max_wait_ms / 1000
+    while True:
+        result = await replica.execute(_REPLICA_CAUGHT_UP, {"lsn": lsn})
+        if result.scalar_one():
+            return True
+        if time.monotonic() >= deadline:
+            return False
+        # End the snapshot so the next check sees newer replay progress
+        await replica.rollback()
+        await asyncio.sleep(settings.replica_poll_interval_ms / 1000)
+
+
+async def get_read_db(
+    primary: Annotated[AsyncSession, Depends(get_db)],
+    x_consistency_token: Annotated[str | None, Header()] = None,
+) -> AsyncIterator[AsyncSession]:
+    """Dependency for read-only sessions, routed to a replica when possible.
+
+    The primary session is lazy and only checks out a connection if it is used.
+    """
+    if not replica_router.enabled:
+        yield primary
+        return
+
+    lsn = parse_consistency_token(x_consistency_token) if x_consistency_token else None
+    async with replica_router.next_session() as replica:
+        if lsn is not None:
+            try:
+                use_replica = await replica_caught_up(replica, lsn)
+            except Exception as e:
+                logger.warning(f"Replica check failed, reading from primary: {str(e)}")
+                use_replica = False
+            if not use_replica:
+                yield primary
+                return
+        else:
+            replica.info[_UNCHECKED_REPLICA] = True
+        yield replica
@@ -3,15 +3,32 @@ Database session management
 session.py
 """
 
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession, async_sessionmaker
 from app.core.config import settings
+from app.db.pool import InstrumentedAsyncPool, instrument_pool
 
-# Create async engine
-engine = create_async_engine(
-    settings.database_url,
-    echo=False,
-    future=True,
-)
+
+def create_engine_for(url: str) -> AsyncEngine:
+    """Create an instrumented async engine using the configured pool settings."""
+    new_engine = create_async_engine(
+        url,
+        echo=False,
+        future=True,
+        poolclass=InstrumentedAsyncPool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout_seconds,
+        pool_recycle=settings.db_pool_recycle_seconds,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        connect_args={"statement_cache_size": settings.db_statement_cache_size},
+    )
+    instrument_pool(new_engine.sync_engine.pool)
+    return new_engine
+
+
+# Create async engine (primary) and one engine per read replica
+engine = create_engine_for(settings.database_url)
+replica_engines = [create_engine_for(url) for url in settings.database_replica_urls]
 
 # Create session factory
 async_session_maker = async_sessionmaker(
@@ -19,6 +36,10 @@ async_session_maker = async_sessionmaker(
     class_=AsyncSession,
     expire_on_commit=False,
 )
+replica_session_makers = [
+    async_sessionmaker(replica_engine, class_=AsyncSession, expire_on_commit=False)
+    for replica_engine in replica_engines
+]
 
 
 async def get_db() -> AsyncSession:
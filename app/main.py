@@ -3,16 +3,47 @@ FastAPI application
 main.py
 """
 
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy import text
 
 from app.core.config import settings
+from app.core.logging import setup_logging, shutdown_logging
 from app.core.exceptions import DomainError
 from app.core.error_handler import domain_error_handler
-from app.db.session import engine
+from app.core.responses import TimedJSONResponse
+from app.db.session import engine, replica_engines
+from app.db.pool import pool_status
 from app.api.routers import orders_router
-from app.core.middleware import correlation_id_middleware
+from app.core.metrics import CONTENT_TYPE_LATEST, registry
+from app.core.middleware import CorrelationIdMiddleware, TimingMiddleware
+from app.workers.idempotency_sweeper import run_sweeper
+from app.workers.list_cache_invalidator import ListCacheInvalidator
+from app.services.order_service import list_cache
+from app.utils.pagination import warn_if_default_cursor_secret
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start and stop logging and background tasks."""
+    setup_logging()
+    warn_if_default_cursor_secret()
+    stop_event = asyncio.Event()
+    tasks = []
+    if settings.idempotency_sweeper_enabled:
+        tasks.append(asyncio.create_task(run_sweeper(stop_event)))
+    if settings.list_cache_enabled:
+        tasks.append(asyncio.create_task(ListCacheInvalidator(list_cache).run(stop_event)))
+    
+    yield
+    
+    stop_event.set()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    shutdown_logging()
+
 
 # Create FastAPI app
 app = FastAPI(
@@ -21,6 +52,8 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
+    default_response_class=TimedJSONResponse,
 )
 
 # CORS middleware
@@ -38,8 +71,9 @@ app.add_exception_handler(DomainError, domain_error_handler)
 # Include routers
 app.include_router(orders_router)
 
-# Middleware
-app.middleware("http")(correlation_id_middleware)
+# Middleware (last added runs first: correlation id is set before timing starts)
+app.add_middleware(TimingMiddleware)
+app.add_middleware(CorrelationIdMiddleware)
 
 
 @app.get("/health", tags=["health"])
@@ -60,6 +94,20 @@ async def health_check():
     }
 
 
+@app.get("/internal/pool", tags=["internal"])
+async def pool_stats():
+    """Connection pool occupancy, checkout wait histogram and overflow events, per pool."""
+    status = pool_status(engine.pool)
+    status["replicas"] = [pool_status(replica_engine.pool) for replica_engine in replica_engines]
+    return status
+
+
+@app.get("/metrics", tags=["internal"], include_in_schema=False)
+async def metrics():
+    """Prometheus metrics for this worker process."""
+    return Response(registry.render(), media_type=CONTENT_TYPE_LATEST)
+
+
 if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    from app.server import main
+    main()
@@ -3,5 +3,6 @@
 from app.models.order import Order, OrderStatus
 from app.models.outbox import Outbox
 from app.models.idempotency import IdempotencyKey
+from app.models.order_stats import TenantOrderStats
 
-__all__ = ["Order", "OrderStatus", "Outbox", "IdempotencyKey"]
+__all__ = ["Order", "OrderStatus", "Outbox", "IdempotencyKey", "TenantOrderStats"]
@@ -4,8 +4,7 @@ idempotency.py
 """
 
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, Index, UniqueConstraint
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import Column, String, DateTime, Index, LargeBinary, SmallInteger, UniqueConstraint
 from app.db.base import Base
 
 
@@ -16,7 +15,11 @@ class IdempotencyKey(Base):
     
     tenant_id = Column(String(255), primary_key=True, nullable=False)
     key = Column(String(255), primary_key=True, nullable=False)
-    response_json = Column(JSONB, nullable=False)
+    # SHA-256 digest of the request body (app.utils.idempotency.hash_body)
+    body_hash = Column(LargeBinary, nullable=False)
+    # Status and body of the first response; replays send the body byte for byte
+    response_status = Column(SmallInteger, nullable=False)
+    response_body = Column(LargeBinary, nullable=False)
     created_at = Column(DateTime(timezone=True), nullable=False, default=datetime.utcnow)
     
     __table_args__ = (
@@ -6,7 +6,7 @@ order.py
 import enum
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, Integer, Enum, DateTime, Index
+from sqlalchemy import Column, String, Integer, Enum, DateTime, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from app.db.base import Base
 
@@ -34,4 +34,9 @@ class Order(Base):
     __table_args__ = (
         Index('ix_orders_tenant_created_id', 'tenant_id', 'created_at', 'id'),
         Index('ix_orders_tenant_id', 'tenant_id', 'id'),
+        Index('ix_orders_tenant_status_created_id', 'tenant_id', 'status', 'created_at', 'id', 'total_cents'),
+        Index(
+            'ix_orders_tenant_priced_created_id', 'tenant_id', 'created_at', 'id', 'total_cents',
+            postgresql_where=text('total_cents IS NOT NULL'),
+        ),
     )
@@ -0,0 +1,21 @@
+"""
+Tenant order statistics model
+order_stats.py
+"""
+
+from datetime import datetime
+from sqlalchemy import Column, String, BigInteger, Enum, DateTime
+from app.db.base import Base
+from app.models.order import OrderStatus
+
+
+class TenantOrderStats(Base):
+    """Order count and total_cents sum per tenant and status, maintained by delta upserts."""
+    
+    __tablename__ = "tenant_order_stats"
+    
+    tenant_id = Column(String(255), primary_key=True, nullable=False)
+    status = Column(Enum(OrderStatus), primary_key=True, nullable=False)
+    order_count = Column(BigInteger, nullable=False, default=0)
+    total_cents = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), nullable=False, default=datetime.utcnow)
@@ -5,13 +5,13 @@ outbox.py
 
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, Index
+from sqlalchemy import Column, String, DateTime, Index, DDL, event, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from app.db.base import Base
 
 
 class Outbox(Base):
-    """Outbox model."""
+    """Outbox model, range-partitioned by created_at."""
     
     __tablename__ = "outbox"
     
@@ -21,8 +21,18 @@ class Outbox(Base):
     tenant_id = Column(String(255), nullable=False)
     payload = Column(JSONB, nullable=False)
     published_at = Column(DateTime(timezone=True), nullable=True)
-    created_at = Column(DateTime(timezone=True), nullable=False, default=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), primary_key=True, nullable=False, default=datetime.utcnow)
     
     __table_args__ = (
         Index('ix_outbox_published_at', 'published_at'),
+        Index('ix_outbox_unpublished_created_at', 'created_at', postgresql_where=text('published_at IS NULL')),
+        {'postgresql_partition_by': 'RANGE (created_at)'},
     )
+
+
+# Catch-all partition so inserts never fail when maintenance has not run yet
+event.listen(
+    Outbox.__table__,
+    "after_create",
+    DDL("CREATE TABLE IF NOT EXISTS outbox_default PARTITION OF outbox DEFAULT"),
+)
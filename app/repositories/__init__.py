@@ -3,5 +3,6 @@
 from app.repositories.order_repository import OrderRepository
 from app.repositories.idempotency_repository import IdempotencyRepository
 from app.repositories.outbox_repository import OutboxRepository
+from app.repositories.order_stats_repository import OrderStatsRepository
 
-__all__ = ["OrderRepository", "IdempotencyRepository", "OutboxRepository"]
+__all__ = ["OrderRepository", "IdempotencyRepository", "OutboxRepository", "OrderStatsRepository"]
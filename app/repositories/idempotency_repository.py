@@ -4,12 +4,15 @@ idempotency_repository.py
 """
 
 from datetime import datetime, timezone
-from typing import Optional
-from sqlalchemy import select, and_
+from typing import Dict, List, Optional, Set, Tuple
+from sqlalchemy import select, delete, and_, func, tuple_, any_, literal, String
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.idempotency import IdempotencyKey
+from app.db.instrumentation import track_queries
 
 
+@track_queries
 class IdempotencyRepository:
     """Repository for idempotency key data access."""
     
@@ -17,6 +20,11 @@ class IdempotencyRepository:
         """Initialize with database session."""
         self.db = db
     
+    async def lock(self, tenant_id: str, key: str) -> None:
+        """Take a transaction-scoped advisory lock serializing this key across nodes."""
+        stmt = select(func.pg_advisory_xact_lock(func.hashtextextended(f"{tenant_id}:{key}", 0)))
+        await self.db.execute(stmt)
+    
     async def find(self, tenant_id: str, key: str) -> Optional[IdempotencyKey]:
         """Find idempotency key record."""
         stmt = select(IdempotencyKey).where(
@@ -28,15 +36,72 @@ class IdempotencyRepository:
         result = await self.db.execute(stmt)
         return result.scalar_one_or_none()
     
-    async def store(self, tenant_id: str, key: str, body_hash: str, response: dict) -> IdempotencyKey:
-        """Store idempotency key with response."""
+    async def find_many(self, tenant_id: str, keys: List[str]) -> Dict[str, IdempotencyKey]:
+        """Find idempotency key records for many keys with one = ANY(...) query."""
+        stmt = select(IdempotencyKey).where(
+            and_(
+                IdempotencyKey.tenant_id == tenant_id,
+                IdempotencyKey.key == any_(literal(keys, ARRAY(String)))
+            )
+        )
+        result = await self.db.execute(stmt)
+        return {record.key: record for record in result.scalars().all()}
+    
+    async def claim_many(
+        self,
+        tenant_id: str,
+        records: List[Tuple[str, bytes, int, bytes]],
+        claimed_at: datetime,
+        expired_before: datetime
+    ) -> Set[str]:
+        """Insert (key, body_hash, response_status, response_body) records in one statement; return the keys claimed.
+        
+        Existing keys are overwritten only if created before expired_before, so
+        keys held by live records (e.g. claimed concurrently) are left untouched.
+        """
+        # Rows are locked in VALUES order; sorting by key makes concurrent
+        # batches with overlapping keys lock them in the same order instead
+        # of deadlocking
+        records = sorted(records, key=lambda record: record[0])
+        stmt = pg_insert(IdempotencyKey).values([
+            {
+                "tenant_id": tenant_id,
+                "key": key,
+                "body_hash": body_hash,
+                "response_status": response_status,
+                "response_body": response_body,
+                "created_at": claimed_at,
+            }
+            for key, body_hash, response_status, response_body in records
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[IdempotencyKey.tenant_id, IdempotencyKey.key],
+            set_={
+                "body_hash": stmt.excluded.body_hash,
+                "response_status": stmt.excluded.response_status,
+                "response_body": stmt.excluded.response_body,
+                "created_at": stmt.excluded.created_at,
+            },
+            where=IdempotencyKey.created_at < expired_before
+        ).returning(IdempotencyKey.key)
+        result = await self.db.execute(stmt)
+        return set(result.scalars().all())
+    
+    async def store(
+        self,
+        tenant_id: str,
+        key: str,
+        body_hash: bytes,
+        response_status: int,
+        response_body: bytes
+    ) -> IdempotencyKey:
+        """Store idempotency key with the serialized response."""
         record = IdempotencyKey(
             tenant_id=tenant_id,
             key=key,
-            response_json={
-                "response": response,
-                "body_hash": body_hash
-            },
+            body_hash=body_hash,
+            response_status=response_status,
+            response_body=response_body,
             created_at=datetime.now(timezone.utc)
         )
         self.db.add(record)
@@ -46,4 +111,21 @@ class IdempotencyRepository:
     async def delete(self, record: IdempotencyKey) -> None:
         """Delete idempotency key record."""
         await self.db.delete(record)
-        await self.db.flush()   
+        await self.db.flush()
+
+    async def delete_expired(self, cutoff: datetime, batch_size: int) -> int:
+        """Delete up to batch_size keys created before cutoff, oldest first."""
+        expired = (
+            select(IdempotencyKey.tenant_id, IdempotencyKey.key)
+            .where(IdempotencyKey.created_at < cutoff)
+            .order_by(IdempotencyKey.created_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        stmt = (
+            delete(IdempotencyKey)
+            .where(tuple_(IdempotencyKey.tenant_id, IdempotencyKey.key).in_(expired))
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.db.execute(stmt)
+        return result.rowcount
@@ -5,12 +5,267 @@ order_repository.py
 
 import uuid
 from datetime import datetime, timezone
-from typing import Optional, List, Tuple
-from sqlalchemy import select, and_, or_
+from typing import AsyncIterator, Optional, List, Tuple
+from sqlalchemy import select, update, insert, and_, tuple_, text, bindparam, func, cast, literal, literal_column, union_all, LargeBinary, String, Text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine import Row
+from sqlalchemy.sql.expression import CTE, Select
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.order import Order, OrderStatus
+from app.models.outbox import Outbox
+from app.models.order_stats import TenantOrderStats
+from app.core.metrics import outbox_events_inserted
+from app.db.instrumentation import track_queries
 
+# Kept as a module-level text() construct so it is compiled once and reused;
+# the dialect-specific insert() construct is not cacheable.
+_CREATE_DRAFT_WITH_IDEMPOTENCY_KEY = text("""
+    WITH claim AS (
+        INSERT INTO idempotency_keys (tenant_id, key, body_hash, response_status, response_body, created_at)
+        VALUES (:tenant_id, :key, :body_hash, :response_status, :response_body, :claimed_at)
+        ON CONFLICT (tenant_id, key) DO UPDATE
+            SET body_hash = EXCLUDED.body_hash, response_status = EXCLUDED.response_status,
+                response_body = EXCLUDED.response_body, created_at = EXCLUDED.created_at
+            WHERE idempotency_keys.created_at < :expired_before
+        RETURNING 1
+    ), new_order AS (
+        INSERT INTO orders (id, tenant_id, status, version, created_at, updated_at)
+        SELECT CAST(:order_id AS UUID), CAST(:tenant_id AS VARCHAR), CAST(:status AS orderstatus),
+               1, CAST(:created_at AS TIMESTAMPTZ), CAST(:created_at AS TIMESTAMPTZ)
+        FROM claim
+        RETURNING 1
+    ), stats AS (
+        INSERT INTO tenant_order_stats (tenant_id, status, order_count, total_cents, updated_at)
+        SELECT CAST(:tenant_id AS VARCHAR), CAST(:status AS orderstatus), 1, 0, now()
+        FROM new_order
+        ON CONFLICT (tenant_id, status) DO UPDATE
+            SET order_count = tenant_order_stats.order_count + 1, updated_at = EXCLUDED.updated_at
+    )
+    SELECT count(*) FROM new_order
+""").bindparams(
+    bindparam("body_hash", type_=LargeBinary),
+    bindparam("response_body", type_=LargeBinary),
+    bindparam("status", type_=Order.__table__.c.status.type),
+)
 
+
+_TRANSITION_COLUMNS = {
+    "id": Order.__table__.c.id.type,
+    "status": Order.__table__.c.status.type,
+    "version": Order.__table__.c.version.type,
+    "total_cents": Order.__table__.c.total_cents.type,
+}
+
+# Confirm accepts any current status, so the counters move out of whatever
+# status and total each row held when it was locked
+_CONFIRM_MANY = text("""
+    WITH old AS (
+        SELECT o.id, o.status, o.total_cents, x.total_cents AS new_total_cents
+        FROM orders AS o
+        JOIN unnest(CAST(:ids AS UUID[]), CAST(:versions AS INTEGER[]), CAST(:totals AS INTEGER[]))
+            AS x(id, version, total_cents) ON o.id = x.id
+        WHERE o.tenant_id = :tenant_id AND o.version = x.version
+        FOR UPDATE OF o
+    ), confirmed AS (
+        UPDATE orders AS o
+        SET status = 'CONFIRMED', total_cents = old.new_total_cents, version = o.version + 1, updated_at = :now
+        FROM old
+        WHERE o.id = old.id
+        RETURNING o.id, o.status, o.version, o.total_cents,
+                  old.status AS old_status, old.total_cents AS old_total_cents
+    ), deltas AS (
+        SELECT old_status AS status, -count(*) AS order_count, -COALESCE(sum(old_total_cents), 0) AS total_cents
+        FROM confirmed
+        GROUP BY old_status
+        UNION ALL
+        SELECT CAST('CONFIRMED' AS orderstatus), count(*), COALESCE(sum(total_cents), 0)
+        FROM confirmed
+        HAVING count(*) > 0
+    ), stats AS (
+        INSERT INTO tenant_order_stats (tenant_id, status, order_count, total_cents, updated_at)
+        SELECT :tenant_id, status, sum(order_count), sum(total_cents), :now
+        FROM deltas
+        GROUP BY status
+        ON CONFLICT (tenant_id, status) DO UPDATE
+            SET order_count = tenant_order_stats.order_count + EXCLUDED.order_count,
+                total_cents = tenant_order_stats.total_cents + EXCLUDED.total_cents,
+                updated_at = EXCLUDED.updated_at
+    )
+    SELECT id, status, version, total_cents FROM confirmed
+""").columns(**_TRANSITION_COLUMNS)
+
+_CLOSE_MANY = text("""
+    WITH closed AS (
+        UPDATE orders
+        SET status = 'CLOSED', version = version + 1, updated_at = :now
+        WHERE id = ANY(CAST(:ids AS UUID[])) AND tenant_id = :tenant_id AND status = 'CONFIRMED'
+        RETURNING id, tenant_id, status, version, total_cents
+    ), events AS (
+        INSERT INTO outbox (id, event_type, order_id, tenant_id, payload, created_at)
+        SELECT gen_random_uuid(), 'orders.closed', id, tenant_id,
+               jsonb_build_object(
+                   'orderId', id::text,
+                   'tenantId', tenant_id,
+                   'totalCents', total_cents,
+                   'closedAt', CAST(:closed_at AS TEXT)
+               ),
+               :now
+        FROM closed
+    ), moved AS (
+        SELECT count(*) AS n, COALESCE(sum(total_cents), 0) AS cents FROM closed
+    ), stats AS (
+        INSERT INTO tenant_order_stats (tenant_id, status, order_count, total_cents, updated_at)
+        SELECT :tenant_id, d.status, d.order_count, d.total_cents, :now
+        FROM moved, LATERAL (VALUES
+            (CAST('CONFIRMED' AS orderstatus), -moved.n, -moved.cents),
+            (CAST('CLOSED' AS orderstatus), moved.n, moved.cents)
+        ) AS d(status, order_count, total_cents)
+        WHERE moved.n > 0
+        ON CONFLICT (tenant_id, status) DO UPDATE
+            SET order_count = tenant_order_stats.order_count + EXCLUDED.order_count,
+                total_cents = tenant_order_stats.total_cents + EXCLUDED.total_cents,
+                updated_at = EXCLUDED.updated_at
+    )
+    SELECT id, status, version, total_cents FROM closed
+""").columns(**_TRANSITION_COLUMNS)
+
+
+def _closed_event_payload(closed, closed_at: datetime):
+    """Build the orders.closed outbox payload from the rows of a closing UPDATE."""
+    return func.jsonb_build_object(
+        literal_column("'orderId'"), cast(closed.c.id, String),
+        literal_column("'tenantId'"), closed.c.tenant_id,
+        literal_column("'totalCents'"), closed.c.total_cents,
+        literal_column("'closedAt'"), cast(literal(closed_at.isoformat()), Text),
+    )
+
+
+def _counter_deltas(
+    changed: CTE,
+    tenant_id: str,
+    to_status: OrderStatus,
+    from_status: Optional[OrderStatus] = None
+) -> CTE:
+    """Upsert the tenant counter deltas for the orders returned by a writing CTE, as another CTE.
+
+    The orders move from from_status (None for new orders) to to_status;
+    drafts carry no total, so leaving DRAFT moves only the count.
+    """
+    moved = select(
+        func.count().label("n"),
+        func.coalesce(func.sum(changed.c.total_cents), 0).label("cents")
+    ).select_from(changed).subquery("moved")
+    status_type = TenantOrderStats.__table__.c.status.type
+    deltas = []
+    if from_status is not None:
+        cents = literal(0) if from_status == OrderStatus.DRAFT else -moved.c.cents
+        deltas.append((from_status, -moved.c.n, cents))
+    deltas.append((to_status, moved.c.n, moved.c.cents))
+    rows = union_all(*[
+        select(
+            literal(tenant_id, TenantOrderStats.__table__.c.tenant_id.type),
+            literal(status, status_type),
+            count,
+            cents,
+            func.now()
+        ).where(moved.c.n > 0)
+        for status, count, cents in deltas
+    ])
+    upsert = pg_insert(TenantOrderStats).from_select(
+        ["tenant_id", "status", "order_count", "total_cents", "updated_at"], rows
+    )
+    upsert = upsert.on_conflict_do_update(
+        index_elements=[TenantOrderStats.tenant_id, TenantOrderStats.status],
+        set_={
+            "order_count": TenantOrderStats.order_count + upsert.excluded.order_count,
+            "total_cents": TenantOrderStats.total_cents + upsert.excluded.total_cents,
+            "updated_at": upsert.excluded.updated_at,
+        }
+    )
+    return upsert.cte("stats")
+
+
+def _transition_deltas(changed: CTE, tenant_id: str, to_status: OrderStatus) -> CTE:
+    """Upsert the tenant counter deltas for orders moved to to_status, as another CTE.
+
+    changed returns each order's new total_cents next to the old_status and
+    old_total_cents it had before the write, so orders leaving any status
+    (including to_status itself) are taken out of it exactly.
+    """
+    status_type = TenantOrderStats.__table__.c.status.type
+    deltas = union_all(
+        select(
+            changed.c.old_status.label("status"),
+            (-func.count()).label("order_count"),
+            (-func.coalesce(func.sum(changed.c.old_total_cents), 0)).label("total_cents")
+        ).group_by(changed.c.old_status),
+        select(
+            literal(to_status, status_type),
+            func.count(),
+            func.coalesce(func.sum(changed.c.total_cents), 0)
+        ).having(func.count() > 0)
+    ).subquery("deltas")
+    rows = select(
+        literal(tenant_id, TenantOrderStats.__table__.c.tenant_id.type),
+        deltas.c.status,
+        func.sum(deltas.c.order_count),
+        func.sum(deltas.c.total_cents),
+        func.now()
+    ).group_by(deltas.c.status)
+    upsert = pg_insert(TenantOrderStats).from_select(
+        ["tenant_id", "status", "order_count", "total_cents", "updated_at"], rows
+    )
+    upsert = upsert.on_conflict_do_update(
+        index_elements=[TenantOrderStats.tenant_id, TenantOrderStats.status],
+        set_={
+            "order_count": TenantOrderStats.order_count + upsert.excluded.order_count,
+            "total_cents": TenantOrderStats.total_cents + upsert.excluded.total_cents,
+            "updated_at": upsert.excluded.updated_at,
+        }
+    )
+    return upsert.cte("stats")
+
+
+def _filter_orders(
+    stmt: Select,
+    tenant_id: str,
+    status: Optional[OrderStatus] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    min_total_cents: Optional[int] = None,
+    max_total_cents: Optional[int] = None,
+    cursor_created_at: Optional[datetime] = None,
+    cursor_id: Optional[uuid.UUID] = None
+) -> Select:
+    """Restrict an orders select to one tenant, the given filters and a keyset position.
+
+    Every combination maps onto an index ordered by (created_at, id) within the
+    tenant: ix_orders_tenant_status_created_id when a status is given,
+    ix_orders_tenant_priced_created_id for amount ranges (which exclude
+    unpriced drafts) and ix_orders_tenant_created_id otherwise. Amounts are
+    trailing key columns, so non-matching rows are skipped inside the index.
+    """
+    stmt = stmt.where(Order.tenant_id == tenant_id)
+    if status is not None:
+        stmt = stmt.where(Order.status == status)
+    if created_from is not None:
+        stmt = stmt.where(Order.created_at >= created_from)
+    if created_to is not None:
+        stmt = stmt.where(Order.created_at < created_to)
+    if min_total_cents is not None:
+        stmt = stmt.where(Order.total_cents >= min_total_cents)
+    if max_total_cents is not None:
+        stmt = stmt.where(Order.total_cents <= max_total_cents)
+    if cursor_created_at and cursor_id:
+        # Row-value comparison lets Postgres seek the (created_at, id) index position directly
+        stmt = stmt.where(
+            tuple_(Order.created_at, Order.id)
+            < tuple_(cursor_created_at, cursor_id, types=[Order.created_at.type, Order.id.type])
+        )
+    return stmt
+
+
+@track_queries
 class OrderRepository:
     """Repository for order data access."""
     
@@ -32,6 +287,62 @@ class OrderRepository:
         await self.db.flush()
         return order
     
+    async def create_drafts(self, tenant_id: str, orders: List[dict]) -> None:
+        """Insert many draft orders (id, created_at) and count them, with one multi-row INSERT."""
+        if not orders:
+            return
+        created = (
+            insert(Order)
+            .values([
+                {
+                    "id": order["id"],
+                    "tenant_id": tenant_id,
+                    "status": OrderStatus.DRAFT,
+                    "version": 1,
+                    "created_at": order["created_at"],
+                    "updated_at": order["created_at"],
+                }
+                for order in orders
+            ])
+            .returning(Order.total_cents)
+            .cte("created")
+        )
+        stats = _counter_deltas(created, tenant_id, OrderStatus.DRAFT)
+        await self.db.execute(select(func.count()).select_from(created).add_cte(stats))
+    
+    async def create_draft_with_idempotency_key(
+        self,
+        order_id: uuid.UUID,
+        tenant_id: str,
+        created_at: datetime,
+        key: str,
+        body_hash: bytes,
+        response_status: int,
+        response_body: bytes,
+        claimed_at: datetime,
+        expired_before: datetime
+    ) -> bool:
+        """Claim an idempotency key and insert the draft order in one statement.
+        
+        The key is claimed when it is new or its existing record was created
+        before expired_before. The order is inserted, and the tenant's draft
+        counter incremented, only if the claim succeeded. Returns True when
+        the order was written.
+        """
+        result = await self.db.execute(_CREATE_DRAFT_WITH_IDEMPOTENCY_KEY, {
+            "order_id": order_id,
+            "tenant_id": tenant_id,
+            "status": OrderStatus.DRAFT,
+            "created_at": created_at,
+            "key": key,
+            "body_hash": body_hash,
+            "response_status": response_status,
+            "response_body": response_body,
+            "claimed_at": claimed_at,
+            "expired_before": expired_before,
+        })
+        return result.scalar_one() == 1
+    
     async def find_by_id(self, order_id: uuid.UUID, tenant_id: str) -> Optional[Order]:
         """Find order by ID and tenant."""
         stmt = select(Order).where(
@@ -43,55 +354,195 @@ class OrderRepository:
         result = await self.db.execute(stmt)
         return result.scalar_one_or_none()
     
-    async def find_by_id_with_lock(self, order_id: uuid.UUID, tenant_id: str) -> Optional[Order]:
-        """Find order by ID with row lock."""
-        stmt = select(Order).where(
+    async def confirm_if_version(
+        self,
+        order_id: uuid.UUID,
+        tenant_id: str,
+        expected_version: int,
+        total_cents: int
+    ) -> Optional[Row]:
+        """Confirm order in one conditional UPDATE; None if missing or version differs."""
+        # Any status may be confirmed; lock the row first to move its counters out of the old one
+        old = (
+            select(Order.id, Order.status, Order.total_cents)
+            .where(
+                and_(
+                    Order.id == order_id,
+                    Order.tenant_id == tenant_id,
+                    Order.version == expected_version
+                )
+            )
+            .with_for_update()
+            .cte("old")
+        )
+        confirmed = (
+            update(Order)
+            .where(Order.id == old.c.id)
+            .values(
+                status=OrderStatus.CONFIRMED,
+                total_cents=total_cents,
+                version=Order.version + 1,
+                updated_at=datetime.now(timezone.utc)
+            )
+            .returning(
+                Order.id,
+                Order.status,
+                Order.version,
+                Order.total_cents,
+                old.c.status.label("old_status"),
+                old.c.total_cents.label("old_total_cents")
+            )
+            .cte("confirmed")
+        )
+        stats = _transition_deltas(confirmed, tenant_id, OrderStatus.CONFIRMED)
+        stmt = select(confirmed.c.id, confirmed.c.status, confirmed.c.version, confirmed.c.total_cents).add_cte(stats)
+        result = await self.db.execute(stmt)
+        return result.one_or_none()
+    
+    async def close_if_confirmed(self, order_id: uuid.UUID, tenant_id: str) -> Optional[Row]:
+        """Close a confirmed order, insert its orders.closed event and move its counters in one statement.
+        
+        Returns None if the order is missing or not confirmed; nothing is written then.
+        """
+        now = datetime.now(timezone.utc)
+        closed = (
+            update(Order)
+            .where(
+                and_(
+                    Order.id == order_id,
+                    Order.tenant_id == tenant_id,
+                    Order.status == OrderStatus.CONFIRMED
+                )
+            )
+            .values(
+                status=OrderStatus.CLOSED,
+                version=Order.version + 1,
+                updated_at=now
+            )
+            .returning(Order.id, Order.tenant_id, Order.status, Order.version, Order.total_cents)
+            .cte("closed")
+        )
+        event = (
+            insert(Outbox)
+            .from_select(
+                ["id", "event_type", "order_id", "tenant_id", "payload", "created_at"],
+                select(
+                    func.gen_random_uuid(),
+                    literal_column("'orders.closed'"),
+                    closed.c.id,
+                    closed.c.tenant_id,
+                    _closed_event_payload(closed, now),
+                    literal(now, Outbox.__table__.c.created_at.type)
+                )
+            )
+            .cte("event")
+        )
+        stats = _counter_deltas(closed, tenant_id, OrderStatus.CLOSED, OrderStatus.CONFIRMED)
+        stmt = select(closed.c.id, closed.c.status, closed.c.version, closed.c.total_cents).add_cte(event, stats)
+        result = await self.db.execute(stmt)
+        row = result.one_or_none()
+        if row is not None:
+            outbox_events_inserted.inc(("orders.closed",))
+        return row
+    
+    async def find_states(self, order_ids: List[uuid.UUID], tenant_id: str) -> dict:
+        """Return {id: (status, version)} for the given orders of a tenant."""
+        stmt = select(Order.id, Order.status, Order.version).where(
             and_(
-                Order.id == order_id,
-                Order.tenant_id == tenant_id
+                Order.tenant_id == tenant_id,
+                Order.id.in_(order_ids)
             )
-        ).with_for_update()
+        )
         result = await self.db.execute(stmt)
-        return result.scalar_one_or_none()
+        return {row.id: (row.status, row.version) for row in result}
     
-    async def update_to_confirmed(self, order: Order, total_cents: int) -> Order:
-        """Update order to confirmed status."""
-        order.status = OrderStatus.CONFIRMED
-        order.total_cents = total_cents
-        order.version += 1
-        order.updated_at = datetime.now(timezone.utc)
-        await self.db.flush()
-        return order
+    async def confirm_many(
+        self,
+        tenant_id: str,
+        items: List[Tuple[uuid.UUID, int, int]]
+    ) -> List[Row]:
+        """Confirm (id, expected_version, total_cents) items and move their counters in one statement; return updated rows."""
+        result = await self.db.execute(_CONFIRM_MANY, {
+            "tenant_id": tenant_id,
+            "ids": [order_id for order_id, _, _ in items],
+            "versions": [version for _, version, _ in items],
+            "totals": [total_cents for _, _, total_cents in items],
+            "now": datetime.now(timezone.utc),
+        })
+        return list(result)
     
-    async def update_to_closed(self, order: Order) -> Order:
-        """Update order to closed status."""
-        order.status = OrderStatus.CLOSED
-        order.version += 1
-        order.updated_at = datetime.now(timezone.utc)
-        await self.db.flush()
-        return order
+    async def close_many(self, tenant_id: str, order_ids: List[uuid.UUID]) -> List[Row]:
+        """Close confirmed orders, insert all their outbox events and move their counters in one statement."""
+        now = datetime.now(timezone.utc)
+        result = await self.db.execute(_CLOSE_MANY, {
+            "tenant_id": tenant_id,
+            "ids": order_ids,
+            "now": now,
+            "closed_at": now.isoformat(),
+        })
+        rows = list(result)
+        outbox_events_inserted.inc(("orders.closed",), len(rows))
+        return rows
     
     async def list_orders(
         self,
         tenant_id: str,
         limit: int,
         cursor_created_at: Optional[datetime] = None,
-        cursor_id: Optional[uuid.UUID] = None
+        cursor_id: Optional[uuid.UUID] = None,
+        status: Optional[OrderStatus] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        min_total_cents: Optional[int] = None,
+        max_total_cents: Optional[int] = None
     ) -> List[Order]:
-        """List orders with keyset pagination."""
-        stmt = select(Order).where(Order.tenant_id == tenant_id)
-        
-        if cursor_created_at and cursor_id:
-            stmt = stmt.where(
-                or_(
-                    Order.created_at < cursor_created_at,
-                    and_(
-                        Order.created_at == cursor_created_at,
-                        Order.id < cursor_id
-                    )
-                )
-            )
-        
+        """List orders with keyset pagination, optionally filtered."""
+        stmt = _filter_orders(
+            select(Order),
+            tenant_id,
+            status=status,
+            created_from=created_from,
+            created_to=created_to,
+            min_total_cents=min_total_cents,
+            max_total_cents=max_total_cents,
+            cursor_created_at=cursor_created_at,
+            cursor_id=cursor_id
+        )
         stmt = stmt.order_by(Order.created_at.desc(), Order.id.desc()).limit(limit + 1)
         result = await self.db.execute(stmt)
         return list(result.scalars().all())
+    
+    async def stream_orders(
+        self,
+        tenant_id: str,
+        status: Optional[OrderStatus] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        cursor_created_at: Optional[datetime] = None,
+        cursor_id: Optional[uuid.UUID] = None,
+        batch_size: int = 1000
+    ) -> AsyncIterator[Row]:
+        """Stream a tenant's orders newest first through a server-side cursor."""
+        stmt = select(
+            Order.id,
+            Order.tenant_id,
+            Order.status,
+            Order.version,
+            Order.total_cents,
+            Order.created_at,
+            Order.updated_at,
+        )
+        stmt = _filter_orders(
+            stmt,
+            tenant_id,
+            status=status,
+            created_from=created_from,
+            created_to=created_to,
+            cursor_created_at=cursor_created_at,
+            cursor_id=cursor_id
+        )
+        stmt = stmt.order_by(Order.created_at.desc(), Order.id.desc()).execution_options(yield_per=batch_size)
+        result = await self.db.stream(stmt)
+        async for partition in result.partitions():
+            for row in partition:
+                yield row
@@ -0,0 +1,152 @@
+"""
+Tenant order statistics repository
+order_stats_repository.py
+"""
+
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import select, func, text, union
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.order import Order, OrderStatus
+from app.models.order_stats import TenantOrderStats
+from app.db.instrumentation import track_queries
+
+# Planner statistics for the two columns the stats are grouped by
+_PLANNER_STATS = text("""
+    SELECT s.attname, c.reltuples, s.null_frac, s.n_distinct,
+           CAST(CAST(s.most_common_vals AS text) AS text[]) AS most_common_vals,
+           s.most_common_freqs
+    FROM pg_class c
+    JOIN pg_stats s ON s.schemaname = current_schema() AND s.tablename = c.relname
+    WHERE c.oid = to_regclass('orders') AND s.attname IN ('tenant_id', 'status')
+""")
+
+
+def _selectivity(value: str, row: Optional[dict], reltuples: float) -> float:
+    """Estimate the fraction of rows equal to value, the way the planner does for '='."""
+    if row is None:
+        return 0.0
+    common = dict(zip(row["most_common_vals"] or [], row["most_common_freqs"] or []))
+    if value in common:
+        return common[value]
+    n_distinct = row["n_distinct"] if row["n_distinct"] >= 0 else -row["n_distinct"] * reltuples
+    rest = max(0.0, 1.0 - sum(common.values()) - row["null_frac"])
+    return rest / max(1.0, n_distinct - len(common))
+
+
+@track_queries
+class OrderStatsRepository:
+    """Repository for per-tenant order counters."""
+    
+    def __init__(self, db: AsyncSession):
+        """Initialize with database session."""
+        self.db = db
+    
+    async def apply_deltas(self, tenant_id: str, deltas: Dict[OrderStatus, Tuple[int, int]]) -> None:
+        """Add {status: (count_delta, total_cents_delta)} to the tenant's counters in one upsert.
+        
+        Rows are written in enum order so transactions touching several
+        statuses of a tenant always lock them in the same order.
+        """
+        now = datetime.now(timezone.utc)
+        rows = []
+        for status in OrderStatus:
+            count, total_cents = deltas.get(status, (0, 0))
+            if count or total_cents:
+                rows.append({
+                    "tenant_id": tenant_id,
+                    "status": status,
+                    "order_count": count,
+                    "total_cents": total_cents,
+                    "updated_at": now,
+                })
+        if not rows:
+            return
+        stmt = pg_insert(TenantOrderStats).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[TenantOrderStats.tenant_id, TenantOrderStats.status],
+            set_={
+                "order_count": TenantOrderStats.order_count + stmt.excluded.order_count,
+                "total_cents": TenantOrderStats.total_cents + stmt.excluded.total_cents,
+                "updated_at": stmt.excluded.updated_at,
+            }
+        )
+        await self.db.execute(stmt)
+    
+    async def get(self, tenant_id: str) -> Dict[OrderStatus, Tuple[int, int]]:
+        """Return {status: (order_count, total_cents)} for a tenant."""
+        stmt = select(
+            TenantOrderStats.status,
+            TenantOrderStats.order_count,
+            TenantOrderStats.total_cents
+        ).where(TenantOrderStats.tenant_id == tenant_id)
+        result = await self.db.execute(stmt)
+        return {row.status: (row.order_count, row.total_cents) for row in result}
+    
+    async def estimate(self, tenant_id: str) -> Optional[Dict[OrderStatus, int]]:
+        """Estimate order counts per status from planner statistics; None if orders was never analyzed.
+        
+        Tenant and status selectivities are combined assuming independence,
+        as the planner does without extended statistics.
+        """
+        result = await self.db.execute(_PLANNER_STATS)
+        stats = {row.attname: row._asdict() for row in result}
+        if not stats:
+            return None
+        reltuples = max(0.0, next(iter(stats.values()))["reltuples"])
+        tenant_fraction = _selectivity(tenant_id, stats.get("tenant_id"), reltuples)
+        return {
+            status: round(reltuples * tenant_fraction * _selectivity(status.name, stats.get("status"), reltuples))
+            for status in OrderStatus
+        }
+    
+    async def rebuild(self, tenant_id: str) -> Dict[OrderStatus, Tuple[int, int]]:
+        """Recompute a tenant's counters from orders; return {status: (count_drift, total_drift)}.
+        
+        The tenant's counter rows are locked before orders are aggregated, so
+        writers that commit earlier are counted and writers that commit later
+        apply their deltas on top of the rebuilt values.
+        """
+        now = datetime.now(timezone.utc)
+        seed = pg_insert(TenantOrderStats).values([
+            {"tenant_id": tenant_id, "status": status, "order_count": 0, "total_cents": 0, "updated_at": now}
+            for status in OrderStatus
+        ]).on_conflict_do_nothing()
+        await self.db.execute(seed)
+        
+        locked = await self.db.execute(
+            select(TenantOrderStats)
+            .where(TenantOrderStats.tenant_id == tenant_id)
+            .order_by(TenantOrderStats.status)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+        counters = {row.status: row for row in locked.scalars()}
+        
+        actual = await self.db.execute(
+            select(Order.status, func.count(), func.coalesce(func.sum(Order.total_cents), 0))
+            .where(Order.tenant_id == tenant_id)
+            .group_by(Order.status)
+        )
+        expected = {status: (count, total) for status, count, total in actual}
+        
+        drift = {}
+        for status, counter in counters.items():
+            count, total = expected.get(status, (0, 0))
+            if (counter.order_count, counter.total_cents) != (count, total):
+                drift[status] = (counter.order_count - count, counter.total_cents - total)
+                counter.order_count = count
+                counter.total_cents = total
+                counter.updated_at = now
+        await self.db.flush()
+        return drift
+    
+    async def tenant_ids(self) -> List[str]:
+        """Return every tenant that has orders or counters."""
+        stmt = union(
+            select(Order.tenant_id).distinct(),
+            select(TenantOrderStats.tenant_id).distinct()
+        )
+        result = await self.db.execute(stmt)
+        return list(result.scalars().all())
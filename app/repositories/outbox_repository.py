@@ -5,10 +5,15 @@ outbox_repository.py
 
 import uuid
 from datetime import datetime, timezone
+from typing import List
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.outbox import Outbox
+from app.core.metrics import outbox_events_inserted
+from app.db.instrumentation import track_queries
 
 
+@track_queries
 class OutboxRepository:
     """Repository for outbox data access."""
     
@@ -34,4 +39,30 @@ class OutboxRepository:
         )
         self.db.add(outbox)
         await self.db.flush()
+        outbox_events_inserted.inc((event_type,))
         return outbox
+
+    async def claim_unpublished(self, batch_size: int) -> List[Outbox]:
+        """Claim a batch of unpublished events, skipping rows locked by other relays."""
+        stmt = (
+            select(Outbox)
+            .where(Outbox.published_at.is_(None))
+            .order_by(Outbox.created_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.db.execute(stmt)
+        return list(result.scalars().all())
+
+    async def mark_published(self, event_ids: List[uuid.UUID], published_at: datetime) -> int:
+        """Stamp published_at on a batch of events in a single statement."""
+        if not event_ids:
+            return 0
+        stmt = (
+            update(Outbox)
+            .where(Outbox.id.in_(event_ids))
+            .values(published_at=published_at)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.db.execute(stmt)
+        return result.rowcount
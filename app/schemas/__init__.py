@@ -1,6 +1,41 @@
 """Schemas module exports."""
 
-from app.schemas.order import DraftOrderResponse, OrderResponse, ConfirmOrderRequest, PaginatedOrdersResponse
+from app.schemas.order import (
+    DraftOrderResponse,
+    OrderResponse,
+    OrderDetailResponse,
+    ConfirmOrderRequest,
+    PaginatedOrdersResponse,
+    BatchOrderItem,
+    BatchCreateOrdersRequest,
+    BatchOrderResult,
+    BatchCreateOrdersResponse,
+    BulkConfirmItem,
+    BulkConfirmOrdersRequest,
+    BulkCloseOrdersRequest,
+    BulkTransitionResult,
+    BulkTransitionResponse,
+    StatusStats,
+    OrderStatsResponse,
+)
 from app.schemas.error import ErrorResponse
 
-__all__ = ["DraftOrderResponse", "OrderResponse", "ConfirmOrderRequest", "PaginatedOrdersResponse", "ErrorResponse"]
+__all__ = [
+    "DraftOrderResponse",
+    "OrderResponse",
+    "OrderDetailResponse",
+    "ConfirmOrderRequest",
+    "PaginatedOrdersResponse",
+    "BatchOrderItem",
+    "BatchCreateOrdersRequest",
+    "BatchOrderResult",
+    "BatchCreateOrdersResponse",
+    "BulkConfirmItem",
+    "BulkConfirmOrdersRequest",
+    "BulkCloseOrdersRequest",
+    "BulkTransitionResult",
+    "BulkTransitionResponse",
+    "StatusStats",
+    "OrderStatsResponse",
+    "ErrorResponse",
+]
@@ -5,6 +5,7 @@ order.py
 
 from typing import Optional
 from pydantic import BaseModel, Field
+from app.schemas.error import ErrorResponse
 
 
 class DraftOrderResponse(BaseModel):
@@ -31,6 +32,18 @@ class OrderResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class OrderDetailResponse(BaseModel):
+    """Single order response schema"""
+    
+    id: str
+    tenantId: str
+    status: str
+    version: int
+    totalCents: Optional[int] = None
+    createdAt: str
+    updatedAt: str
+
+
 class ClosedOrderResponse(BaseModel):
     """Closed order response schema"""
     
@@ -53,3 +66,89 @@ class PaginatedOrdersResponse(BaseModel):
     
     items: list[OrderResponse]
     nextCursor: Optional[str] = None
+
+
+MAX_BATCH_ITEMS = 1000
+
+
+class BatchOrderItem(BaseModel):
+    """Single item of a batch create request."""
+    
+    idempotencyKey: str = Field(..., min_length=1, max_length=255)
+    body: dict = Field(default_factory=dict)
+
+
+class BatchCreateOrdersRequest(BaseModel):
+    """Batch create request."""
+    
+    items: list[BatchOrderItem] = Field(..., min_length=1, max_length=MAX_BATCH_ITEMS)
+
+
+class BatchOrderResult(BaseModel):
+    """Per-item outcome of a batch operation."""
+    
+    idempotencyKey: str
+    status: int
+    order: Optional[DraftOrderResponse] = None
+    error: Optional[ErrorResponse] = None
+
+
+class BatchCreateOrdersResponse(BaseModel):
+    """Batch create response."""
+    
+    results: list[BatchOrderResult]
+
+
+MAX_BULK_ITEMS = 10000
+
+
+class BulkConfirmItem(BaseModel):
+    """Single item of a bulk confirm request."""
+    
+    id: str
+    version: int = Field(..., ge=1, description="Expected current version")
+    totalCents: int = Field(..., gt=0, description="Total amount in cents")
+
+
+class BulkConfirmOrdersRequest(BaseModel):
+    """Bulk confirm request."""
+    
+    items: list[BulkConfirmItem] = Field(..., min_length=1, max_length=MAX_BULK_ITEMS)
+
+
+class BulkCloseOrdersRequest(BaseModel):
+    """Bulk close request."""
+    
+    ids: list[str] = Field(..., min_length=1, max_length=MAX_BULK_ITEMS)
+
+
+class BulkTransitionResult(BaseModel):
+    """Per-id outcome of a bulk transition."""
+    
+    id: str
+    status: int
+    order: Optional[OrderResponse] = None
+    error: Optional[ErrorResponse] = None
+
+
+class BulkTransitionResponse(BaseModel):
+    """Bulk transition response."""
+    
+    results: list[BulkTransitionResult]
+
+
+class StatusStats(BaseModel):
+    """Order count and total_cents sum for one status."""
+    
+    orderCount: int
+    totalCents: Optional[int] = None
+
+
+class OrderStatsResponse(BaseModel):
+    """Per-tenant order statistics; totals are omitted when estimated."""
+    
+    tenantId: str
+    estimated: bool
+    orderCount: int
+    totalCents: Optional[int] = None
+    byStatus: dict[str, StatusStats]
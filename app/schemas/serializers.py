@@ -0,0 +1,64 @@
+"""
+Pre-built response serializers
+serializers.py
+
+Project service dicts onto a response schema's fields without running
+pydantic validation. Service output is trusted to already carry the right
+types; only the field set is enforced, as response_model filtering would.
+"""
+
+import typing
+from typing import Any, Callable, Optional, Type
+
+from pydantic import BaseModel
+
+from app.schemas.order import ClosedOrderResponse, DraftOrderResponse, OrderDetailResponse, OrderResponse, PaginatedOrdersResponse
+
+Serializer = Callable[[dict], dict]
+
+
+def _nested_serializer(annotation: Any) -> Optional[Callable[[Any], Any]]:
+    """Return a converter for model, list[model] or Optional[model] annotations."""
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        serialize = build_serializer(annotation)
+        return lambda value: None if value is None else serialize(value)
+
+    origin = typing.get_origin(annotation)
+    args = typing.get_args(annotation)
+    if origin is list and args:
+        item = _nested_serializer(args[0])
+        if item is not None:
+            return lambda values: [item(value) for value in values]
+    if origin is typing.Union:
+        members = [arg for arg in args if arg is not type(None)]
+        if len(members) == 1:
+            return _nested_serializer(members[0])
+    return None
+
+
+def build_serializer(model: Type[BaseModel]) -> Serializer:
+    """Build a function mapping a dict onto model's fields (defaults for missing optionals)."""
+    plan = [
+        (
+            name,
+            None if field.is_required() else field.get_default(call_default_factory=True),
+            _nested_serializer(field.annotation),
+        )
+        for name, field in model.model_fields.items()
+    ]
+
+    def serialize(data: dict) -> dict:
+        result = {}
+        for name, default, nested in plan:
+            value = data.get(name, default)
+            result[name] = value if nested is None else nested(value)
+        return result
+
+    return serialize
+
+
+serialize_draft_order = build_serializer(DraftOrderResponse)
+serialize_order = build_serializer(OrderResponse)
+serialize_order_detail = build_serializer(OrderDetailResponse)
+serialize_closed_order = build_serializer(ClosedOrderResponse)
+serialize_paginated_orders = build_serializer(PaginatedOrdersResponse)
@@ -0,0 +1,279 @@
+"""
+Multi-worker HTTP server
+server.py
+
+Binds the listening socket once and runs SERVER_WORKERS uvicorn processes
+that accept from it. Workers use uvloop and httptools when installed, and
+with DB_CONNECTION_BUDGET set each one gets an equal share of the budget
+as its pool size and overflow. The budget is split one worker wider than
+SERVER_WORKERS because a reload briefly runs an extra worker.
+
+Signals to the supervisor:
+    SIGTERM, SIGINT   stop; workers finish in-flight requests first
+    SIGHUP            reload; workers are replaced one at a time, each new
+                      worker accepting before an old one is stopped
+
+Usage:
+    python -m app.server --workers 4 --port 8000
+"""
+
+import argparse
+import importlib.util
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+import time
+from multiprocessing.process import BaseProcess
+from multiprocessing.synchronize import Event as ProcessEvent
+from typing import Dict, List, Optional, Tuple
+
+import uvicorn
+
+from app.core.config import settings
+from app.core.logging import get_logger, setup_logging, shutdown_logging
+
+logger = get_logger(__name__)
+
+APP = "app.main:app"
+
+# Workers are spawned rather than forked so each imports the current code
+# (which is what a reload picks up) and no engine or loop is shared
+_spawn = multiprocessing.get_context("spawn")
+
+# A worker that exits sooner than this after starting counts as a crash;
+# consecutive crashes double the delay before the next replacement
+MIN_WORKER_UPTIME_SECONDS = 10.0
+MAX_RESTART_DELAY_SECONDS = 60.0
+
+
+def default_workers() -> int:
+    """One worker per CPU this process may run on."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def resolve_loop(name: str) -> str:
+    """Map "auto" to uvloop when it is installed, else asyncio."""
+    if name != "auto":
+        return name
+    return "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+
+
+def resolve_http(name: str) -> str:
+    """Map "auto" to httptools when it is installed, else h11."""
+    if name != "auto":
+        return name
+    return "httptools" if importlib.util.find_spec("httptools") else "h11"
+
+
+def worker_pool_limits(
+    budget: int,
+    workers: int,
+    pool_size: int,
+    max_overflow: int,
+    reserved: int = 0
+) -> Tuple[int, int]:
+    """Split a connection budget across workers; return (pool_size, max_overflow) per worker.
+
+    The configured pool_size and max_overflow are upper bounds. reserved
+    connections per worker that bypass the pool come out of each share first.
+    """
+    share = budget // workers - reserved
+    if share < 1:
+        raise ValueError(
+            f"DB_CONNECTION_BUDGET={budget} leaves no pool connection for each of {workers} workers"
+        )
+    size = min(pool_size, share)
+    return size, min(max_overflow, share - size)
+
+
+def build_config(host: str, port: int) -> uvicorn.Config:
+    """uvicorn settings shared by every worker."""
+    return uvicorn.Config(
+        APP,
+        host=host,
+        port=port,
+        loop=resolve_loop(settings.server_loop),
+        http=resolve_http(settings.server_http),
+        lifespan="on",
+        backlog=settings.server_backlog,
+        timeout_keep_alive=settings.server_keep_alive_seconds,
+        timeout_graceful_shutdown=settings.server_graceful_shutdown_seconds,
+        limit_concurrency=settings.server_limit_concurrency,
+        access_log=settings.server_access_log,
+    )
+
+
+class _WorkerServer(uvicorn.Server):
+    """uvicorn server that signals the supervisor once it accepts connections."""
+
+    def __init__(self, config: uvicorn.Config, ready: ProcessEvent):
+        super().__init__(config)
+        self.ready = ready
+
+    async def startup(self, sockets: Optional[List[socket.socket]] = None) -> None:
+        await super().startup(sockets=sockets)
+        if not self.should_exit:
+            self.ready.set()
+
+
+def _serve(config: uvicorn.Config, sock: socket.socket, ready: ProcessEvent) -> None:
+    """Worker process entry point."""
+    config.configure_logging()
+    _WorkerServer(config, ready).run(sockets=[sock])
+
+
+class Supervisor:
+    """Keeps a fixed number of worker processes serving one socket."""
+
+    def __init__(self, config: uvicorn.Config, workers: int):
+        self.config = config
+        self.workers = workers
+        self.processes: List[BaseProcess] = []
+        # Held for each process's lifetime: a child unpickles its event after start() returns
+        self._ready: Dict[BaseProcess, ProcessEvent] = {}
+        self._started_at: Dict[BaseProcess, float] = {}
+        self._crashes = 0
+        self._restart_at = 0.0
+        self.sock: Optional[socket.socket] = None
+        self._should_exit = False
+        self._reload_requested = False
+        self._wake = threading.Event()
+
+    def run(self) -> None:
+        """Serve until SIGTERM or SIGINT, reloading on SIGHUP and replacing workers that die."""
+        self.sock = self.config.bind_socket()
+        for sig in (signal.SIGINT, signal.SIGTERM, signal.SIGHUP):
+            signal.signal(sig, self._on_signal)
+
+        try:
+            for _ in range(self.workers):
+                self._start_worker()
+            while not self._should_exit:
+                self._wake.wait(1.0)
+                self._wake.clear()
+                if self._reload_requested:
+                    self._reload_requested = False
+                    self._reload()
+                self._replace_dead()
+        finally:
+            self._stop(self.processes)
+            self.sock.close()
+
+    def _on_signal(self, sig: int, frame) -> None:
+        if sig == signal.SIGHUP:
+            self._reload_requested = True
+        else:
+            self._should_exit = True
+        self._wake.set()
+
+    def _start_worker(self) -> Tuple[BaseProcess, ProcessEvent]:
+        ready = _spawn.Event()
+        process = _spawn.Process(target=_serve, args=(self.config, self.sock, ready), name="orders-api-worker")
+        process.start()
+        self.processes.append(process)
+        self._ready[process] = ready
+        self._started_at[process] = time.monotonic()
+        logger.info(f"Started worker {process.pid}")
+        return process, ready
+
+    def _reload(self) -> None:
+        """Replace workers one at a time; keep the old ones if a new one fails to start."""
+        logger.info(f"Reloading {len(self.processes)} worker(s)")
+        for old in list(self.processes):
+            if self._should_exit:
+                return
+            new, ready = self._start_worker()
+            if not ready.wait(self.config.timeout_notify):
+                logger.error(f"Worker {new.pid} did not start within {self.config.timeout_notify}s, reload aborted")
+                self._stop([new])
+                return
+            self._stop([old])
+        logger.info("Reload complete")
+
+    def restart_delay(self) -> float:
+        """Seconds to wait before replacing a worker after the current run of crashes."""
+        if not self._crashes:
+            return 0.0
+        return min(2.0 ** (self._crashes - 1), MAX_RESTART_DELAY_SECONDS)
+
+    def _replace_dead(self) -> None:
+        # Workers also get a terminal's SIGINT; they are not replaced while stopping
+        if self._should_exit:
+            return
+        now = time.monotonic()
+        for process in list(self.processes):
+            if not process.is_alive():
+                uptime = now - self._started_at.pop(process, now)
+                self._crashes = self._crashes + 1 if uptime < MIN_WORKER_UPTIME_SECONDS else 0
+                self._restart_at = now + self.restart_delay()
+                logger.warning(
+                    f"Worker {process.pid} exited with code {process.exitcode} after {uptime:.1f}s, "
+                    f"replacing it in {self.restart_delay():.0f}s"
+                )
+                self.processes.remove(process)
+                self._ready.pop(process, None)
+        if now >= self._restart_at:
+            while len(self.processes) < self.workers:
+                self._start_worker()
+
+    def _stop(self, processes: List[BaseProcess]) -> None:
+        """SIGTERM the processes, wait out the graceful shutdown, then kill stragglers."""
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+        for process in processes:
+            process.join(self.config.timeout_graceful_shutdown + 5)
+            if process.is_alive():
+                logger.warning(f"Worker {process.pid} did not stop gracefully, killing it")
+                process.kill()
+                process.join()
+            if process in self.processes:
+                self.processes.remove(process)
+            self._ready.pop(process, None)
+            self._started_at.pop(process, None)
+
+
+def main() -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Run the API with multiple uvicorn worker processes")
+    parser.add_argument("--host", default=settings.server_host)
+    parser.add_argument("--port", type=int, default=settings.server_port)
+    parser.add_argument("--workers", type=int, default=settings.server_workers or default_workers())
+    args = parser.parse_args()
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    pool_size, max_overflow = settings.db_pool_size, settings.db_max_overflow
+    if settings.db_connection_budget:
+        # The list cache invalidator's LISTEN connection is opened outside the pool
+        reserved = 1 if settings.list_cache_enabled else 0
+        try:
+            # One extra share: each reload step runs a new worker beside the old ones
+            pool_size, max_overflow = worker_pool_limits(
+                settings.db_connection_budget, args.workers + 1, pool_size, max_overflow, reserved
+            )
+        except ValueError as e:
+            parser.error(str(e))
+        # Read by each worker's Settings when it is spawned
+        os.environ["DB_POOL_SIZE"] = str(pool_size)
+        os.environ["DB_MAX_OVERFLOW"] = str(max_overflow)
+
+    setup_logging()
+    config = build_config(args.host, args.port)
+    logger.info(
+        f"Serving {APP} on {args.host}:{args.port} with {args.workers} worker(s), "
+        f"loop={config.loop} http={config.http}, pool {pool_size}+{max_overflow} per worker"
+    )
+    try:
+        Supervisor(config, args.workers).run()
+    finally:
+        shutdown_logging()
+
+
+if __name__ == "__main__":
+    main()
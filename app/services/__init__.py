@@ -6,9 +6,11 @@ services/__init__.py
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.session import get_db
+from app.db.routing import get_read_db
 from app.repositories.order_repository import OrderRepository
 from app.repositories.idempotency_repository import IdempotencyRepository
 from app.repositories.outbox_repository import OutboxRepository
+from app.repositories.order_stats_repository import OrderStatsRepository
 from app.services.order_service import OrderService
 
 
@@ -18,7 +20,13 @@ def get_order_service(db: AsyncSession = Depends(get_db)) -> OrderService:
     order_repo = OrderRepository(db)
     idempotency_repo = IdempotencyRepository(db)
     outbox_repo = OutboxRepository(db)
-    return OrderService(db, order_repo, idempotency_repo, outbox_repo)
+    stats_repo = OrderStatsRepository(db)
+    return OrderService(db, order_repo, idempotency_repo, outbox_repo, stats_repo)
 
 
-__all__ = ["OrderService", "get_order_service"]
+def get_read_order_service(db: AsyncSession = Depends(get_read_db)) -> OrderService:
+    """Dependency injection for OrderService on a read-only (replica-routed) session."""
+    return get_order_service(db)
+
+
+__all__ = ["OrderService", "get_order_service", "get_read_order_service"]
@@ -3,22 +3,60 @@ Order service
 order_service.py
 """
 
+import csv
+import io
+import json
 import uuid
 from datetime import datetime, timedelta, timezone
-from typing import Tuple, List, Optional
+from typing import AsyncIterator, Tuple, List, Optional
+import orjson
 from app.repositories.order_repository import OrderRepository
 from app.repositories.idempotency_repository import IdempotencyRepository
 from app.repositories.outbox_repository import OutboxRepository
-from app.models.order import OrderStatus
-from app.core.exceptions import ConflictError, NotFoundError, PreconditionFailedError, ValidationError, InternalServerError
+from app.repositories.order_stats_repository import OrderStatsRepository
+from app.models.order import Order, OrderStatus
+from app.core.exceptions import DomainError, ConflictError, NotFoundError, PreconditionFailedError, ValidationError, InternalServerError
 from app.core.config import settings
-from app.utils.idempotency import hash_body
+from app.core.metrics import idempotency_requests, list_cache_invalidations, list_cache_requests
+from app.db.routing import consistency_token, may_lag_primary
+from app.schemas.serializers import serialize_draft_order
+from app.utils.idempotency import bodies_match, hash_body
 from app.utils.pagination import encode_cursor, decode_cursor
+from app.utils.cache import LRUTTLCache, SingleFlight, TenantPageCache
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+EXPORT_FIELDS = ["id", "tenantId", "status", "version", "totalCents", "createdAt", "updatedAt", "cursor"]
+
+# Per-worker idempotency state shared by every request served by this process
+idempotency_cache = LRUTTLCache(settings.idempotency_cache_size, settings.idempotency_cache_ttl_seconds)
+idempotency_flights = SingleFlight()
+# (tenant, id) → current version and (tenant, id, version) → order body
+order_cache = LRUTTLCache(settings.order_cache_size, settings.order_cache_ttl_seconds)
+# Cursorless GET /orders pages per (tenant, limit, filters)
+list_cache = TenantPageCache(settings.list_cache_size, settings.list_cache_ttl_seconds)
+
+
+def draft_response_body(response: dict) -> bytes:
+    """Serialize a draft order response once, as it is sent and stored for replays."""
+    return orjson.dumps(serialize_draft_order(response))
+
+
+def order_item(order: Order) -> dict:
+    """Build the response dict of one order, as listed and as returned by GET /orders/{id}."""
+    return {
+        "id": str(order.id),
+        "tenantId": order.tenant_id,
+        "status": order.status.value,
+        "version": order.version,
+        "totalCents": order.total_cents,
+        "createdAt": order.created_at.isoformat(),
+        "updatedAt": order.updated_at.isoformat(),
+    }
+
+
 class OrderService:
     """Service for order business logic."""
     
@@ -27,70 +65,332 @@ class OrderService:
         db: AsyncSession,
         order_repo: OrderRepository,
         idempotency_repo: IdempotencyRepository,
-        outbox_repo: OutboxRepository
+        outbox_repo: OutboxRepository,
+        stats_repo: OrderStatsRepository,
+        idempotency_cache: LRUTTLCache = idempotency_cache,
+        idempotency_flights: SingleFlight = idempotency_flights,
+        order_cache: LRUTTLCache = order_cache,
+        list_cache: TenantPageCache = list_cache
     ):
         """Initialize with repositories."""
         self.db = db
         self.order_repo = order_repo
         self.idempotency_repo = idempotency_repo
         self.outbox_repo = outbox_repo
+        self.stats_repo = stats_repo
+        self.idempotency_cache = idempotency_cache
+        self.idempotency_flights = idempotency_flights
+        self.order_cache = order_cache
+        self.list_cache = list_cache
     
     async def create_order_idempotent(
         self,
         tenant_id: str,
         key: str,
         body: dict
-    ) -> Tuple[dict, int]:
-        """Create draft order with idempotency."""
+    ) -> Tuple[bytes, int]:
+        """Create draft order with idempotency; return the serialized response and status code."""
         logger.info("Creating draft order with idempotency")
         try:
-            now = datetime.now(timezone.utc)
             body_hash = hash_body(body)
+            cache_key = (tenant_id, key)
             
-            # Check for existing idempotency key
-            record = await self.idempotency_repo.find(tenant_id, key)
+            # Hot retries are answered from the per-worker cache without a DB round trip
+            cached = self.idempotency_cache.get(cache_key)
+            if cached is not None:
+                stored_hash, response_body = cached
+                created = False
+            else:
+                # Concurrent same-key requests in this worker share one resolution
+                (stored_hash, response_body, created), shared = await self.idempotency_flights.do(
+                    cache_key,
+                    lambda: self._resolve_idempotency_key(tenant_id, key, body_hash)
+                )
+                created = created and not shared
             
-            if record:
-                # Check if record is within 1-hour window
-                record_time = record.created_at.replace(tzinfo=timezone.utc)
-                ttl_cutoff = now - timedelta(hours=settings.idempotency_ttl_hours)
-
-                # TTL still valid → attempt replay
-                if record_time >= ttl_cutoff:
-                    await self.idempotency_repo.delete(record)
-                    stored_hash = record.response_json["body_hash"]
-
-                    # Same body → replay
-                    if stored_hash == body_hash:
-                        return record.response_json["response"], 200
-
-                    # Same key + different body → 409
-                    raise ConflictError(
-                        f"Idempotency key '{key}' already used with different request body"
-                    )
-                
-            # Create new draft order
-            order = await self.order_repo.create_draft(tenant_id)
+            if created:
+                idempotency_requests.inc(("created",))
+                self._invalidate_tenant_pages(tenant_id)
+                return response_body, 201
             
-            # Prepare response
-            response = {
-                "id": str(order.id),
-                "tenantId": order.tenant_id,
-                "status": order.status.value,
-                "version": order.version,
-                "createdAt": order.created_at.isoformat(),
-            }
+            # Same body → replay
+            if bodies_match(stored_hash, body, body_hash):
+                idempotency_requests.inc(("replayed",))
+                return response_body, 200
             
-            # Store idempotency key
-            await self.idempotency_repo.store(tenant_id, key, body_hash, response)
+            # Same key + different body → 409
+            idempotency_requests.inc(("conflict",))
+            raise ConflictError(
+                f"Idempotency key '{key}' already used with different request body"
+            )
+        except (ConflictError, NotFoundError, PreconditionFailedError, ValidationError):
+            raise
+        except Exception as e:
+            raise InternalServerError(f"Failed to create order: {str(e)}")
+    
+    async def _resolve_idempotency_key(
+        self,
+        tenant_id: str,
+        key: str,
+        body_hash: bytes
+    ) -> Tuple[bytes, bytes, bool]:
+        """Return (stored_hash, response_body, created) for a key, creating the order on first use."""
+        if settings.idempotency_fast_path:
+            return await self._resolve_idempotency_key_single_statement(tenant_id, key, body_hash)
+        return await self._resolve_idempotency_key_locked(tenant_id, key, body_hash)
+    
+    async def _resolve_idempotency_key_single_statement(
+        self,
+        tenant_id: str,
+        key: str,
+        body_hash: bytes
+    ) -> Tuple[bytes, bytes, bool]:
+        """Claim the key and insert the order in one statement; read only on conflict."""
+        now = datetime.now(timezone.utc)
+        ttl = timedelta(hours=settings.idempotency_ttl_hours)
+        
+        # Two attempts: the record found on conflict may be swept before it is read
+        for _ in range(2):
+            order_id = uuid.uuid4()
+            created_at = datetime.utcnow()
+            response_body = draft_response_body({
+                "id": str(order_id),
+                "tenantId": tenant_id,
+                "status": OrderStatus.DRAFT.value,
+                "version": 1,
+                "createdAt": created_at.isoformat(),
+            })
+            created = await self.order_repo.create_draft_with_idempotency_key(
+                order_id=order_id,
+                tenant_id=tenant_id,
+                created_at=created_at,
+                key=key,
+                body_hash=body_hash,
+                response_status=201,
+                response_body=response_body,
+                claimed_at=now,
+                expired_before=now - ttl
+            )
+            if created:
+                await self.db.commit()
+                self._cache_idempotency_record(tenant_id, key, body_hash, response_body, ttl)
+                return body_hash, response_body, True
             
+            # Key held by a live record → replay it
+            record = await self.idempotency_repo.find(tenant_id, key)
             await self.db.commit()
+            if record:
+                remaining = record.created_at.replace(tzinfo=timezone.utc) + ttl - now
+                self._cache_idempotency_record(tenant_id, key, record.body_hash, record.response_body, remaining)
+                return record.body_hash, record.response_body, False
+        
+        raise InternalServerError(f"Could not claim idempotency key '{key}'")
+    
+    async def _resolve_idempotency_key_locked(
+        self,
+        tenant_id: str,
+        key: str,
+        body_hash: bytes
+    ) -> Tuple[bytes, bytes, bool]:
+        """Resolve a key under an advisory lock with separate find/insert statements."""
+        now = datetime.now(timezone.utc)
+        ttl = timedelta(hours=settings.idempotency_ttl_hours)
+        
+        # Serialize same-key requests across API nodes until commit
+        await self.idempotency_repo.lock(tenant_id, key)
+        record = await self.idempotency_repo.find(tenant_id, key)
+        
+        if record:
+            record_time = record.created_at.replace(tzinfo=timezone.utc)
+            
+            # TTL still valid → replay stored response
+            if record_time >= now - ttl:
+                stored_hash, response_body = record.body_hash, record.response_body
+                await self.db.commit()
+                self._cache_idempotency_record(tenant_id, key, stored_hash, response_body, record_time + ttl - now)
+                return stored_hash, response_body, False
+            
+            # Expired → key may be reused
+            await self.idempotency_repo.delete(record)
+        
+        # Create new draft order
+        order = await self.order_repo.create_draft(tenant_id)
+        
+        # Prepare response
+        response_body = draft_response_body({
+            "id": str(order.id),
+            "tenantId": order.tenant_id,
+            "status": order.status.value,
+            "version": order.version,
+            "createdAt": order.created_at.isoformat(),
+        })
+        
+        # Store idempotency key
+        await self.idempotency_repo.store(tenant_id, key, body_hash, 201, response_body)
+        await self.stats_repo.apply_deltas(tenant_id, {OrderStatus.DRAFT: (1, 0)})
+        
+        await self.db.commit()
+        self._cache_idempotency_record(tenant_id, key, body_hash, response_body, ttl)
+        
+        return body_hash, response_body, True
+    
+    def _cache_idempotency_record(
+        self,
+        tenant_id: str,
+        key: str,
+        body_hash: bytes,
+        response_body: bytes,
+        remaining: timedelta
+    ) -> None:
+        """Cache a committed idempotency record for no longer than it stays valid."""
+        ttl = min(settings.idempotency_cache_ttl_seconds, remaining.total_seconds())
+        self.idempotency_cache.set((tenant_id, key), (body_hash, response_body), ttl=ttl)
+    
+    async def create_orders_batch(
+        self,
+        tenant_id: str,
+        items: List[Tuple[str, dict]]
+    ) -> List[dict]:
+        """Create many draft orders, each with its own idempotency key.
+        
+        Returns one result per item in request order with status 201 (created),
+        200 (replay) or 409 (key reused with a different body). A key repeated
+        within the batch is treated as a retry of its first occurrence.
+        """
+        logger.info("Creating draft orders in batch")
+        try:
+            now = datetime.now(timezone.utc)
+            ttl = timedelta(hours=settings.idempotency_ttl_hours)
+            hashes = [hash_body(body) for _, body in items]
+            
+            # key -> (stored_hash, response_body, created)
+            resolved = {}
+            # key -> response dict, parsed once per key
+            orders = {}
+            first_hash = {}
+            pending = []
+            for (key, _), body_hash in zip(items, hashes):
+                if key in first_hash:
+                    continue
+                first_hash[key] = body_hash
+                cached = self.idempotency_cache.get((tenant_id, key))
+                if cached is not None:
+                    resolved[key] = (*cached, False)
+                else:
+                    pending.append(key)
+            
+            if pending:
+                replayed = await self._resolve_live_records(tenant_id, pending, now, ttl)
+                resolved.update(replayed)
+                to_create = [key for key in pending if key not in replayed]
+                claimed = set()
+                created_at = datetime.utcnow()
+                
+                # Two attempts: a record that beat us to a key may be swept before it is read
+                for _ in range(2):
+                    if not to_create:
+                        break
+                    new_orders = {}
+                    for key in to_create:
+                        order_id = uuid.uuid4()
+                        response = {
+                            "id": str(order_id),
+                            "tenantId": tenant_id,
+                            "status": OrderStatus.DRAFT.value,
+                            "version": 1,
+                            "createdAt": created_at.isoformat(),
+                        }
+                        new_orders[key] = {
+                            "id": order_id,
+                            "created_at": created_at,
+                            "response": response,
+                            "response_body": draft_response_body(response),
+                        }
+                    
+                    claimed_now = await self.idempotency_repo.claim_many(
+                        tenant_id,
+                        [
+                            (key, first_hash[key], 201, order["response_body"])
+                            for key, order in new_orders.items()
+                        ],
+                        claimed_at=now,
+                        expired_before=now - ttl
+                    )
+                    await self.order_repo.create_drafts(
+                        tenant_id,
+                        [order for key, order in new_orders.items() if key in claimed_now]
+                    )
+                    for key in claimed_now:
+                        resolved[key] = (first_hash[key], new_orders[key]["response_body"], True)
+                        orders[key] = new_orders[key]["response"]
+                    claimed |= claimed_now
+                    
+                    # Keys claimed concurrently by another request → replay theirs
+                    lost = [key for key in to_create if key not in claimed_now]
+                    if lost:
+                        resolved.update(await self._resolve_live_records(tenant_id, lost, now, ttl))
+                    to_create = [key for key in lost if key not in resolved]
+                
+                await self.db.commit()
+                
+                for key in claimed:
+                    stored_hash, response_body, _ = resolved[key]
+                    self._cache_idempotency_record(tenant_id, key, stored_hash, response_body, ttl)
+                if claimed:
+                    self._invalidate_tenant_pages(tenant_id)
             
-            return response, 201
+            results = []
+            reported = set()
+            for (key, body), body_hash in zip(items, hashes):
+                if key not in resolved:
+                    error = InternalServerError(f"Could not claim idempotency key '{key}'")
+                    results.append({
+                        "idempotencyKey": key,
+                        "status": error.status_code,
+                        "error": {"code": error.code, "message": error.message},
+                    })
+                    continue
+                stored_hash, response_body, created = resolved[key]
+                if created and key not in reported:
+                    idempotency_requests.inc(("created",))
+                    results.append({"idempotencyKey": key, "status": 201, "order": orders[key]})
+                elif bodies_match(stored_hash, body, body_hash):
+                    idempotency_requests.inc(("replayed",))
+                    if key not in orders:
+                        orders[key] = orjson.loads(response_body)
+                    results.append({"idempotencyKey": key, "status": 200, "order": orders[key]})
+                else:
+                    idempotency_requests.inc(("conflict",))
+                    error = ConflictError(
+                        f"Idempotency key '{key}' already used with different request body"
+                    )
+                    results.append({
+                        "idempotencyKey": key,
+                        "status": error.status_code,
+                        "error": {"code": error.code, "message": error.message},
+                    })
+                reported.add(key)
+            
+            return results
         except (ConflictError, NotFoundError, PreconditionFailedError, ValidationError):
             raise
         except Exception as e:
-            raise InternalServerError(f"Failed to create order: {str(e)}")
+            raise InternalServerError(f"Failed to create orders: {str(e)}")
+    
+    async def _resolve_live_records(
+        self,
+        tenant_id: str,
+        keys: List[str],
+        now: datetime,
+        ttl: timedelta
+    ) -> dict:
+        """Return {key: (stored_hash, response_body, False)} for keys held by unexpired records."""
+        records = await self.idempotency_repo.find_many(tenant_id, keys)
+        resolved = {}
+        for key, record in records.items():
+            if record.created_at.replace(tzinfo=timezone.utc) >= now - ttl:
+                resolved[key] = (record.body_hash, record.response_body, False)
+        return resolved
     
     async def confirm_order(
         self,
@@ -102,19 +402,22 @@ class OrderService:
         """Confirm order with optimistic locking."""
         logger.info("Confirming order with optimistic locking")
         try:
-            order = await self.order_repo.find_by_id(uuid.UUID(order_id), tenant_id)
+            order_uuid = uuid.UUID(order_id)
+            order = await self.order_repo.confirm_if_version(
+                order_uuid, tenant_id, expected_version, total_cents
+            )
             
             if not order:
-                raise NotFoundError(f"Order {order_id} not found")
-            
-            if order.version != expected_version:
+                # Nothing updated → read once to tell 404 from a stale version
+                if not await self.order_repo.find_by_id(order_uuid, tenant_id):
+                    raise NotFoundError(f"Order {order_id} not found")
                 raise ConflictError(
                     "Stale version"
                 )
             
-            order = await self.order_repo.update_to_confirmed(order, total_cents)
-
             await self.db.commit()
+            self._invalidate_order(tenant_id, order_uuid)
+            self._invalidate_tenant_pages(tenant_id)
             
             return {
                 "id": str(order.id),
@@ -135,31 +438,23 @@ class OrderService:
         """Close order and create outbox entry."""
         logger.info("Closing order and creating outbox entry")
         try:
-            order = await self.order_repo.find_by_id_with_lock(uuid.UUID(order_id), tenant_id)
+            order_uuid = uuid.UUID(order_id)
             
-            if not order:
-                raise NotFoundError(f"Order {order_id} not found")
+            # Close and write the outbox entry in one statement
+            order = await self.order_repo.close_if_confirmed(order_uuid, tenant_id)
             
-            if order.status != OrderStatus.CONFIRMED:
+            if not order:
+                # Nothing updated → read once to tell 404 from a wrong status
+                current = await self.order_repo.find_by_id(order_uuid, tenant_id)
+                if not current:
+                    raise NotFoundError(f"Order {order_id} not found")
                 raise PreconditionFailedError(
-                    f"Can only close confirmed orders, current status: {order.status.value}"
+                    f"Can only close confirmed orders, current status: {current.status.value}"
                 )
             
-            order = await self.order_repo.update_to_closed(order)
-            
-            # Create outbox entry
-            await self.outbox_repo.create_event(
-                event_type="orders.closed",
-                order_id=order.id,
-                tenant_id=tenant_id,
-                payload={
-                    "orderId": str(order.id),
-                    "tenantId": tenant_id,
-                    "totalCents": order.total_cents,
-                    "closedAt": order.updated_at.isoformat()
-                }
-            )
             await self.db.commit()
+            self._invalidate_order(tenant_id, order_uuid)
+            self._invalidate_tenant_pages(tenant_id)
             
             return {
                 "id": str(order.id),
@@ -171,15 +466,220 @@ class OrderService:
         except Exception as e:
             raise InternalServerError(f"Failed to close order: {str(e)}")
     
+    async def bulk_confirm_orders(
+        self,
+        tenant_id: str,
+        items: List[Tuple[str, int, int]]
+    ) -> List[dict]:
+        """Confirm many (order_id, expected_version, total_cents) items.
+        
+        Each chunk is confirmed with one set-based UPDATE and committed on its
+        own so row locks are held only for the duration of a chunk.
+        """
+        logger.info("Confirming orders in bulk")
+        try:
+            results, parsed = self._parse_bulk_ids([order_id for order_id, _, _ in items])
+            chunk_size = settings.bulk_transition_chunk_size
+            
+            for start in range(0, len(parsed), chunk_size):
+                # Rows are locked in the order listed; sorting by id makes
+                # concurrent calls with overlapping ids lock them in the same
+                # order instead of deadlocking
+                chunk = sorted(parsed[start:start + chunk_size], key=lambda item: item[1])
+                rows = await self.order_repo.confirm_many(
+                    tenant_id,
+                    [(order_uuid, items[index][1], items[index][2]) for index, order_uuid in chunk]
+                )
+                updated = {row.id: row for row in rows}
+                missing = [order_uuid for _, order_uuid in chunk if order_uuid not in updated]
+                states = await self.order_repo.find_states(missing, tenant_id) if missing else {}
+                await self.db.commit()
+                for order_uuid in updated:
+                    self._invalidate_order(tenant_id, order_uuid)
+                if updated:
+                    self._invalidate_tenant_pages(tenant_id)
+                
+                for index, order_uuid in chunk:
+                    row = updated.get(order_uuid)
+                    if row:
+                        results[index] = {
+                            "id": str(row.id),
+                            "status": 200,
+                            "order": {
+                                "id": str(row.id),
+                                "status": row.status.value,
+                                "version": row.version,
+                                "totalCents": row.total_cents,
+                            },
+                        }
+                    elif order_uuid not in states:
+                        results[index] = self._bulk_error(str(order_uuid), NotFoundError(f"Order {order_uuid} not found"))
+                    else:
+                        results[index] = self._bulk_error(str(order_uuid), ConflictError("Stale version"))
+            
+            return results
+        except (ConflictError, NotFoundError, PreconditionFailedError, ValidationError):
+            raise
+        except Exception as e:
+            raise InternalServerError(f"Failed to confirm orders: {str(e)}")
+    
+    async def bulk_close_orders(
+        self,
+        tenant_id: str,
+        order_ids: List[str]
+    ) -> List[dict]:
+        """Close many confirmed orders and emit their outbox events.
+        
+        Each chunk closes its orders and inserts all orders.closed events in
+        one statement, then commits.
+        """
+        logger.info("Closing orders in bulk")
+        try:
+            results, parsed = self._parse_bulk_ids(order_ids)
+            chunk_size = settings.bulk_transition_chunk_size
+            
+            for start in range(0, len(parsed), chunk_size):
+                # Sorted by id for the same lock ordering as bulk_confirm_orders
+                chunk = sorted(parsed[start:start + chunk_size], key=lambda item: item[1])
+                rows = await self.order_repo.close_many(
+                    tenant_id, [order_uuid for _, order_uuid in chunk]
+                )
+                updated = {row.id: row for row in rows}
+                missing = [order_uuid for _, order_uuid in chunk if order_uuid not in updated]
+                states = await self.order_repo.find_states(missing, tenant_id) if missing else {}
+                await self.db.commit()
+                for order_uuid in updated:
+                    self._invalidate_order(tenant_id, order_uuid)
+                if updated:
+                    self._invalidate_tenant_pages(tenant_id)
+                
+                for index, order_uuid in chunk:
+                    row = updated.get(order_uuid)
+                    if row:
+                        results[index] = {
+                            "id": str(row.id),
+                            "status": 200,
+                            "order": {
+                                "id": str(row.id),
+                                "status": row.status.value,
+                                "version": row.version,
+                                "totalCents": row.total_cents,
+                            },
+                        }
+                    elif order_uuid not in states:
+                        results[index] = self._bulk_error(str(order_uuid), NotFoundError(f"Order {order_uuid} not found"))
+                    else:
+                        current_status, _ = states[order_uuid]
+                        results[index] = self._bulk_error(str(order_uuid), PreconditionFailedError(
+                            f"Can only close confirmed orders, current status: {current_status.value}"
+                        ))
+            
+            return results
+        except (ConflictError, NotFoundError, PreconditionFailedError, ValidationError):
+            raise
+        except Exception as e:
+            raise InternalServerError(f"Failed to close orders: {str(e)}")
+    
+    @staticmethod
+    def _parse_bulk_ids(order_ids: List[str]) -> Tuple[List[Optional[dict]], List[Tuple[int, uuid.UUID]]]:
+        """Split bulk ids into (results with per-item errors filled in, [(index, uuid)] to process)."""
+        results: List[Optional[dict]] = [None] * len(order_ids)
+        parsed = []
+        seen = set()
+        for index, order_id in enumerate(order_ids):
+            try:
+                order_uuid = uuid.UUID(order_id)
+            except ValueError:
+                results[index] = OrderService._bulk_error(order_id, ValidationError(f"Invalid order id: {order_id}"))
+                continue
+            if order_uuid in seen:
+                results[index] = OrderService._bulk_error(order_id, ConflictError(f"Order {order_id} appears more than once"))
+                continue
+            seen.add(order_uuid)
+            parsed.append((index, order_uuid))
+        return results, parsed
+    
+    @staticmethod
+    def _bulk_error(order_id: str, error: DomainError) -> dict:
+        """Build a per-item error result."""
+        return {
+            "id": order_id,
+            "status": error.status_code,
+            "error": {"code": error.code, "message": error.message},
+        }
+    
+    def _invalidate_order(self, tenant_id: str, order_uuid: uuid.UUID) -> None:
+        """Forget the cached current version of an order after it changed."""
+        self.order_cache.delete((tenant_id, order_uuid))
+    
+    def _invalidate_tenant_pages(self, tenant_id: str) -> None:
+        """Drop cached list pages of a tenant here and, via subscribers, on other workers."""
+        self.list_cache.invalidate(tenant_id)
+        list_cache_invalidations.inc(("local",))
+    
+    async def get_order(self, order_id: str, tenant_id: str, use_cache: bool = True) -> dict:
+        """Get one order, from the per-worker cache when use_cache is set and its current version is known."""
+        try:
+            order_uuid = uuid.UUID(order_id)
+        except ValueError:
+            raise NotFoundError(f"Order {order_id} not found")
+        try:
+            if use_cache:
+                version = self.order_cache.get((tenant_id, order_uuid))
+                if version is not None:
+                    cached = self.order_cache.get((tenant_id, order_uuid, version))
+                    if cached is not None:
+                        return cached
+            
+            order = await self.order_repo.find_by_id(order_uuid, tenant_id)
+            if not order:
+                raise NotFoundError(f"Order {order_id} not found")
+            
+            result = order_item(order)
+            if use_cache:
+                self.order_cache.set((tenant_id, order_uuid), order.version)
+                self.order_cache.set((tenant_id, order_uuid, order.version), result)
+            return result
+        except (ConflictError, NotFoundError, PreconditionFailedError, ValidationError):
+            raise
+        except Exception as e:
+            raise InternalServerError(f"Failed to get order: {str(e)}")
+    
+    async def consistency_token(self) -> Optional[str]:
+        """Return a token for read-your-writes reads after this service's writes, if replicas are used."""
+        return await consistency_token(self.db)
+    
     async def list_orders(
         self,
         tenant_id: str,
         limit: int,
-        cursor: Optional[str] = None
+        cursor: Optional[str] = None,
+        use_cache: bool = True,
+        status: Optional[OrderStatus] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        min_total_cents: Optional[int] = None,
+        max_total_cents: Optional[int] = None
     ) -> Tuple[List[dict], Optional[str]]:
-        """List orders with keyset pagination."""
+        """List orders with keyset pagination, optionally filtered.
+        
+        Cursors only encode a position; clients repeat the same filters on
+        every page. First pages (no cursor) are served from the per-worker
+        list cache when use_cache is set and caching is enabled.
+        """
         logger.info("Listing orders with keyset pagination")
+        if min_total_cents is not None and max_total_cents is not None and min_total_cents > max_total_cents:
+            raise ValidationError("minTotalCents must not exceed maxTotalCents")
         try:
+            cacheable = use_cache and cursor is None and settings.list_cache_enabled
+            if cacheable:
+                page_key = (limit, status, created_from, created_to, min_total_cents, max_total_cents)
+                generation = self.list_cache.generation(tenant_id)
+                cached = self.list_cache.get(tenant_id, page_key)
+                list_cache_requests.inc(("hit",) if cached is not None else ("miss",))
+                if cached is not None:
+                    return cached
+            
             cursor_data = decode_cursor(cursor)
             
             cursor_created_at = None
@@ -189,7 +689,15 @@ class OrderService:
                 cursor_id = uuid.UUID(cursor_id_str)
             
             orders = await self.order_repo.list_orders(
-                tenant_id, limit, cursor_created_at, cursor_id
+                tenant_id,
+                limit,
+                cursor_created_at,
+                cursor_id,
+                status=status,
+                created_from=created_from,
+                created_to=created_to,
+                min_total_cents=min_total_cents,
+                max_total_cents=max_total_cents
             )
             
             has_more = len(orders) > limit
@@ -200,21 +708,135 @@ class OrderService:
             else:
                 next_cursor = None
 
-            items = [
-                {
-                    "id": str(order.id),
-                    "tenantId": order.tenant_id,
-                    "status": order.status.value,
-                    "version": order.version,
-                    "totalCents": order.total_cents,
-                    "createdAt": order.created_at.isoformat(),
-                    "updatedAt": order.updated_at.isoformat(),
-                }
-                for order in orders
-            ]
+            items = [order_item(order) for order in orders]
             
+            # A lagging replica can return a page from before a write whose
+            # invalidation already arrived; serve it but do not cache it
+            if cacheable and not may_lag_primary(self.db):
+                self.list_cache.set(tenant_id, generation, page_key, (items, next_cursor))
             return items, next_cursor
         except (ConflictError, NotFoundError, PreconditionFailedError, ValidationError):
             raise
         except Exception as e:
             raise InternalServerError(f"Failed to list orders: {str(e)}")
+    
+    async def get_stats(self, tenant_id: str, estimate: bool = False) -> dict:
+        """Return order counts and total_cents sums per status from the tenant's counters.
+        
+        With estimate, counts are derived from planner statistics instead,
+        without reading counters or orders, and totals are omitted. Falls back
+        to the counters when orders has never been analyzed.
+        """
+        logger.info("Reading order statistics")
+        try:
+            if estimate:
+                counts = await self.stats_repo.estimate(tenant_id)
+                if counts is not None:
+                    by_status = {
+                        status.value: {"orderCount": counts[status], "totalCents": None}
+                        for status in OrderStatus
+                    }
+                    return {
+                        "tenantId": tenant_id,
+                        "estimated": True,
+                        "orderCount": sum(counts.values()),
+                        "totalCents": None,
+                        "byStatus": by_status,
+                    }
+            
+            counters = await self.stats_repo.get(tenant_id)
+            by_status = {}
+            for status in OrderStatus:
+                count, total_cents = counters.get(status, (0, 0))
+                by_status[status.value] = {"orderCount": count, "totalCents": total_cents}
+            return {
+                "tenantId": tenant_id,
+                "estimated": False,
+                "orderCount": sum(item["orderCount"] for item in by_status.values()),
+                "totalCents": sum(item["totalCents"] for item in by_status.values()),
+                "byStatus": by_status,
+            }
+        except (ConflictError, NotFoundError, PreconditionFailedError, ValidationError):
+            raise
+        except Exception as e:
+            raise InternalServerError(f"Failed to read order statistics: {str(e)}")
+    
+    async def export_orders(
+        self,
+        tenant_id: str,
+        fmt: str,
+        after: Optional[str] = None,
+        status: Optional[OrderStatus] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None
+    ) -> AsyncIterator[str]:
+        """Validate export parameters and return an iterator of NDJSON or CSV chunks.
+        
+        Every record carries a `cursor` token; passing the last one received as
+        `after` resumes the export right after that record.
+        """
+        logger.info("Exporting orders")
+        if fmt not in ("ndjson", "csv"):
+            raise ValidationError(f"Unsupported export format: {fmt}")
+        
+        cursor_data = decode_cursor(after)
+        cursor_created_at = None
+        cursor_id = None
+        if cursor_data:
+            cursor_created_at, cursor_id_str = cursor_data
+            try:
+                cursor_id = uuid.UUID(cursor_id_str)
+            except ValueError as e:
+                raise ValidationError(f"Invalid cursor format: {str(e)}")
+        
+        rows = self.order_repo.stream_orders(
+            tenant_id,
+            status=status,
+            created_from=created_from,
+            created_to=created_to,
+            cursor_created_at=cursor_created_at,
+            cursor_id=cursor_id,
+            batch_size=settings.export_batch_size
+        )
+        return self._export_chunks(rows, fmt)
+    
+    async def _export_chunks(self, rows: AsyncIterator, fmt: str) -> AsyncIterator[str]:
+        """Serialize streamed rows, yielding one chunk per export batch."""
+        batch_size = settings.export_batch_size
+        buffer = io.StringIO()
+        writer = csv.writer(buffer) if fmt == "csv" else None
+        if writer:
+            writer.writerow(EXPORT_FIELDS)
+        pending = 0
+        
+        try:
+            async for row in rows:
+                record = {
+                    "id": str(row.id),
+                    "tenantId": row.tenant_id,
+                    "status": row.status.value,
+                    "version": row.version,
+                    "totalCents": row.total_cents,
+                    "createdAt": row.created_at.isoformat(),
+                    "updatedAt": row.updated_at.isoformat(),
+                    "cursor": encode_cursor(row.created_at, str(row.id)),
+                }
+                if writer:
+                    writer.writerow(record.values())
+                else:
+                    buffer.write(json.dumps(record, separators=(",", ":")))
+                    buffer.write("\n")
+                pending += 1
+                
+                if pending >= batch_size:
+                    yield buffer.getvalue()
+                    buffer.seek(0)
+                    buffer.truncate()
+                    pending = 0
+        except Exception as e:
+            # Headers are already sent; the client resumes from the last cursor it received
+            logger.error(f"Order export aborted: {str(e)}")
+            raise
+        
+        if buffer.tell():
+            yield buffer.getvalue()
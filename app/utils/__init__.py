@@ -2,5 +2,7 @@
 
 from app.utils.pagination import encode_cursor, decode_cursor
 from app.utils.idempotency import hash_body, bodies_match
+from app.utils.cache import LRUTTLCache, SingleFlight, TenantPageCache
+from app.utils.etag import make_etag, if_none_match_matches
 
-__all__ = ["encode_cursor", "decode_cursor", "hash_body", "bodies_match"]
+__all__ = ["encode_cursor", "decode_cursor", "hash_body", "bodies_match", "LRUTTLCache", "SingleFlight", "TenantPageCache", "make_etag", "if_none_match_matches"]
@@ -0,0 +1,153 @@
+"""
+In-process caching utilities
+cache.py
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+
+class LRUTTLCache:
+    """Bounded LRU cache whose entries also expire after a TTL.
+
+    Not thread-safe; intended for use from a single event loop.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        """Initialize with max entry count and default TTL in seconds."""
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return cached value or default if missing or expired."""
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value, evicting the least recently used entry when full."""
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0 or self.maxsize <= 0:
+            return
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        """Remove a key if present."""
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SingleFlight:
+    """Coalesce concurrent calls for the same key into one execution.
+
+    The first caller (leader) runs the function; callers arriving while it is
+    in flight await the leader's result instead of running it again. If the
+    leader is cancelled (e.g. its client disconnected), one follower becomes
+    the new leader and runs its own function.
+    """
+
+    def __init__(self):
+        """Initialize empty in-flight registry."""
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """Run fn once per key; return (result, shared) where shared is True for followers."""
+        future = self._calls.get(key)
+        while future is not None:
+            try:
+                return await asyncio.shield(future), True
+            except asyncio.CancelledError:
+                # Only the leader's cancellation is retried, never this caller's own
+                if not future.cancelled() or asyncio.current_task().cancelling():
+                    raise
+            future = self._calls.get(key)
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so a leader without followers does not log a warning
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            self._calls.pop(key, None)
+
+
+class TenantPageCache:
+    """Bounded cache of per-tenant pages with O(1) whole-tenant invalidation.
+
+    Keys carry the tenant's generation; invalidating a tenant bumps it, so old
+    pages become unreachable and age out through LRU/TTL. Callers read the
+    generation before querying and store under it, so a page computed while
+    an invalidation happened is never served.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        """Initialize with max page count and TTL in seconds."""
+        self._pages = LRUTTLCache(maxsize, ttl)
+        self._generations: Dict[Hashable, int] = {}
+        self._subscribers: List[Callable[[Hashable], None]] = []
+
+    def generation(self, tenant: Hashable) -> int:
+        """Return the tenant's current generation."""
+        return self._generations.get(tenant, 0)
+
+    def get(self, tenant: Hashable, key: Hashable) -> Any:
+        """Return a cached page for the tenant's current generation, or None."""
+        return self._pages.get((tenant, self.generation(tenant), key))
+
+    def set(self, tenant: Hashable, generation: int, key: Hashable, value: Any) -> None:
+        """Store a page computed under the given generation."""
+        if generation == self.generation(tenant):
+            self._pages.set((tenant, generation, key), value)
+
+    def invalidate(self, tenant: Hashable, broadcast: bool = True) -> None:
+        """Drop all pages of a tenant; notify subscribers unless the change came from them."""
+        self._generations[tenant] = self.generation(tenant) + 1
+        if broadcast:
+            for subscriber in self._subscribers:
+                subscriber(tenant)
+
+    def subscribe(self, callback: Callable[[Hashable], None]) -> None:
+        """Call callback(tenant) on every local invalidation."""
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[Hashable], None]) -> None:
+        """Stop calling callback."""
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def clear(self) -> None:
+        """Drop every page (e.g. after missing notifications)."""
+        self._pages.clear()
+        for tenant in list(self._generations):
+            self._generations[tenant] += 1
+
+    def __len__(self) -> int:
+        return len(self._pages)
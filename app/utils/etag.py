@@ -0,0 +1,27 @@
+"""
+ETag utilities
+etag.py
+"""
+
+from typing import Optional
+
+
+def make_etag(version: int) -> str:
+    """Build a strong ETag from an order version."""
+    return f'"{version}"'
+
+
+def if_none_match_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header (list, weak tags or *) against an ETag."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        # If-None-Match uses weak comparison
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
@@ -5,14 +5,35 @@ idempotency.py
 
 import hashlib
 import json
+from typing import Optional
 
+import orjson
 
-def hash_body(body: dict) -> str:
-    """Create SHA-256 hash of request body."""
-    body_json = json.dumps(body, sort_keys=True)
-    return hashlib.sha256(body_json.encode()).hexdigest()
 
+def hash_body(body: dict) -> bytes:
+    """Create the 32-byte SHA-256 digest of a request body's sorted-key JSON."""
+    try:
+        canonical = orjson.dumps(body, option=orjson.OPT_SORT_KEYS)
+    except orjson.JSONEncodeError:
+        # orjson rejects integers beyond 64 bits
+        canonical = json.dumps(body, sort_keys=True).encode()
+    return hashlib.sha256(canonical).digest()
 
-def bodies_match(body1_hash: str, body2: dict) -> bool:
-    """Check if body hash matches the given body."""
-    return body1_hash == hash_body(body2)
+
+def legacy_hash_body(body: dict) -> bytes:
+    """SHA-256 digest of json.dumps(body, sort_keys=True), as stored before the binary body_hash column."""
+    return hashlib.sha256(json.dumps(body, sort_keys=True).encode()).digest()
+
+
+def bodies_match(stored_hash: Optional[bytes], body: dict, body_hash: Optional[bytes] = None) -> bool:
+    """Check if stored_hash is the digest of body.
+
+    body_hash is the precomputed hash_body(body), if any. Records converted
+    from response_json hold the legacy digest, which is only computed when
+    the current one does not match.
+    """
+    if not stored_hash:
+        return False
+    if stored_hash == (body_hash if body_hash is not None else hash_body(body)):
+        return True
+    return stored_hash == legacy_hash_body(body)
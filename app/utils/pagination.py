@@ -1,24 +1,66 @@
 """
 Pagination utilities
 pagination.py
+
+Cursors are URL-safe base64 (no padding) of:
+
+    version (1 byte) | created_at µs since epoch (int64) | id (16 bytes) | HMAC-SHA256[:12]
+
+Legacy cursors (base64 JSON with an ISO timestamp) are still accepted when
+settings.accept_legacy_cursors is set.
 """
 
 import base64
+import binascii
+import hashlib
+import hmac
 import json
-from datetime import datetime
+import struct
+import uuid
+from datetime import datetime, timedelta, timezone
 from typing import Optional, Tuple
+from app.core.config import DEFAULT_CURSOR_SECRET, settings
 from app.core.exceptions import ValidationError
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+CURSOR_VERSION = 1
+_PAYLOAD = struct.Struct(">Bq16s")
+_MAC_SIZE = 12
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def warn_if_default_cursor_secret() -> None:
+    """Log a warning while cursors are signed with the built-in CURSOR_SECRET."""
+    if settings.cursor_secret == DEFAULT_CURSOR_SECRET:
+        logger.warning(
+            "CURSOR_SECRET is the built-in default, so clients can forge pagination cursors; "
+            "set it to a private value shared by every worker"
+        )
+
+
+def _mac(payload: bytes) -> bytes:
+    return hmac.new(settings.cursor_secret.encode(), payload, hashlib.sha256).digest()[:_MAC_SIZE]
 
 
 def encode_cursor(created_at: datetime, order_id: str) -> str:
     """Encode pagination cursor from timestamp and ID."""
-    cursor_data = {
-        "ts": created_at.isoformat(),
-        "id": order_id
-    }
-    cursor_json = json.dumps(cursor_data)
-    cursor_bytes = cursor_json.encode('utf-8')
-    return base64.b64encode(cursor_bytes).decode('utf-8')
+    delta = created_at - _EPOCH
+    micros = (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+    payload = _PAYLOAD.pack(CURSOR_VERSION, micros, uuid.UUID(order_id).bytes)
+    return base64.urlsafe_b64encode(payload + _mac(payload)).rstrip(b"=").decode("ascii")
+
+
+def _decode_legacy_cursor(cursor: str) -> Tuple[datetime, str]:
+    """Decode a base64 JSON cursor issued before the binary format."""
+    try:
+        cursor_data = json.loads(base64.b64decode(cursor.encode('utf-8')).decode('utf-8'))
+        created_at = datetime.fromisoformat(cursor_data['ts'])
+        order_id = str(uuid.UUID(cursor_data['id']))
+        return (created_at, order_id)
+    except (KeyError, TypeError, ValueError, binascii.Error) as e:
+        raise ValidationError(f"Invalid cursor format: {str(e)}")
 
 
 def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, str]]:
@@ -27,13 +69,17 @@ def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, str]]:
         return None
     
     try:
-        cursor_bytes = base64.b64decode(cursor.encode('utf-8'))
-        cursor_json = cursor_bytes.decode('utf-8')
-        cursor_data = json.loads(cursor_json)
-        
-        created_at = datetime.fromisoformat(cursor_data['ts'])
-        order_id = cursor_data['id']
-        
-        return (created_at, order_id)
-    except (KeyError, ValueError, json.JSONDecodeError) as e:
-        raise ValidationError(f"Invalid cursor format: {str(e)}")
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+    except (binascii.Error, ValueError):
+        raw = b""
+    
+    if len(raw) == _PAYLOAD.size + _MAC_SIZE and raw[0] == CURSOR_VERSION:
+        payload, mac = raw[:_PAYLOAD.size], raw[_PAYLOAD.size:]
+        if not hmac.compare_digest(mac, _mac(payload)):
+            raise ValidationError("Invalid cursor signature")
+        _, micros, id_bytes = _PAYLOAD.unpack(payload)
+        return (_EPOCH + timedelta(microseconds=micros), str(uuid.UUID(bytes=id_bytes)))
+    
+    if settings.accept_legacy_cursors:
+        return _decode_legacy_cursor(cursor)
+    raise ValidationError("Invalid cursor format")
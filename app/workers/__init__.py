@@ -0,0 +1 @@
+"""Background workers and maintenance commands, each runnable with python -m."""
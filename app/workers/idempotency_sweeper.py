@@ -0,0 +1,87 @@
+"""
+Idempotency key sweeper
+idempotency_sweeper.py
+
+Deletes expired idempotency keys in small batches, each in its own short
+transaction, so the sweep never holds long locks.
+
+Usage:
+    python -m app.workers.idempotency_sweeper --batch-size 5000 --pause 0.05
+"""
+
+import argparse
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.core.config import settings
+from app.core.logging import get_logger, setup_logging
+from app.db.session import async_session_maker, engine
+from app.repositories.idempotency_repository import IdempotencyRepository
+
+logger = get_logger(__name__)
+
+
+async def sweep_expired(
+    session_maker: async_sessionmaker = async_session_maker,
+    batch_size: int = settings.idempotency_sweep_batch_size,
+    pause: float = settings.idempotency_sweep_pause_seconds,
+    max_batches: Optional[int] = None,
+) -> int:
+    """Delete keys older than the idempotency TTL; return the number of rows purged."""
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=settings.idempotency_ttl_hours)
+    purged = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        async with session_maker() as session:
+            deleted = await IdempotencyRepository(session).delete_expired(cutoff, batch_size)
+            await session.commit()
+        purged += deleted
+        batches += 1
+        if deleted < batch_size:
+            break
+        await asyncio.sleep(pause)
+
+    logger.info(f"Idempotency sweep purged {purged} expired keys in {batches} batch(es)")
+    return purged
+
+
+async def run_sweeper(
+    stop_event: asyncio.Event,
+    interval: float = settings.idempotency_sweep_interval_seconds,
+) -> None:
+    """Sweep periodically until stop_event is set (used by the app lifespan)."""
+    while not stop_event.is_set():
+        try:
+            await sweep_expired()
+        except Exception as e:
+            logger.error(f"Idempotency sweep failed: {str(e)}")
+        try:
+            await asyncio.wait_for(stop_event.wait(), timeout=interval)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def _run_once(batch_size: int, pause: float, max_batches: Optional[int]) -> int:
+    try:
+        return await sweep_expired(async_session_maker, batch_size, pause, max_batches)
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Delete expired idempotency keys")
+    parser.add_argument("--batch-size", type=int, default=settings.idempotency_sweep_batch_size)
+    parser.add_argument("--pause", type=float, default=settings.idempotency_sweep_pause_seconds)
+    parser.add_argument("--max-batches", type=int, default=None)
+    args = parser.parse_args()
+
+    setup_logging()
+    asyncio.run(_run_once(args.batch_size, args.pause, args.max_batches))
+
+
+if __name__ == "__main__":
+    main()
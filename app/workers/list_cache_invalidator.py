@@ -0,0 +1,106 @@
+"""
+List cache invalidation broadcaster
+list_cache_invalidator.py
+
+Keeps the per-worker first-page cache of GET /orders coherent across
+workers and nodes: local invalidations are published with pg_notify and
+notifications from other workers invalidate the local cache. Runs inside the
+API process (started by the app lifespan) on one dedicated asyncpg
+connection, off the request path; bursts of invalidations for the same
+tenant are coalesced.
+"""
+
+import asyncio
+import uuid
+from typing import Optional, Set
+
+import asyncpg
+from sqlalchemy.engine import make_url
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.metrics import list_cache_invalidations
+from app.utils.cache import TenantPageCache
+
+logger = get_logger(__name__)
+
+RECONNECT_DELAY_SECONDS = 1.0
+
+
+def asyncpg_dsn(database_url: str) -> str:
+    """Turn a SQLAlchemy asyncpg URL into a plain asyncpg DSN."""
+    return make_url(database_url).set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+class ListCacheInvalidator:
+    """Publish local tenant invalidations and apply remote ones via LISTEN/NOTIFY."""
+
+    def __init__(
+        self,
+        cache: TenantPageCache,
+        database_url: str = settings.database_url,
+        channel: str = settings.list_cache_channel,
+    ):
+        """Initialize for a cache, the primary database and a channel name."""
+        self.cache = cache
+        self.dsn = asyncpg_dsn(database_url)
+        self.channel = channel
+        # Lets a worker ignore its own notifications
+        self.worker_id = uuid.uuid4().hex
+        self._pending: Set[str] = set()
+        self._wakeup = asyncio.Event()
+        self._connection: Optional[asyncpg.Connection] = None
+
+    def publish(self, tenant_id: str) -> None:
+        """Queue a tenant invalidation for broadcast (cache subscriber; never blocks)."""
+        self._pending.add(tenant_id)
+        self._wakeup.set()
+
+    def _on_notification(self, connection, pid, channel, payload: str) -> None:
+        worker_id, _, tenant_id = payload.partition(":")
+        if worker_id != self.worker_id:
+            self.cache.invalidate(tenant_id, broadcast=False)
+            list_cache_invalidations.inc(("remote",))
+
+    async def _connect(self) -> asyncpg.Connection:
+        connection = await asyncpg.connect(self.dsn)
+        await connection.add_listener(self.channel, self._on_notification)
+        # Notifications may have been missed while disconnected
+        self.cache.clear()
+        return connection
+
+    async def _flush(self, connection: asyncpg.Connection) -> None:
+        while self._pending:
+            tenants, self._pending = self._pending, set()
+            for tenant_id in tenants:
+                await connection.execute("SELECT pg_notify($1, $2)", self.channel, f"{self.worker_id}:{tenant_id}")
+
+    async def run(self, stop_event: asyncio.Event) -> None:
+        """Listen and publish until stop_event is set, reconnecting on failure."""
+        self.cache.subscribe(self.publish)
+        try:
+            while not stop_event.is_set():
+                try:
+                    self._connection = await self._connect()
+                    while not stop_event.is_set():
+                        await self._flush(self._connection)
+                        self._wakeup.clear()
+                        if self._pending:
+                            continue
+                        stop_wait = asyncio.ensure_future(stop_event.wait())
+                        wakeup_wait = asyncio.ensure_future(self._wakeup.wait())
+                        await asyncio.wait({stop_wait, wakeup_wait}, return_when=asyncio.FIRST_COMPLETED)
+                        stop_wait.cancel()
+                        wakeup_wait.cancel()
+                except Exception as e:
+                    logger.error(f"List cache invalidator failed: {str(e)}")
+                    try:
+                        await asyncio.wait_for(stop_event.wait(), timeout=RECONNECT_DELAY_SECONDS)
+                    except asyncio.TimeoutError:
+                        pass
+                finally:
+                    if self._connection is not None:
+                        await self._connection.close()
+                        self._connection = None
+        finally:
+            self.cache.unsubscribe(self.publish)
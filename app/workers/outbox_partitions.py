@@ -0,0 +1,205 @@
+"""
+Outbox partition maintenance
+outbox_partitions.py
+
+Creates daily outbox partitions ahead of time and detaches/archives fully
+published partitions older than the retention window.
+
+Usage:
+    python -m app.workers.outbox_partitions --premake-days 7 --retention-days 7 --archive-dir /var/archive
+"""
+
+import argparse
+import asyncio
+import re
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.core.config import settings
+from app.core.logging import get_logger, setup_logging
+from app.db.session import engine
+
+logger = get_logger(__name__)
+
+PARENT_TABLE = "outbox"
+DEFAULT_PARTITION = "outbox_default"
+_PARTITION_RE = re.compile(r"^outbox_p(\d{8})$")
+
+
+def partition_name(day: date) -> str:
+    """Return the partition table name for a day."""
+    return f"{PARENT_TABLE}_p{day:%Y%m%d}"
+
+
+def partition_day(name: str) -> Optional[date]:
+    """Return the day covered by a partition name, or None for non-daily partitions."""
+    match = _PARTITION_RE.match(name)
+    if not match:
+        return None
+    return datetime.strptime(match.group(1), "%Y%m%d").date()
+
+
+async def list_partitions(conn: AsyncConnection) -> List[str]:
+    """List partitions currently attached to the outbox table."""
+    result = await conn.execute(text(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = CAST(:parent AS regclass) "
+        "ORDER BY c.relname"
+    ), {"parent": PARENT_TABLE})
+    return [row[0] for row in result]
+
+
+async def _move_from_default(conn: AsyncConnection, name: str, lower: str, upper: str) -> int:
+    """Create partition name from the default partition's rows in [lower, upper) and attach it.
+
+    CREATE TABLE ... PARTITION OF fails while the default partition holds
+    rows of the new range, so the table is built outside the partition
+    tree, the rows are moved into it, and it is attached. The default
+    partition is locked first so no row for the range lands there meanwhile.
+    """
+    await conn.execute(text(f"LOCK TABLE {DEFAULT_PARTITION} IN ACCESS EXCLUSIVE MODE"))
+    await conn.execute(text(f"CREATE TABLE {name} (LIKE {PARENT_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+    columns = ", ".join(
+        row[0] for row in await conn.execute(text(
+            "SELECT attname FROM pg_attribute "
+            "WHERE attrelid = CAST(:parent AS regclass) AND attnum > 0 AND NOT attisdropped "
+            "ORDER BY attnum"
+        ), {"parent": PARENT_TABLE})
+    )
+    result = await conn.execute(text(
+        f"WITH moved AS ("
+        f"DELETE FROM {DEFAULT_PARTITION} WHERE created_at >= :lower AND created_at < :upper "
+        f"RETURNING {columns}) "
+        f"INSERT INTO {name} ({columns}) SELECT {columns} FROM moved"
+    ), {"lower": datetime.fromisoformat(lower), "upper": datetime.fromisoformat(upper)})
+    await conn.execute(text(
+        f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {name} "
+        f"FOR VALUES FROM ('{lower}') TO ('{upper}')"
+    ))
+    return result.rowcount
+
+
+async def ensure_partitions(conn: AsyncConnection, start: date, days: int) -> List[str]:
+    """Create daily partitions for [start, start + days) that do not exist yet.
+    
+    Rows that reached the default partition for one of those days (e.g.
+    after maintenance missed its run) are moved into the new partition.
+    """
+    existing = set(await list_partitions(conn))
+    created = []
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        name = partition_name(day)
+        if name in existing:
+            continue
+        lower = f"{day.isoformat()} 00:00:00+00:00"
+        upper = f"{(day + timedelta(days=1)).isoformat()} 00:00:00+00:00"
+        stranded = await conn.execute(text(
+            f"SELECT 1 FROM {DEFAULT_PARTITION} WHERE created_at >= :lower AND created_at < :upper LIMIT 1"
+        ), {"lower": datetime.fromisoformat(lower), "upper": datetime.fromisoformat(upper)})
+        if stranded.first():
+            moved = await _move_from_default(conn, name, lower, upper)
+            logger.warning(f"Moved {moved} outbox row(s) from {DEFAULT_PARTITION} into new partition {name}")
+        else:
+            await conn.execute(text(
+                f"CREATE TABLE {name} PARTITION OF {PARENT_TABLE} "
+                f"FOR VALUES FROM ('{lower}') TO ('{upper}')"
+            ))
+        created.append(name)
+    return created
+
+
+async def _archive_to_file(conn: AsyncConnection, name: str, archive_dir: str) -> Path:
+    """COPY a detached partition to a CSV file."""
+    path = Path(archive_dir) / f"{name}.csv"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    raw = await conn.get_raw_connection()
+    await raw.driver_connection.copy_from_table(name, output=str(path), format="csv", header=True)
+    return path
+
+
+async def archive_expired(
+    conn: AsyncConnection,
+    before: date,
+    archive_dir: Optional[str] = None,
+) -> List[str]:
+    """Detach and drop daily partitions ending on or before `before`.
+
+    Partitions that still hold unpublished events are skipped so the relay
+    never loses work. When archive_dir is set the rows are copied out first.
+    """
+    archived = []
+    for name in await list_partitions(conn):
+        day = partition_day(name)
+        if day is None or day + timedelta(days=1) > before:
+            continue
+
+        pending = await conn.execute(text(
+            f"SELECT 1 FROM {name} WHERE published_at IS NULL LIMIT 1"
+        ))
+        if pending.first():
+            logger.warning(f"Skipping outbox partition {name}: unpublished events remain")
+            continue
+
+        await conn.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}"))
+        if archive_dir:
+            path = await _archive_to_file(conn, name, archive_dir)
+            logger.info(f"Archived outbox partition {name} to {path}")
+        await conn.execute(text(f"DROP TABLE {name}"))
+        archived.append(name)
+    return archived
+
+
+async def purge_default(conn: AsyncConnection, before: datetime) -> int:
+    """Delete published rows that landed in the default partition before the cutoff."""
+    result = await conn.execute(text(
+        f"DELETE FROM {DEFAULT_PARTITION} "
+        "WHERE published_at IS NOT NULL AND created_at < :cutoff"
+    ), {"cutoff": before})
+    return result.rowcount
+
+
+async def run_maintenance(
+    premake_days: int = settings.outbox_partition_premake_days,
+    retention_days: int = settings.outbox_retention_days,
+    archive_dir: Optional[str] = settings.outbox_archive_dir,
+) -> dict:
+    """Run one maintenance pass, each step in its own short transaction."""
+    today = datetime.now(timezone.utc).date()
+    cutoff = today - timedelta(days=retention_days)
+    try:
+        async with engine.begin() as conn:
+            created = await ensure_partitions(conn, today, premake_days)
+        async with engine.begin() as conn:
+            archived = await archive_expired(conn, cutoff, archive_dir)
+        async with engine.begin() as conn:
+            purged = await purge_default(
+                conn, datetime.combine(cutoff, datetime.min.time(), tzinfo=timezone.utc)
+            )
+    finally:
+        await engine.dispose()
+
+    summary = {"created": created, "archived": archived, "purgedFromDefault": purged}
+    logger.info(f"Outbox partition maintenance: {summary}")
+    return summary
+
+
+def main() -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Maintain outbox partitions")
+    parser.add_argument("--premake-days", type=int, default=settings.outbox_partition_premake_days)
+    parser.add_argument("--retention-days", type=int, default=settings.outbox_retention_days)
+    parser.add_argument("--archive-dir", default=settings.outbox_archive_dir)
+    args = parser.parse_args()
+
+    setup_logging()
+    asyncio.run(run_maintenance(args.premake_days, args.retention_days, args.archive_dir))
+
+
+if __name__ == "__main__":
+    main()
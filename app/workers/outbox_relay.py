@@ -0,0 +1,193 @@
+"""
+Outbox relay worker
+outbox_relay.py
+
+Usage:
+    python -m app.workers.outbox_relay --workers 4 --sink file --path events.ndjson
+"""
+
+import argparse
+import asyncio
+import signal
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.logging import get_logger, setup_logging
+from app.db.session import async_session_maker, engine
+from app.repositories.outbox_repository import OutboxRepository
+from app.workers.sinks import OutboxSink, build_sink
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class RelayMetrics:
+    """Throughput and lag counters shared by relay workers."""
+
+    batches: int = 0
+    events: int = 0
+    failures: int = 0
+    last_lag_seconds: float = 0.0
+    max_lag_seconds: float = 0.0
+    started_at: float = field(default_factory=time.monotonic)
+
+    def record_batch(self, count: int, lag_seconds: float) -> None:
+        """Record a successfully published batch."""
+        self.batches += 1
+        self.events += count
+        self.last_lag_seconds = lag_seconds
+        self.max_lag_seconds = max(self.max_lag_seconds, lag_seconds)
+
+    def record_failure(self) -> None:
+        """Record a failed batch."""
+        self.failures += 1
+
+    def snapshot(self) -> dict:
+        """Return current metrics as a dict."""
+        elapsed = max(time.monotonic() - self.started_at, 1e-9)
+        return {
+            "batches": self.batches,
+            "events": self.events,
+            "failures": self.failures,
+            "eventsPerSecond": round(self.events / elapsed, 2),
+            "lastLagSeconds": round(self.last_lag_seconds, 3),
+            "maxLagSeconds": round(self.max_lag_seconds, 3),
+        }
+
+
+class OutboxRelay:
+    """Claims unpublished outbox rows and hands them to a sink."""
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker,
+        sink: OutboxSink,
+        batch_size: int = settings.outbox_relay_batch_size,
+        poll_interval: float = settings.outbox_relay_poll_interval_seconds,
+        metrics: Optional[RelayMetrics] = None,
+    ):
+        """Initialize with session factory and sink."""
+        self.session_maker = session_maker
+        self.sink = sink
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.metrics = metrics or RelayMetrics()
+
+    async def relay_batch(self, session: AsyncSession) -> int:
+        """Claim, publish and stamp one batch within a single transaction."""
+        outbox_repo = OutboxRepository(session)
+        try:
+            events = await outbox_repo.claim_unpublished(self.batch_size)
+            if not events:
+                await session.commit()
+                return 0
+
+            await self.sink.publish([
+                {
+                    "id": str(event.id),
+                    "eventType": event.event_type,
+                    "orderId": str(event.order_id),
+                    "tenantId": event.tenant_id,
+                    "payload": event.payload,
+                    "createdAt": event.created_at.isoformat(),
+                }
+                for event in events
+            ])
+
+            now = datetime.now(timezone.utc)
+            await outbox_repo.mark_published([event.id for event in events], now)
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            self.metrics.record_failure()
+            raise
+
+        oldest = events[0].created_at
+        if oldest.tzinfo is None:
+            oldest = oldest.replace(tzinfo=timezone.utc)
+        self.metrics.record_batch(len(events), (now - oldest).total_seconds())
+        return len(events)
+
+    async def run(self, stop_event: asyncio.Event) -> None:
+        """Relay batches until stop_event is set, sleeping when the outbox is drained."""
+        while not stop_event.is_set():
+            try:
+                async with self.session_maker() as session:
+                    count = await self.relay_batch(session)
+            except Exception as e:
+                logger.error(f"Outbox relay batch failed: {str(e)}")
+                count = 0
+
+            if count < self.batch_size:
+                try:
+                    await asyncio.wait_for(stop_event.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+
+async def _report_metrics(metrics: RelayMetrics, stop_event: asyncio.Event, interval: float) -> None:
+    """Periodically log relay metrics."""
+    while not stop_event.is_set():
+        try:
+            await asyncio.wait_for(stop_event.wait(), timeout=interval)
+        except asyncio.TimeoutError:
+            pass
+        logger.info(f"Outbox relay metrics: {metrics.snapshot()}")
+
+
+async def run_relay(
+    sink: OutboxSink,
+    workers: int = settings.outbox_relay_workers,
+    batch_size: int = settings.outbox_relay_batch_size,
+    poll_interval: float = settings.outbox_relay_poll_interval_seconds,
+    stop_event: Optional[asyncio.Event] = None,
+) -> RelayMetrics:
+    """Run N concurrent relay workers sharing one sink and metrics."""
+    stop_event = stop_event or asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop_event.set)
+        except RuntimeError:
+            # Not the main thread's loop
+            pass
+
+    metrics = RelayMetrics()
+    relays = [
+        OutboxRelay(async_session_maker, sink, batch_size, poll_interval, metrics)
+        for _ in range(workers)
+    ]
+    logger.info(f"Starting {workers} outbox relay worker(s), batch size {batch_size}")
+    try:
+        await asyncio.gather(
+            _report_metrics(metrics, stop_event, settings.outbox_relay_metrics_interval_seconds),
+            *(relay.run(stop_event) for relay in relays),
+        )
+    finally:
+        await sink.close()
+        await engine.dispose()
+    return metrics
+
+
+def main() -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Relay outbox events to a sink")
+    parser.add_argument("--workers", type=int, default=settings.outbox_relay_workers)
+    parser.add_argument("--batch-size", type=int, default=settings.outbox_relay_batch_size)
+    parser.add_argument("--poll-interval", type=float, default=settings.outbox_relay_poll_interval_seconds)
+    parser.add_argument("--sink", choices=["file", "queue"], default="file")
+    parser.add_argument("--path", default=settings.outbox_relay_sink_path)
+    args = parser.parse_args()
+
+    setup_logging()
+    sink = build_sink(args.sink, args.path)
+    asyncio.run(run_relay(sink, args.workers, args.batch_size, args.poll_interval))
+
+
+if __name__ == "__main__":
+    main()
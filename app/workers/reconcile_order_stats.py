@@ -0,0 +1,71 @@
+"""
+Tenant order statistics reconciler
+reconcile_order_stats.py
+
+Rebuilds tenant_order_stats from orders, one tenant per short transaction,
+and reports counters that had drifted (e.g. after manual data fixes or a
+backfill that raced with live writes).
+
+Usage:
+    python -m app.workers.reconcile_order_stats [--tenant tenant-1]
+"""
+
+import argparse
+import asyncio
+from typing import Dict, Optional
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.core.logging import get_logger, setup_logging
+from app.db.session import async_session_maker, engine
+from app.repositories.order_stats_repository import OrderStatsRepository
+
+logger = get_logger(__name__)
+
+
+async def reconcile(
+    session_maker: async_sessionmaker = async_session_maker,
+    tenant_id: Optional[str] = None,
+) -> Dict[str, dict]:
+    """Rebuild counters for one tenant or all; return {tenant: {status: (count_drift, total_drift)}} for drifted tenants."""
+    if tenant_id is None:
+        async with session_maker() as session:
+            tenant_ids = await OrderStatsRepository(session).tenant_ids()
+    else:
+        tenant_ids = [tenant_id]
+
+    drifted = {}
+    for tenant in tenant_ids:
+        async with session_maker() as session:
+            drift = await OrderStatsRepository(session).rebuild(tenant)
+            await session.commit()
+        if drift:
+            drifted[tenant] = drift
+            logger.warning(
+                f"Order stats for tenant {tenant} had drifted: "
+                + ", ".join(f"{status.value} count {count:+d} total {total:+d}" for status, (count, total) in drift.items())
+            )
+
+    logger.info(f"Reconciled order stats for {len(tenant_ids)} tenant(s), {len(drifted)} drifted")
+    return drifted
+
+
+async def _run_once(tenant_id: Optional[str]) -> Dict[str, dict]:
+    try:
+        return await reconcile(async_session_maker, tenant_id)
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Rebuild per-tenant order statistics from orders")
+    parser.add_argument("--tenant", default=None, help="Only reconcile this tenant")
+    args = parser.parse_args()
+
+    setup_logging()
+    asyncio.run(_run_once(args.tenant))
+
+
+if __name__ == "__main__":
+    main()
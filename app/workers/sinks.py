@@ -0,0 +1,64 @@
+"""
+Outbox sinks
+sinks.py
+"""
+
+import asyncio
+import json
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import List, Optional
+
+
+class OutboxSink(ABC):
+    """Destination for relayed outbox events."""
+
+    @abstractmethod
+    async def publish(self, events: List[dict]) -> None:
+        """Publish a batch of events. Raising aborts the batch so it is retried."""
+
+    async def close(self) -> None:
+        """Release sink resources."""
+
+
+class FileSink(OutboxSink):
+    """Append events as NDJSON lines to a local file."""
+
+    def __init__(self, path: str):
+        """Initialize with target file path."""
+        self.path = Path(path)
+        self._lock = asyncio.Lock()
+
+    def _write(self, data: str) -> None:
+        with self.path.open("a", encoding="utf-8") as fh:
+            fh.write(data)
+
+    async def publish(self, events: List[dict]) -> None:
+        """Append a batch in a single write."""
+        data = "".join(json.dumps(event, separators=(",", ":")) + "\n" for event in events)
+        async with self._lock:
+            await asyncio.to_thread(self._write, data)
+
+
+class QueueSink(OutboxSink):
+    """Put events on an in-process asyncio queue (broker stand-in)."""
+
+    def __init__(self, queue: Optional[asyncio.Queue] = None):
+        """Initialize with an optional existing queue."""
+        self.queue = queue if queue is not None else asyncio.Queue()
+
+    async def publish(self, events: List[dict]) -> None:
+        """Enqueue every event of the batch."""
+        for event in events:
+            await self.queue.put(event)
+
+
+def build_sink(kind: str, path: Optional[str] = None) -> OutboxSink:
+    """Create a sink by name."""
+    if kind == "file":
+        if not path:
+            raise ValueError("File sink requires a path")
+        return FileSink(path)
+    if kind == "queue":
+        return QueueSink()
+    raise ValueError(f"Unknown outbox sink: {kind}")
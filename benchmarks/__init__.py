@@ -0,0 +1 @@
+"""Performance benchmarks, each runnable with python -m benchmarks.<name>."""
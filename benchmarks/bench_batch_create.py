@@ -0,0 +1,73 @@
+"""
+POST /orders:batch benchmark
+bench_batch_create.py
+
+Compares per-order cost of creating drafts one POST /orders at a time with
+POST /orders:batch, against the database in DATABASE_URL.
+
+Usage:
+    DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.bench_batch_create --orders 5000 --batch-size 500
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+
+from httpx import ASGITransport, AsyncClient
+
+from app.db.base import Base
+from app.db.session import engine
+from app.main import app
+
+
+async def _single(client: AsyncClient, tenant_id: str, orders: int) -> float:
+    started = time.perf_counter()
+    for _ in range(orders):
+        response = await client.post(
+            "/orders",
+            headers={"X-Tenant-Id": tenant_id, "Idempotency-Key": str(uuid.uuid4())},
+            json={}
+        )
+        assert response.status_code == 201, response.text
+    return time.perf_counter() - started
+
+
+async def _batched(client: AsyncClient, tenant_id: str, orders: int, batch_size: int) -> float:
+    started = time.perf_counter()
+    for offset in range(0, orders, batch_size):
+        count = min(batch_size, orders - offset)
+        response = await client.post(
+            "/orders:batch",
+            headers={"X-Tenant-Id": tenant_id},
+            json={"items": [{"idempotencyKey": str(uuid.uuid4()), "body": {}} for _ in range(count)]}
+        )
+        assert response.status_code == 200, response.text
+    return time.perf_counter() - started
+
+
+async def main(orders: int, batch_size: int) -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+        tenant_id = f"bench-{uuid.uuid4().hex[:8]}"
+        await _single(client, tenant_id, 50)
+        await _batched(client, tenant_id, batch_size, batch_size)
+
+        single = await _single(client, tenant_id, orders)
+        batched = await _batched(client, tenant_id, orders, batch_size)
+
+    await engine.dispose()
+    print(f"{'mode':<10}{'orders':>10}{'seconds':>10}{'orders/s':>12}{'us/order':>12}")
+    for name, elapsed in (("single", single), ("batch", batched)):
+        print(f"{name:<10}{orders:>10}{elapsed:>10.2f}{orders / elapsed:>12.0f}{elapsed / orders * 1e6:>12.0f}")
+    print(f"speedup: {single / batched:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark POST /orders:batch")
+    parser.add_argument("--orders", type=int, default=5000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(main(args.orders, args.batch_size))
@@ -0,0 +1,76 @@
+"""
+POST /orders benchmark
+bench_create_order.py
+
+Compares the advisory-lock create path (lock, find, insert order, insert key)
+with the single-statement path against the database in DATABASE_URL.
+
+Usage:
+    DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.bench_create_order --requests 2000 --concurrency 16
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+
+from httpx import ASGITransport, AsyncClient
+
+from app.core.config import settings
+from app.db.base import Base
+from app.db.session import engine
+from app.main import app
+from app.services.order_service import idempotency_cache
+from benchmarks.common import print_table, summarize
+
+
+async def _run_mode(fast_path: bool, requests: int, concurrency: int) -> dict:
+    settings.idempotency_fast_path = fast_path
+    idempotency_cache.clear()
+    tenant_id = f"bench-{uuid.uuid4().hex[:8]}"
+    latencies = []
+    queue: asyncio.Queue = asyncio.Queue()
+    for i in range(requests):
+        queue.put_nowait(i)
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+        async def worker() -> None:
+            while not queue.empty():
+                queue.get_nowait()
+                start = time.perf_counter()
+                response = await client.post(
+                    "/orders",
+                    headers={"X-Tenant-Id": tenant_id, "Idempotency-Key": str(uuid.uuid4())},
+                    json={}
+                )
+                latencies.append(time.perf_counter() - start)
+                if response.status_code != 201:
+                    raise RuntimeError(f"Unexpected status {response.status_code}: {response.text}")
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return summarize(latencies, elapsed)
+
+
+async def main(requests: int, concurrency: int, warmup: int) -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    results = {}
+    for name, fast_path in (("locked", False), ("single_statement", True)):
+        await _run_mode(fast_path, warmup, concurrency)
+        results[name] = await _run_mode(fast_path, requests, concurrency)
+
+    await engine.dispose()
+    print_table(results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark POST /orders")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--warmup", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency, args.warmup))
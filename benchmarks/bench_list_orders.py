@@ -0,0 +1,113 @@
+"""
+GET /orders serialization benchmark
+bench_list_orders.py
+
+Compares the response_model path (pydantic validation, jsonable_encoder,
+stdlib json) with the orjson fast path for GET /orders?limit=100, against the
+database in DATABASE_URL. Also times serialization alone, without the
+database round trip, on the same page of data.
+
+Usage:
+    DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.bench_list_orders --requests 2000 --limit 100
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+
+from fastapi.encoders import jsonable_encoder
+from httpx import ASGITransport, AsyncClient
+
+from app.core.config import settings
+from app.core.responses import FastJSONResponse, TimedJSONResponse
+from app.db.base import Base
+from app.db.session import engine
+from app.main import app
+from app.schemas.order import PaginatedOrdersResponse
+from app.schemas.serializers import serialize_paginated_orders
+from benchmarks.common import print_table, summarize
+
+
+async def _seed(client: AsyncClient, tenant_id: str, orders: int) -> None:
+    for start in range(0, orders, 500):
+        items = [
+            {"idempotencyKey": f"seed-{i}", "body": {}}
+            for i in range(start, min(start + 500, orders))
+        ]
+        response = await client.post("/orders:batch", headers={"X-Tenant-Id": tenant_id}, json={"items": items})
+        response.raise_for_status()
+
+
+async def _run_mode(client: AsyncClient, fast: bool, tenant_id: str, limit: int, requests: int, concurrency: int) -> dict:
+    settings.fast_json_responses = fast
+    latencies = []
+    remaining = [requests]
+
+    async def worker() -> None:
+        while remaining[0] > 0:
+            remaining[0] -= 1
+            start = time.perf_counter()
+            response = await client.get(f"/orders?limit={limit}", headers={"X-Tenant-Id": tenant_id})
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != 200 or len(response.json()["items"]) != limit:
+                raise RuntimeError(f"Unexpected response {response.status_code}: {response.text[:200]}")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, time.perf_counter() - started)
+
+
+def _serialize_only(items: list, iterations: int) -> dict:
+    """Time response body production alone for both paths."""
+    page = {"items": items, "nextCursor": "cursor"}
+    results = {}
+
+    def validated() -> bytes:
+        model = PaginatedOrdersResponse(items=page["items"], nextCursor=page["nextCursor"])
+        content = jsonable_encoder(PaginatedOrdersResponse.model_validate(model.model_dump()))
+        return TimedJSONResponse(content).body
+
+    def fast() -> bytes:
+        return FastJSONResponse(serialize_paginated_orders(page)).body
+
+    for name, fn in (("serialize_validated", validated), ("serialize_orjson", fast)):
+        latencies = []
+        started = time.perf_counter()
+        for _ in range(iterations):
+            start = time.perf_counter()
+            fn()
+            latencies.append(time.perf_counter() - start)
+        results[name] = summarize(latencies, time.perf_counter() - started)
+    return results
+
+
+async def main(requests: int, concurrency: int, limit: int, warmup: int) -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    tenant_id = f"bench-{uuid.uuid4().hex[:8]}"
+    results = {}
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+        await _seed(client, tenant_id, limit * 2)
+        for name, fast in (("response_model", False), ("orjson_fast_path", True)):
+            await _run_mode(client, fast, tenant_id, limit, warmup, concurrency)
+            results[name] = await _run_mode(client, fast, tenant_id, limit, requests, concurrency)
+
+        settings.fast_json_responses = False
+        page = await client.get(f"/orders?limit={limit}", headers={"X-Tenant-Id": tenant_id})
+        items = [dict(item, tenantId=tenant_id, createdAt="", updatedAt="") for item in page.json()["items"]]
+
+    await engine.dispose()
+    results.update(_serialize_only(items, requests))
+    print_table(results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark GET /orders serialization paths")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--warmup", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency, args.limit, args.warmup))
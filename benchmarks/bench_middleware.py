@@ -0,0 +1,140 @@
+"""
+Middleware overhead benchmark
+bench_middleware.py
+
+Drives minimal apps directly through the ASGI interface (no server, no
+database) to compare per-request overhead of the previous
+BaseHTTPMiddleware-based correlation id/timing middleware with the pure ASGI
+stack, and measures time to first body chunk of a streaming response.
+
+Usage:
+    python -m benchmarks.bench_middleware --requests 20000
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+from app.core.logging import set_correlation_id
+from app.core.middleware import CorrelationIdMiddleware, TimingMiddleware
+from app.core.request_stats import start_request_stats
+from benchmarks.common import print_table, summarize
+
+STREAM_CHUNKS = 5
+STREAM_DELAY_SECONDS = 0.02
+
+
+async def _json(request: Request) -> JSONResponse:
+    return JSONResponse({"ok": True})
+
+
+async def _stream(request: Request) -> StreamingResponse:
+    async def chunks():
+        for i in range(STREAM_CHUNKS):
+            yield f"{i}\n".encode()
+            await asyncio.sleep(STREAM_DELAY_SECONDS)
+    return StreamingResponse(chunks(), media_type="application/x-ndjson")
+
+
+async def _legacy_correlation_id(request: Request, call_next):
+    correlation_id = request.headers.get("X-Correlation-ID") or str(uuid.uuid4())
+    set_correlation_id(correlation_id)
+    stats = start_request_stats(correlation_id)
+    response = await call_next(request)
+    response.headers["X-Correlation-ID"] = correlation_id
+    response.headers["Server-Timing"] = stats.server_timing(stats.elapsed())
+    return response
+
+
+def _build(stack: str) -> Starlette:
+    app = Starlette(routes=[Route("/json", _json), Route("/stream", _stream)])
+    if stack == "base_http_middleware":
+        app.middleware("http")(_legacy_correlation_id)
+    elif stack == "pure_asgi":
+        app.add_middleware(TimingMiddleware)
+        app.add_middleware(CorrelationIdMiddleware)
+    return app
+
+
+def _scope(path: str) -> dict:
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 1),
+        "server": ("bench", 80),
+    }
+
+
+async def _call(app, path: str) -> float:
+    """Run one request; return seconds until the first non-empty body chunk."""
+    started = time.perf_counter()
+    first_chunk = None
+    request_sent = False
+    response_complete = asyncio.Event()
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # Like a server: report disconnect only once the response is finished
+        await response_complete.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal first_chunk
+        if message["type"] == "http.response.body":
+            if message.get("body") and first_chunk is None:
+                first_chunk = time.perf_counter() - started
+            if not message.get("more_body", False):
+                response_complete.set()
+
+    await app(_scope(path), receive, send)
+    return first_chunk
+
+
+async def _overhead(app, requests: int) -> dict:
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(requests):
+        start = time.perf_counter()
+        await _call(app, "/json")
+        latencies.append(time.perf_counter() - start)
+    return summarize(latencies, time.perf_counter() - started)
+
+
+async def main(requests: int, streams: int) -> None:
+    overhead = {}
+    first_chunk = {}
+    for stack in ("no_middleware", "base_http_middleware", "pure_asgi"):
+        app = _build(stack)
+        await _overhead(app, requests // 10)
+        overhead[stack] = await _overhead(app, requests)
+        ttfb = [await _call(app, "/stream") for _ in range(streams)]
+        first_chunk[f"{stack}_stream_ttfb"] = summarize(ttfb, sum(ttfb))
+
+    print_table(overhead)
+    print()
+    print_table(first_chunk)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark middleware overhead")
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--streams", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.streams))
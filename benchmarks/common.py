@@ -0,0 +1,38 @@
+"""
+Benchmark helpers
+common.py
+"""
+
+import math
+import statistics
+from typing import List
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Return the q-th percentile (0-100) using nearest-rank."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(latencies: List[float], elapsed: float) -> dict:
+    """Summarize latencies in seconds into milliseconds and throughput."""
+    return {
+        "count": len(latencies),
+        "rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 3) if latencies else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+    }
+
+
+def print_table(rows: dict) -> None:
+    """Print {name: summary} as an aligned table."""
+    columns = ["count", "rps", "mean_ms", "p50_ms", "p95_ms", "p99_ms"]
+    width = max(len(name) for name in rows) + 2
+    print("".ljust(width) + "".join(c.rjust(10) for c in columns))
+    for name, summary in rows.items():
+        print(name.ljust(width) + "".join(str(summary[c]).rjust(10) for c in columns))
@@ -0,0 +1,324 @@
+"""
+HTTP load harness
+load.py
+
+Virtual users drive a weighted mix of create/confirm/close/list requests
+against tenants picked with a Zipf-like skew. Creates retry one of the
+tenant's recent idempotency keys at a configurable rate, confirms and
+closes act on orders the harness created, and lists follow their cursor
+for a few pages. The harness reports throughput and latency percentiles per
+route, can write the results as JSON, and can compare them with a stored
+baseline, exiting with status 1 when a route regressed beyond the tolerance.
+
+Runs in-process through ASGITransport against the database in DATABASE_URL
+(schema is created if missing), or against a running server with --url.
+
+Usage:
+    python -m benchmarks.load --duration 30 --concurrency 16 --output load.json \\
+        --baseline benchmarks/baselines/load_inprocess.json
+    python -m benchmarks.load --url http://127.0.0.1:8000 --mix create=4,confirm=2,close=1,list=3
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+import uuid
+from collections import defaultdict, deque
+from dataclasses import asdict, dataclass, field
+from typing import Deque, Dict, List, Optional, Tuple
+
+from httpx import ASGITransport, AsyncClient
+
+from benchmarks.common import summarize
+
+ROUTES = {
+    "create": "POST /orders",
+    "confirm": "PATCH /orders/{id}/confirm",
+    "close": "POST /orders/{id}/close",
+    "list": "GET /orders",
+}
+EXPECTED_STATUS = {"create": {200, 201}, "confirm": {200}, "close": {200}, "list": {200}}
+DEFAULT_MIX = "create=4,confirm=2,close=1,list=3"
+
+
+@dataclass
+class LoadConfig:
+    """Workload shape of one load run."""
+
+    duration: float = 10.0
+    warmup: float = 2.0
+    concurrency: int = 8
+    tenants: int = 20
+    tenant_skew: float = 1.0
+    mix: Dict[str, float] = field(default_factory=lambda: parse_mix(DEFAULT_MIX))
+    key_reuse: float = 0.05
+    list_limit: int = 20
+    list_pages: int = 3
+    seed: int = 1
+
+
+@dataclass
+class _TenantState:
+    """Orders and keys the harness created for one tenant."""
+
+    recent_keys: Deque[str] = field(default_factory=lambda: deque(maxlen=50))
+    drafts: List[Tuple[str, int]] = field(default_factory=list)
+    confirmed: List[str] = field(default_factory=list)
+
+
+class _Recorder:
+    """Latencies and status codes per route, ignored while warming up."""
+
+    def __init__(self):
+        self.recording = False
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    def record(self, op: str, status: int, latency: float) -> None:
+        if not self.recording:
+            return
+        self.latencies[op].append(latency)
+        self.statuses[op][status] += 1
+        if status not in EXPECTED_STATUS[op]:
+            self.errors[op] += 1
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    """Parse 'create=4,confirm=2,...' into operation weights."""
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in ROUTES:
+            raise ValueError(f"Unknown operation '{name}', expected one of {', '.join(ROUTES)}")
+        mix[name] = float(weight)
+    return mix
+
+
+class _VirtualUser:
+    """One client issuing requests back to back until the deadline."""
+
+    def __init__(self, client: AsyncClient, config: LoadConfig, tenants: List[str],
+                 states: Dict[str, _TenantState], recorder: _Recorder, rng: random.Random):
+        self.client = client
+        self.config = config
+        self.tenants = tenants
+        self.weights = [1 / (rank + 1) ** config.tenant_skew for rank in range(len(tenants))]
+        self.states = states
+        self.recorder = recorder
+        self.rng = rng
+        self.ops = list(config.mix)
+        self.op_weights = [config.mix[op] for op in self.ops]
+
+    async def _request(self, op: str, method: str, url: str, tenant: str, **kwargs):
+        headers = {"X-Tenant-Id": tenant, **kwargs.pop("headers", {})}
+        start = time.perf_counter()
+        response = await self.client.request(method, url, headers=headers, **kwargs)
+        self.recorder.record(op, response.status_code, time.perf_counter() - start)
+        return response
+
+    async def create(self, tenant: str) -> None:
+        state = self.states[tenant]
+        if state.recent_keys and self.rng.random() < self.config.key_reuse:
+            # Client retry of an earlier request: same key, same body
+            key = self.rng.choice(state.recent_keys)
+        else:
+            key = f"load-{uuid.uuid4()}"
+            state.recent_keys.append(key)
+        response = await self._request("create", "POST", "/orders", tenant, headers={"Idempotency-Key": key}, json={})
+        if response.status_code == 201:
+            state.drafts.append((response.json()["id"], response.json()["version"]))
+
+    async def confirm(self, tenant: str) -> None:
+        state = self.states[tenant]
+        if not state.drafts:
+            return await self.create(tenant)
+        order_id, version = state.drafts.pop(self.rng.randrange(len(state.drafts)))
+        response = await self._request(
+            "confirm", "PATCH", f"/orders/{order_id}/confirm", tenant,
+            headers={"If-Match": str(version)}, json={"totalCents": self.rng.randint(100, 100000)}
+        )
+        if response.status_code == 200:
+            state.confirmed.append(order_id)
+
+    async def close(self, tenant: str) -> None:
+        state = self.states[tenant]
+        if not state.confirmed:
+            return await self.confirm(tenant)
+        order_id = state.confirmed.pop(self.rng.randrange(len(state.confirmed)))
+        await self._request("close", "POST", f"/orders/{order_id}/close", tenant)
+
+    async def list(self, tenant: str) -> None:
+        params = {"limit": self.config.list_limit}
+        for _ in range(self.rng.randint(1, self.config.list_pages)):
+            response = await self._request("list", "GET", "/orders", tenant, params=params)
+            next_cursor = response.json().get("nextCursor") if response.status_code == 200 else None
+            if not next_cursor:
+                break
+            params["cursor"] = next_cursor
+
+    async def run(self, deadline: float) -> None:
+        while time.perf_counter() < deadline:
+            tenant = self.rng.choices(self.tenants, self.weights)[0]
+            op = self.rng.choices(self.ops, self.op_weights)[0]
+            await getattr(self, op)(tenant)
+
+
+async def run_load(client: AsyncClient, config: LoadConfig) -> dict:
+    """Run the workload with the given client and return results per route."""
+    rng = random.Random(config.seed)
+    run_id = uuid.uuid4().hex[:8]
+    tenants = [f"load-{run_id}-{i}" for i in range(config.tenants)]
+    states = {tenant: _TenantState() for tenant in tenants}
+    recorder = _Recorder()
+    users = [
+        _VirtualUser(client, config, tenants, states, recorder, random.Random(rng.random()))
+        for _ in range(config.concurrency)
+    ]
+
+    start = time.perf_counter()
+    deadline = start + config.warmup + config.duration
+
+    async def start_recording() -> None:
+        await asyncio.sleep(config.warmup)
+        recorder.recording = True
+
+    recording = asyncio.create_task(start_recording())
+    await asyncio.gather(*(user.run(deadline) for user in users))
+    await recording
+    elapsed = time.perf_counter() - start - config.warmup
+
+    routes = {}
+    for op, route in ROUTES.items():
+        latencies = recorder.latencies.get(op)
+        if not latencies:
+            continue
+        routes[route] = {
+            **summarize(latencies, elapsed),
+            "errors": recorder.errors[op],
+            "statuses": {str(status): count for status, count in sorted(recorder.statuses[op].items())},
+        }
+    all_latencies = [latency for latencies in recorder.latencies.values() for latency in latencies]
+    return {
+        "config": asdict(config),
+        "total": {**summarize(all_latencies, elapsed), "errors": sum(recorder.errors.values())},
+        "routes": routes,
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float, min_delta_ms: float) -> List[str]:
+    """Return a description of every route that regressed against the baseline.
+
+    A route regresses when its p95/p99 latency grew, or its throughput
+    dropped, by more than tolerance (a fraction), or when it produced
+    unexpected status codes the baseline did not. Latency growth below
+    min_delta_ms is treated as noise.
+    """
+    regressions = []
+    for route, base in baseline["routes"].items():
+        current = results["routes"].get(route)
+        if current is None:
+            regressions.append(f"{route}: no requests recorded")
+            continue
+        for metric in ("p95_ms", "p99_ms"):
+            limit = base[metric] * (1 + tolerance)
+            if current[metric] > limit and current[metric] - base[metric] >= min_delta_ms:
+                regressions.append(f"{route}: {metric} {current[metric]} > {round(limit, 3)} (baseline {base[metric]})")
+        if current["rps"] < base["rps"] * (1 - tolerance):
+            regressions.append(f"{route}: rps {current['rps']} < {round(base['rps'] * (1 - tolerance), 1)} (baseline {base['rps']})")
+        if current["errors"] > base.get("errors", 0):
+            regressions.append(f"{route}: {current['errors']} unexpected responses {current['statuses']}")
+    return regressions
+
+
+def print_results(results: dict, baseline: Optional[dict] = None) -> None:
+    """Print per-route results, with baseline values alongside when given."""
+    columns = ["count", "rps", "p50_ms", "p95_ms", "p99_ms", "errors"]
+    rows = {**results["routes"], "total": results["total"]}
+    width = max(len(name) for name in rows) + 2
+    print("".ljust(width) + "".join(c.rjust(10) for c in columns))
+    for name, summary in rows.items():
+        print(name.ljust(width) + "".join(str(summary[c]).rjust(10) for c in columns))
+        base = (baseline or {}).get("routes", {}).get(name)
+        if base:
+            print("  baseline".ljust(width) + "".join(str(base.get(c, "")).rjust(10) for c in columns))
+
+
+async def _run(url: Optional[str], config: LoadConfig) -> dict:
+    if url:
+        async with AsyncClient(base_url=url, timeout=30) as client:
+            return await run_load(client, config)
+
+    from app.db.base import Base
+    from app.db.session import engine
+    from app.main import app
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://load", timeout=30) as client:
+            return await run_load(client, config)
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Load test the orders API and compare with a baseline")
+    parser.add_argument("--url", default=None, help="Base URL of a running server (default: in-process ASGI app)")
+    parser.add_argument("--duration", type=float, default=LoadConfig.duration, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=LoadConfig.warmup, help="Unmeasured seconds before measuring")
+    parser.add_argument("--concurrency", type=int, default=LoadConfig.concurrency, help="Virtual users")
+    parser.add_argument("--tenants", type=int, default=LoadConfig.tenants)
+    parser.add_argument("--tenant-skew", type=float, default=LoadConfig.tenant_skew, help="Zipf exponent; 0 = uniform")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Operation weights")
+    parser.add_argument("--key-reuse", type=float, default=LoadConfig.key_reuse, help="Fraction of creates retrying a recent key")
+    parser.add_argument("--seed", type=int, default=LoadConfig.seed)
+    parser.add_argument("--output", default=None, help="Write results as JSON to this path")
+    parser.add_argument("--baseline", default=None, help="Compare with results JSON at this path")
+    parser.add_argument("--update-baseline", action="store_true", help="Write results to --baseline instead of comparing")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative regression")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0, help="Ignore latency growth below this")
+    args = parser.parse_args()
+
+    config = LoadConfig(
+        duration=args.duration,
+        warmup=args.warmup,
+        concurrency=args.concurrency,
+        tenants=args.tenants,
+        tenant_skew=args.tenant_skew,
+        mix=parse_mix(args.mix),
+        key_reuse=args.key_reuse,
+        seed=args.seed,
+    )
+    results = asyncio.run(_run(args.url, config))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.baseline and args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print_results(results)
+        return
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    print_results(results, baseline)
+    if baseline:
+        regressions = compare(results, baseline, args.tolerance, args.min_delta_ms)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.tolerance:.0%} of baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+"""
+Hot-path micro-benchmarks
+micro.py
+
+CPU-bound pieces every request goes through, timed in isolation (no server,
+no database): request body hashing, cursor encoding/decoding, building list
+items from Order rows, FastAPI response validation of PaginatedOrdersResponse
+(with the orjson fast path for comparison) and header dependency resolution.
+
+Each benchmark is warmed up, then timed as the best of --repeat loops of
+--iterations calls. Allocations are measured in a separate tracemalloc pass:
+peak bytes allocated while one call runs, and bytes still held by its
+result. With --profile DIR, a cProfile run of each benchmark is dumped to
+DIR/<name>.prof and its top functions are printed.
+
+Usage:
+    python -m benchmarks.micro                       # all benchmarks
+    python -m benchmarks.micro decode_cursor validate_page_100 --profile /tmp/prof
+    python -m benchmarks.micro --list
+"""
+
+import argparse
+import cProfile
+import io
+import json
+import os
+import pstats
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Annotated, Any, Callable, Coroutine, Dict, List
+
+from fastapi import Depends
+from fastapi.dependencies.utils import get_dependant, solve_dependencies
+from fastapi.routing import APIRoute, serialize_response
+from starlette.requests import Request
+
+from app.api.dependencies import get_idempotency_key, get_if_match, get_tenant_id
+from app.main import app
+from app.models.order import Order, OrderStatus
+from app.schemas.order import PaginatedOrdersResponse
+from app.schemas.serializers import serialize_paginated_orders
+from app.services.order_service import order_item
+from app.utils.idempotency import hash_body
+from app.utils.pagination import decode_cursor, encode_cursor
+
+PAGE_SIZE = 100
+
+
+def _run_coroutine(coro: Coroutine) -> Any:
+    """Drive a coroutine that never suspends to completion without an event loop."""
+    try:
+        coro.send(None)
+    except StopIteration as done:
+        return done.value
+    coro.close()
+    raise RuntimeError("Coroutine suspended; benchmark needs an event loop")
+
+
+def _orders(count: int) -> List[Order]:
+    created_at = datetime(2024, 5, 1, tzinfo=timezone.utc)
+    return [
+        Order(
+            id=uuid.uuid4(),
+            tenant_id="bench-tenant",
+            status=OrderStatus.CONFIRMED,
+            version=2,
+            total_cents=1000 + i,
+            created_at=created_at + timedelta(seconds=i),
+            updated_at=created_at + timedelta(seconds=i),
+        )
+        for i in range(count)
+    ]
+
+
+def bench_hash_body() -> Callable[[], Any]:
+    body = {
+        "customer": {"id": "cus_123", "email": "buyer@example.com"},
+        "items": [{"sku": f"SKU-{i}", "quantity": i + 1, "priceCents": 1999} for i in range(3)],
+        "note": "Leave at the front desk",
+    }
+    return lambda: hash_body(body)
+
+
+def bench_encode_cursor() -> Callable[[], Any]:
+    created_at, order_id = datetime.now(timezone.utc), str(uuid.uuid4())
+    return lambda: encode_cursor(created_at, order_id)
+
+
+def bench_decode_cursor() -> Callable[[], Any]:
+    cursor = encode_cursor(datetime.now(timezone.utc), str(uuid.uuid4()))
+    return lambda: decode_cursor(cursor)
+
+
+def bench_list_items_100() -> Callable[[], Any]:
+    orders = _orders(PAGE_SIZE)
+    return lambda: [order_item(order) for order in orders]
+
+
+def _list_page() -> dict:
+    return {"items": [order_item(order) for order in _orders(PAGE_SIZE)], "nextCursor": "cursor"}
+
+
+def bench_validate_page_100() -> Callable[[], Any]:
+    """What FastAPI does with the GET /orders return value: build, validate and dump the model."""
+    route = next(r for r in app.routes if isinstance(r, APIRoute) and r.path == "/orders" and "GET" in r.methods)
+    page = _list_page()
+
+    def validate():
+        content = PaginatedOrdersResponse(items=page["items"], nextCursor=page["nextCursor"])
+        return _run_coroutine(serialize_response(field=route.secure_cloned_response_field, response_content=content))
+    return validate
+
+
+def bench_serialize_page_100_fast() -> Callable[[], Any]:
+    page = _list_page()
+    return lambda: serialize_paginated_orders(page)
+
+
+async def _header_endpoint(
+    tenant_id: Annotated[str, Depends(get_tenant_id)],
+    idempotency_key: Annotated[str, Depends(get_idempotency_key)],
+    version: Annotated[int, Depends(get_if_match)],
+):
+    pass
+
+
+def bench_header_dependencies() -> Callable[[], Any]:
+    """FastAPI resolving X-Tenant-Id, Idempotency-Key and If-Match for one request."""
+    dependant = get_dependant(path="/orders/{order_id}/confirm", call=_header_endpoint)
+    scope = {
+        "type": "http",
+        "method": "PATCH",
+        "path": "/orders/1/confirm",
+        "query_string": b"",
+        "headers": [
+            (b"x-tenant-id", b"tenant-1"),
+            (b"idempotency-key", b"key-1"),
+            (b"if-match", b'"3"'),
+            (b"content-type", b"application/json"),
+        ],
+    }
+
+    def solve():
+        values, errors, *_ = _run_coroutine(solve_dependencies(request=Request(scope), dependant=dependant))
+        if errors:
+            raise RuntimeError(errors)
+        return values
+    return solve
+
+
+BENCHMARKS: Dict[str, Callable[[], Callable[[], Any]]] = {
+    "hash_body": bench_hash_body,
+    "encode_cursor": bench_encode_cursor,
+    "decode_cursor": bench_decode_cursor,
+    "list_items_100": bench_list_items_100,
+    "validate_page_100": bench_validate_page_100,
+    "serialize_page_100_fast": bench_serialize_page_100_fast,
+    "header_dependencies": bench_header_dependencies,
+}
+
+
+def measure(fn: Callable[[], Any], iterations: int, warmup: int, repeat: int) -> dict:
+    """Time fn and measure its allocations."""
+    for _ in range(warmup):
+        fn()
+
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            fn()
+        best = min(best, time.perf_counter() - start)
+
+    samples = min(iterations, 200)
+    tracemalloc.start()
+    peaks, retained = [], []
+    for _ in range(samples):
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        result = fn()
+        after, peak = tracemalloc.get_traced_memory()
+        peaks.append(peak - before)
+        retained.append(after - before)
+        del result
+    tracemalloc.stop()
+
+    return {
+        "ops_per_sec": round(iterations / best),
+        "us_per_op": round(best / iterations * 1e6, 3),
+        "alloc_peak_bytes": sorted(peaks)[len(peaks) // 2],
+        "alloc_retained_bytes": sorted(retained)[len(retained) // 2],
+    }
+
+
+def profile(name: str, fn: Callable[[], Any], iterations: int, directory: str, top: int) -> str:
+    """Run fn under cProfile, dump stats to directory/<name>.prof and return the top functions."""
+    profiler = cProfile.Profile()
+    profiler.enable()
+    for _ in range(iterations):
+        fn()
+    profiler.disable()
+
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{name}.prof")
+    profiler.dump_stats(path)
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).strip_dirs().sort_stats("tottime").print_stats(top)
+    return f"{path}\n{out.getvalue()}"
+
+
+def main() -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Micro-benchmark CPU-bound request path helpers")
+    parser.add_argument("names", nargs="*", help="Benchmarks to run (default: all)")
+    parser.add_argument("--list", action="store_true", help="List benchmark names and exit")
+    parser.add_argument("--iterations", type=int, default=5000)
+    parser.add_argument("--warmup", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--profile", metavar="DIR", default=None, help="Dump cProfile stats per benchmark here")
+    parser.add_argument("--profile-top", type=int, default=15, help="Functions to print per profile")
+    parser.add_argument("--json", dest="json_path", default=None, help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    if args.list:
+        print("\n".join(BENCHMARKS))
+        return
+    unknown = [name for name in args.names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+
+    results = {}
+    profiles = []
+    for name in args.names or BENCHMARKS:
+        fn = BENCHMARKS[name]()
+        results[name] = measure(fn, args.iterations, args.warmup, args.repeat)
+        if args.profile:
+            profiles.append(profile(name, fn, args.iterations, args.profile, args.profile_top))
+
+    columns = ["ops_per_sec", "us_per_op", "alloc_peak_bytes", "alloc_retained_bytes"]
+    width = max(len(name) for name in results) + 2
+    print("".ljust(width) + "".join(c.rjust(22) for c in columns))
+    for name, result in results.items():
+        print(name.ljust(width) + "".join(str(result[c]).rjust(22) for c in columns))
+    for report in profiles:
+        print()
+        print(report)
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,12 +2,14 @@ import asyncio
 import os
 import random
 import string
+from contextlib import contextmanager
 from typing import AsyncGenerator, Generator
 
 import pytest
 import pytest_asyncio
 from httpx import AsyncClient, ASGITransport
-from sqlalchemy import text
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     create_async_engine,
@@ -18,6 +20,7 @@ from sqlalchemy.pool import NullPool
 from app.main import app
 from app.db.base import Base
 from app.db.session import get_db
+from app.services.order_service import list_cache, order_cache
 
 
 SERVER_URL = os.getenv(
@@ -125,4 +128,39 @@ async def client(db_session) -> AsyncGenerator[AsyncClient, None]:
     async with AsyncClient(transport=transport, base_url="http://test") as ac:
         yield ac
 
-    app.dependency_overrides.clear()
\ No newline at end of file
+    app.dependency_overrides.clear()
+
+
+@contextmanager
+def count_queries() -> Generator[list, None, None]:
+    """Collect SQL statements executed by any engine inside the block."""
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", _record)
+    try:
+        yield statements
+    finally:
+        event.remove(Engine, "before_cursor_execute", _record)
+
+
+@pytest.fixture
+def assert_max_queries():
+    """Return a context manager failing the test if the block runs more than n statements."""
+    @contextmanager
+    def _assert_max_queries(n: int):
+        with count_queries() as statements:
+            yield statements
+        assert len(statements) <= n, (
+            f"Expected at most {n} queries, got {len(statements)}:\n" + "\n".join(statements)
+        )
+    return _assert_max_queries
+
+
+@pytest.fixture(autouse=True)
+def clear_read_caches():
+    """Per-worker read caches outlive a test's rolled-back data; start each test empty."""
+    order_cache.clear()
+    list_cache.clear()
@@ -0,0 +1,58 @@
+"""
+Fast JSON response path tests
+test_fast_responses.py
+"""
+
+import uuid
+import pytest
+from httpx import AsyncClient
+from app.core.config import settings
+from app.schemas.serializers import serialize_paginated_orders
+from app.services.order_service import idempotency_cache
+
+TENANT_ID = "fast-json-tenant"
+HEADERS = {"X-Tenant-Id": TENANT_ID}
+
+
+def test_serializer_projects_schema_fields():
+    """Test serializers drop fields outside the schema and fill optional defaults."""
+    data = {
+        "items": [{"id": "a", "tenantId": "t", "status": "DRAFT", "version": 1, "createdAt": "x"}],
+        "nextCursor": "c",
+    }
+    assert serialize_paginated_orders(data) == {
+        "items": [{"id": "a", "status": "DRAFT", "version": 1, "totalCents": None}],
+        "nextCursor": "c",
+    }
+
+
+async def _walk_routes(client: AsyncClient) -> list:
+    """Create, replay, confirm, close and list; return (status, json) per call."""
+    idempotency_cache.clear()
+    create_headers = {**HEADERS, "Idempotency-Key": f"key-{uuid.uuid4()}"}
+    created = await client.post("/orders", headers=create_headers, json={})
+    replay = await client.post("/orders", headers=create_headers, json={})
+    order_id = created.json()["id"]
+    confirmed = await client.patch(
+        f"/orders/{order_id}/confirm",
+        headers={**HEADERS, "If-Match": "1"},
+        json={"totalCents": 1000}
+    )
+    closed = await client.post(f"/orders/{order_id}/close", headers=HEADERS)
+    listed = await client.get("/orders?limit=1", headers=HEADERS)
+    responses = [created, replay, confirmed, closed, listed]
+    return [(r.status_code, r.json()) for r in responses]
+
+
+@pytest.mark.asyncio
+async def test_fast_path_matches_validated_responses(client: AsyncClient, monkeypatch):
+    """Test the orjson path returns the same status codes and bodies as response_model."""
+    standard = await _walk_routes(client)
+    monkeypatch.setattr(settings, "fast_json_responses", True)
+    fast = await _walk_routes(client)
+
+    assert [status for status, _ in fast] == [201, 200, 200, 200, 200]
+    assert [status for status, _ in fast] == [status for status, _ in standard]
+    for (_, fast_body), (_, standard_body) in zip(fast, standard):
+        assert set(fast_body) == set(standard_body)
+    assert set(fast[-1][1]["items"][0]) == set(standard[-1][1]["items"][0])
@@ -0,0 +1,118 @@
+"""
+Idempotency storage migration tests
+test_idempotency_migration.py
+"""
+
+import importlib.util
+import json
+from pathlib import Path
+
+import pytest
+from sqlalchemy import text
+from app.repositories.idempotency_repository import IdempotencyRepository
+from app.utils.idempotency import bodies_match, hash_body, legacy_hash_body
+
+TENANT_ID = "migration-tenant"
+VERSIONS = Path(__file__).resolve().parents[1] / "alembic" / "versions"
+
+
+def load_revision(filename: str):
+    """Import an alembic revision module for its SQL."""
+    path = VERSIONS / filename
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+binary_columns = load_revision("a7d3e9b15c62_idempotency_binary_hash_raw_response.py")
+reverse_conversion = load_revision("b2f6c8d4e071_idempotency_response_json_reverse_conversion.py")
+
+
+async def restore_legacy_column(db_session) -> None:
+    """Bring back the mid-upgrade schema: response_json beside nullable new columns."""
+    await db_session.execute(text("ALTER TABLE idempotency_keys ADD COLUMN response_json jsonb"))
+    for column in binary_columns.NEW_COLUMNS:
+        await db_session.execute(text(f"ALTER TABLE idempotency_keys ALTER COLUMN {column} DROP NOT NULL"))
+
+
+async def insert_legacy(db_session, key: str, body: dict, response: dict) -> None:
+    """Insert a record the way the previous release wrote it."""
+    await db_session.execute(
+        text(
+            "INSERT INTO idempotency_keys (tenant_id, key, response_json, created_at) "
+            "VALUES (:tenant, :key, CAST(:response_json AS jsonb), now())"
+        ),
+        {
+            "tenant": TENANT_ID,
+            "key": key,
+            "response_json": json.dumps({"response": response, "body_hash": legacy_hash_body(body).hex()}),
+        }
+    )
+
+
+async def fetch(db_session, key: str):
+    result = await db_session.execute(
+        text(
+            "SELECT body_hash, response_status, response_body, response_json "
+            "FROM idempotency_keys WHERE tenant_id = :tenant AND key = :key"
+        ),
+        {"tenant": TENANT_ID, "key": key}
+    )
+    return result.one()
+
+
+@pytest.mark.asyncio
+async def test_backfill_and_trigger_convert_legacy_records(db_session):
+    """Test rows written before and after the upgrade get body_hash, response_status and response_body."""
+    body = {"tenant_id": TENANT_ID, "note": "ünïcode", "amount": 10**20}
+    response = {"id": "7a0c7a43-5a4b-4bb5-a1cf-0b8d1f1f2c11", "status": "DRAFT"}
+    await restore_legacy_column(db_session)
+    await insert_legacy(db_session, "before-upgrade", body, response)
+
+    await db_session.execute(text(binary_columns.CONVERT_FUNCTION))
+    await db_session.execute(text(binary_columns.CONVERT_TRIGGER))
+    assert (await db_session.execute(binary_columns.BACKFILL_BATCH, {"batch_size": 10})).rowcount == 1
+    assert (await db_session.execute(binary_columns.BACKFILL_BATCH, {"batch_size": 10})).rowcount == 0
+    await insert_legacy(db_session, "after-upgrade", body, response)
+
+    for key in ("before-upgrade", "after-upgrade"):
+        body_hash, response_status, response_body, _ = await fetch(db_session, key)
+        assert body_hash == legacy_hash_body(body)
+        assert bodies_match(body_hash, body)
+        assert response_status == 201
+        assert json.loads(response_body) == response
+
+
+@pytest.mark.asyncio
+async def test_trigger_fills_response_json_for_previous_release(db_session):
+    """Test records written by the current release get a response_json the previous release can read."""
+    body = {"tenant_id": TENANT_ID, "note": "current"}
+    response = {"id": "0f5d2f0e-41b4-4d61-9c8e-1b0e6f4e3a27", "status": "DRAFT"}
+    await restore_legacy_column(db_session)
+    await db_session.execute(text(binary_columns.CONVERT_FUNCTION))
+    await db_session.execute(text(binary_columns.CONVERT_TRIGGER))
+    await db_session.execute(text("DROP TRIGGER idempotency_keys_convert_response_json ON idempotency_keys"))
+    await db_session.execute(text(reverse_conversion.CONVERT_FUNCTION))
+    await db_session.execute(text(reverse_conversion.CONVERT_TRIGGER))
+
+    await IdempotencyRepository(db_session).store(
+        TENANT_ID, "current-release", hash_body(body), 201, json.dumps(response).encode()
+    )
+    _, _, _, response_json = await fetch(db_session, "current-release")
+    assert response_json == {"response": response, "body_hash": hash_body(body).hex()}
+
+    # A previous-release write still wins over the stale binary columns
+    await db_session.execute(
+        text(
+            "UPDATE idempotency_keys SET response_json = CAST(:response_json AS jsonb) "
+            "WHERE tenant_id = :tenant AND key = :key"
+        ),
+        {
+            "tenant": TENANT_ID,
+            "key": "current-release",
+            "response_json": json.dumps({"response": {"id": "other"}, "body_hash": legacy_hash_body(body).hex()}),
+        }
+    )
+    body_hash, response_status, response_body, _ = await fetch(db_session, "current-release")
+    assert (body_hash, response_status, json.loads(response_body)) == (legacy_hash_body(body), 201, {"id": "other"})
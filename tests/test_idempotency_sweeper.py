@@ -0,0 +1,38 @@
+"""
+Idempotency sweeper tests
+test_idempotency_sweeper.py
+"""
+
+import pytest
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import text
+from app.repositories.idempotency_repository import IdempotencyRepository
+
+TENANT_ID = "sweeper-tenant"
+
+
+@pytest.mark.asyncio
+async def test_delete_expired_in_bounded_batches(db_session):
+    """Test expired keys are deleted in batches and fresh keys are kept."""
+    now = datetime.now(timezone.utc)
+    for i, age in enumerate([timedelta(hours=5)] * 3 + [timedelta(minutes=1)]):
+        await db_session.execute(
+            text(
+                "INSERT INTO idempotency_keys (tenant_id, key, body_hash, response_status, response_body, created_at) "
+                "VALUES (:tenant, :key, '', 201, '{}', :created_at)"
+            ),
+            {"tenant": TENANT_ID, "key": f"sweep-{i}", "created_at": now - age}
+        )
+
+    repo = IdempotencyRepository(db_session)
+    cutoff = now - timedelta(hours=1)
+
+    assert await repo.delete_expired(cutoff, 2) == 2
+    assert await repo.delete_expired(cutoff, 2) == 1
+    assert await repo.delete_expired(cutoff, 2) == 0
+
+    result = await db_session.execute(
+        text("SELECT key FROM idempotency_keys WHERE tenant_id = :tenant"),
+        {"tenant": TENANT_ID}
+    )
+    assert [row[0] for row in result] == ["sweep-3"]
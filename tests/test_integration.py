@@ -3,11 +3,21 @@ Integration tests for Orders API
 test_integration.py
 """
 
+import asyncio
+import json
 import pytest
 import uuid
+from datetime import datetime, timezone
 from httpx import AsyncClient
 from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from app.db.pool import pool_status
+from app.db.session import create_engine_for
 from app.models.order import OrderStatus
+from app.repositories.idempotency_repository import IdempotencyRepository
+from app.repositories.order_repository import OrderRepository
+from app.services import get_order_service
+from app.services.order_service import idempotency_cache
 
 # Test data
 TENANT_ID = "test-tenant"
@@ -173,6 +183,8 @@ async def test_close_order_outbox_entry(client: AsyncClient, db_session):
     row = result.fetchone()
     assert row is not None
     assert row.event_type == "orders.closed"
+    assert row.payload["orderId"] == order_id
+    assert row.payload["totalCents"] == 1000
     
 
 @pytest.mark.asyncio
@@ -211,3 +223,464 @@ async def test_tenant_isolation(client: AsyncClient):
     )
     assert response.status_code == 200
     assert len(response.json()["items"]) == 0
+
+
+@pytest.mark.asyncio
+async def test_create_order_repeated_replay_without_cache(client: AsyncClient, db_session):
+    """Test replays served from the database never create a second order."""
+    key = f"key-{uuid.uuid4()}"
+    ids = []
+    bodies = set()
+    for expected_status in (201, 200, 200):
+        idempotency_cache.clear()
+        response = await client.post(
+            "/orders",
+            headers={"X-Tenant-Id": TENANT_ID, "Idempotency-Key": key},
+            json={}
+        )
+        assert response.status_code == expected_status
+        ids.append(response.json()["id"])
+        bodies.add(response.content)
+
+    assert len(set(ids)) == 1
+    assert len(bodies) == 1
+    result = await db_session.execute(
+        text("SELECT count(*) FROM orders WHERE id = :oid"),
+        {"oid": ids[0]}
+    )
+    assert result.scalar() == 1
+
+
+@pytest.mark.asyncio
+async def test_create_order_concurrent_same_key(client: AsyncClient):
+    """Test concurrent retries with one key coalesce into a single order."""
+    key = f"key-{uuid.uuid4()}"
+    responses = await asyncio.gather(*(
+        client.post(
+            "/orders",
+            headers={"X-Tenant-Id": TENANT_ID, "Idempotency-Key": key},
+            json={}
+        )
+        for _ in range(5)
+    ))
+
+    statuses = sorted(r.status_code for r in responses)
+    assert statuses == [200, 200, 200, 200, 201]
+    assert len({r.json()["id"] for r in responses}) == 1
+
+
+@pytest.mark.asyncio
+async def test_create_order_reuses_expired_key(client: AsyncClient, db_session):
+    """Test an expired idempotency key is reclaimed for a new order."""
+    key = f"key-{uuid.uuid4()}"
+    await db_session.execute(
+        text(
+            "INSERT INTO idempotency_keys (tenant_id, key, body_hash, response_status, response_body, created_at) "
+            "VALUES (:tenant, :key, '\\x00', 201, '{}', now() - interval '2 days')"
+        ),
+        {"tenant": TENANT_ID, "key": key}
+    )
+
+    response = await client.post(
+        "/orders",
+        headers={"X-Tenant-Id": TENANT_ID, "Idempotency-Key": key},
+        json={"foo": "bar"}
+    )
+    assert response.status_code == 201
+    order_id = response.json()["id"]
+
+    result = await db_session.execute(
+        text("SELECT convert_from(response_body, 'UTF8')::jsonb->>'id' FROM idempotency_keys WHERE tenant_id = :tenant AND key = :key"),
+        {"tenant": TENANT_ID, "key": key}
+    )
+    assert result.scalar() == order_id
+
+
+@pytest.mark.asyncio
+async def test_create_order_replays_converted_record(client: AsyncClient, db_session):
+    """Test a record converted from response_json replays for its body and conflicts for another."""
+    key = f"key-{uuid.uuid4()}"
+    body = {"note": "café", "items": [{"sku": "A", "quantity": 2}]}
+    stored = b'{"id": "3f2a", "status": "DRAFT", "version": 1, "tenantId": "test-tenant", "createdAt": "2026-10-17T10:00:00"}'
+    await db_session.execute(
+        text(
+            "INSERT INTO idempotency_keys (tenant_id, key, body_hash, response_status, response_body, created_at) "
+            "VALUES (:tenant, :key, sha256(convert_to(:canonical, 'UTF8')), 201, :stored, now())"
+        ),
+        {"tenant": TENANT_ID, "key": key, "canonical": json.dumps(body, sort_keys=True), "stored": stored}
+    )
+
+    response = await client.post(
+        "/orders",
+        headers={"X-Tenant-Id": TENANT_ID, "Idempotency-Key": key},
+        json=body
+    )
+    assert response.status_code == 200
+    assert response.content == stored
+
+    response = await client.post(
+        "/orders",
+        headers={"X-Tenant-Id": TENANT_ID, "Idempotency-Key": key},
+        json={**body, "note": "cafe"}
+    )
+    assert response.status_code == 409
+
+
+@pytest.mark.asyncio
+async def test_close_order_requires_confirmed(client: AsyncClient, db_session):
+    """Test closing a draft is rejected without writing an outbox entry."""
+    key = f"key-{uuid.uuid4()}"
+    create_res = await client.post(
+        "/orders",
+        headers={"X-Tenant-Id": TENANT_ID, "Idempotency-Key": key},
+        json={}
+    )
+    order_id = create_res.json()["id"]
+
+    response = await client.post(
+        f"/orders/{order_id}/close",
+        headers={"X-Tenant-Id": TENANT_ID}
+    )
+    assert response.status_code == 412
+
+    result = await db_session.execute(
+        text("SELECT count(*) FROM outbox WHERE order_id = :oid"),
+        {"oid": order_id}
+    )
+    assert result.scalar() == 0
+
+
+@pytest.mark.asyncio
+async def test_confirm_and_close_unknown_order(client: AsyncClient):
+    """Test transitions on a missing order return 404."""
+    order_id = str(uuid.uuid4())
+    response = await client.patch(
+        f"/orders/{order_id}/confirm",
+        headers={"X-Tenant-Id": TENANT_ID, "If-Match": "1"},
+        json={"totalCents": 1000}
+    )
+    assert response.status_code == 404
+
+    response = await client.post(
+        f"/orders/{order_id}/close",
+        headers={"X-Tenant-Id": TENANT_ID}
+    )
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_create_orders_batch(client: AsyncClient):
+    """Test batch creation reports created, replayed and conflicting items."""
+    existing_key = f"key-{uuid.uuid4()}"
+    first = await client.post(
+        "/orders",
+        headers={"X-Tenant-Id": TENANT_ID, "Idempotency-Key": existing_key},
+        json={}
+    )
+    new_key = f"key-{uuid.uuid4()}"
+    idempotency_cache.clear()
+
+    response = await client.post(
+        "/orders:batch",
+        headers={"X-Tenant-Id": TENANT_ID},
+        json={"items": [
+            {"idempotencyKey": new_key, "body": {}},
+            {"idempotencyKey": existing_key, "body": {}},
+            {"idempotencyKey": existing_key, "body": {"foo": "bar"}},
+            {"idempotencyKey": new_key, "body": {}},
+        ]}
+    )
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [r["status"] for r in results] == [201, 200, 409, 200]
+    assert results[1]["order"]["id"] == first.json()["id"]
+    assert results[3]["order"]["id"] == results[0]["order"]["id"]
+    assert results[2]["error"]["code"] == "conflict"
+
+    replay = await client.post(
+        "/orders",
+        headers={"X-Tenant-Id": TENANT_ID, "Idempotency-Key": new_key},
+        json={}
+    )
+    assert replay.status_code == 200
+    assert replay.json()["id"] == results[0]["order"]["id"]
+
+
+@pytest.mark.asyncio
+async def test_create_orders_batch_reclaims_swept_key(client: AsyncClient, monkeypatch):
+    """Test a key whose live record is swept between claim and read is claimed again."""
+    key = f"key-{uuid.uuid4()}"
+    first = await client.post(
+        "/orders",
+        headers={"X-Tenant-Id": TENANT_ID, "Idempotency-Key": key},
+        json={}
+    )
+    idempotency_cache.clear()
+
+    find_many = IdempotencyRepository.find_many
+    calls = []
+
+    async def racing_find_many(self, tenant_id, keys):
+        calls.append(keys)
+        if len(calls) == 1:
+            # Looks new, so the batch tries to claim it and loses to the live record
+            return {}
+        if len(calls) == 2:
+            # Swept before the live record is read
+            await self.db.execute(
+                text("DELETE FROM idempotency_keys WHERE tenant_id = :tenant AND key = :key"),
+                {"tenant": tenant_id, "key": key}
+            )
+        return await find_many(self, tenant_id, keys)
+
+    monkeypatch.setattr(IdempotencyRepository, "find_many", racing_find_many)
+    response = await client.post(
+        "/orders:batch",
+        headers={"X-Tenant-Id": TENANT_ID},
+        json={"items": [{"idempotencyKey": key, "body": {}}]}
+    )
+
+    assert response.status_code == 200
+    [result] = response.json()["results"]
+    assert result["status"] == 201
+    assert result["order"]["id"] != first.json()["id"]
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_bulk_confirm_and_close(client: AsyncClient, db_session):
+    """Test bulk transitions report per-id outcomes and emit outbox rows."""
+    batch = await client.post(
+        "/orders:batch",
+        headers={"X-Tenant-Id": TENANT_ID},
+        json={"items": [{"idempotencyKey": f"key-{uuid.uuid4()}", "body": {}} for _ in range(3)]}
+    )
+    ids = [r["order"]["id"] for r in batch.json()["results"]]
+    missing_id = str(uuid.uuid4())
+
+    confirm = await client.patch(
+        "/orders:confirm",
+        headers={"X-Tenant-Id": TENANT_ID},
+        json={"items": [
+            {"id": ids[0], "version": 1, "totalCents": 100},
+            {"id": ids[1], "version": 1, "totalCents": 200},
+            {"id": ids[2], "version": 5, "totalCents": 300},
+            {"id": missing_id, "version": 1, "totalCents": 400},
+        ]}
+    )
+    assert confirm.status_code == 200
+    results = confirm.json()["results"]
+    assert [r["status"] for r in results] == [200, 200, 409, 404]
+    assert results[0]["order"]["version"] == 2
+    assert results[1]["order"]["totalCents"] == 200
+
+    close = await client.post(
+        "/orders:close",
+        headers={"X-Tenant-Id": TENANT_ID},
+        json={"ids": [ids[0], ids[2], ids[1], "not-a-uuid"]}
+    )
+    assert close.status_code == 200
+    results = close.json()["results"]
+    assert [r["status"] for r in results] == [200, 412, 200, 400]
+    assert results[0]["order"]["status"] == OrderStatus.CLOSED.value
+
+    result = await db_session.execute(
+        text("SELECT payload FROM outbox WHERE order_id = ANY(CAST(:oids AS UUID[]))"),
+        {"oids": [uuid.UUID(ids[0]), uuid.UUID(ids[1])]}
+    )
+    totals = sorted(row.payload["totalCents"] for row in result)
+    assert totals == [100, 200]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_overlapping_bulk_transitions(test_engine):
+    """Test bulk calls listing the same orders in opposite orders neither deadlock nor fail."""
+    tenant = f"bulk-{uuid.uuid4()}"
+    session_maker = async_sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False)
+    order_ids = [uuid.uuid4() for _ in range(300)]
+    async with session_maker() as db:
+        now = datetime.now(timezone.utc)
+        await OrderRepository(db).create_drafts(tenant, [{"id": order_id, "created_at": now} for order_id in order_ids])
+        await db.commit()
+    ids = [str(order_id) for order_id in order_ids]
+
+    async def confirm(listed):
+        async with session_maker() as db:
+            return await get_order_service(db).bulk_confirm_orders(tenant, [(order_id, 1, 100) for order_id in listed])
+
+    async def close(listed):
+        async with session_maker() as db:
+            return await get_order_service(db).bulk_close_orders(tenant, listed)
+
+    try:
+        for transition in (confirm, close):
+            results = await asyncio.gather(transition(ids), transition(ids[::-1]))
+            statuses = [result["status"] for call in results for result in call]
+            # Every order moves exactly once; the other call sees it already moved
+            assert statuses.count(200) == len(ids)
+            assert set(statuses) <= {200, 409, 412}
+    finally:
+        async with session_maker() as db:
+            for table in ("outbox", "orders", "tenant_order_stats"):
+                await db.execute(text(f"DELETE FROM {table} WHERE tenant_id = :tenant"), {"tenant": tenant})
+            await db.commit()
+
+
+@pytest.mark.asyncio
+async def test_export_orders_ndjson_resume(client: AsyncClient):
+    """Test NDJSON export streams every order and resumes from a cursor."""
+    tenant = f"export-{uuid.uuid4()}"
+    for _ in range(3):
+        await client.post(
+            "/orders",
+            headers={"X-Tenant-Id": tenant, "Idempotency-Key": f"key-{uuid.uuid4()}"},
+            json={}
+        )
+
+    response = await client.get("/orders/export", headers={"X-Tenant-Id": tenant})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert len(records) == 3
+
+    resumed = await client.get(
+        "/orders/export",
+        headers={"X-Tenant-Id": tenant},
+        params={"after": records[0]["cursor"]}
+    )
+    assert [json.loads(line)["id"] for line in resumed.text.splitlines()] == [r["id"] for r in records[1:]]
+
+
+@pytest.mark.asyncio
+async def test_export_orders_csv(client: AsyncClient):
+    """Test CSV export has a header row and one row per order."""
+    tenant = f"export-{uuid.uuid4()}"
+    await client.post(
+        "/orders",
+        headers={"X-Tenant-Id": tenant, "Idempotency-Key": f"key-{uuid.uuid4()}"},
+        json={}
+    )
+
+    response = await client.get(
+        "/orders/export",
+        headers={"X-Tenant-Id": tenant},
+        params={"format": "csv", "status": "draft"}
+    )
+    assert response.status_code == 200
+    lines = response.text.splitlines()
+    assert lines[0].startswith("id,tenantId,status")
+    assert len(lines) == 2
+
+
+@pytest.mark.asyncio
+async def test_internal_pool_stats(client: AsyncClient):
+    """Test pool instrumentation endpoint reports occupancy and wait times."""
+    response = await client.get("/internal/pool")
+    assert response.status_code == 200
+    data = response.json()
+    for field in ("size", "checkedOut", "overflow", "timeouts", "waitSeconds"):
+        assert field in data
+    assert data["replicas"] == []
+
+
+@pytest.mark.asyncio
+async def test_pool_metrics_are_kept_per_pool(test_engine):
+    """Test each engine's pool counts only its own checkouts and connects, across dispose()."""
+    url = test_engine.url.render_as_string(hide_password=False)
+    primary, replica = create_engine_for(url), create_engine_for(url)
+    try:
+        for _ in range(3):
+            async with primary.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+        await primary.dispose()
+        async with primary.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+        primary_status, replica_status = pool_status(primary.pool), pool_status(replica.pool)
+        assert (primary_status["checkouts"], primary_status["connects"]) == (4, 2)
+        assert (replica_status["checkouts"], replica_status["connects"]) == (0, 0)
+    finally:
+        await primary.dispose()
+        await replica.dispose()
+
+
+@pytest.mark.asyncio
+async def test_get_order_etag_and_conditional_requests(client: AsyncClient, assert_max_queries):
+    """Test GET /orders/{id} returns an ETag, 304 on match from cache, and a new ETag after confirm."""
+    created = await client.post(
+        "/orders",
+        headers={"X-Tenant-Id": TENANT_ID, "Idempotency-Key": f"key-{uuid.uuid4()}"},
+        json={}
+    )
+    order_id = created.json()["id"]
+
+    response = await client.get(f"/orders/{order_id}", headers={"X-Tenant-Id": TENANT_ID})
+    assert response.status_code == 200
+    assert response.headers["ETag"] == '"1"'
+    assert response.json()["status"] == OrderStatus.DRAFT.value
+
+    with assert_max_queries(0):
+        not_modified = await client.get(
+            f"/orders/{order_id}",
+            headers={"X-Tenant-Id": TENANT_ID, "If-None-Match": '"1"'}
+        )
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+
+    await client.patch(
+        f"/orders/{order_id}/confirm",
+        headers={"X-Tenant-Id": TENANT_ID, "If-Match": "1"},
+        json={"totalCents": 1000}
+    )
+    changed = await client.get(
+        f"/orders/{order_id}",
+        headers={"X-Tenant-Id": TENANT_ID, "If-None-Match": '"1"'}
+    )
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] == '"2"'
+    assert changed.json()["totalCents"] == 1000
+
+
+@pytest.mark.asyncio
+async def test_get_order_with_consistency_token_skips_cache(client: AsyncClient, db_session):
+    """Test a read-your-writes GET sees a write this worker's cache has not seen."""
+    created = await client.post(
+        "/orders",
+        headers={"X-Tenant-Id": TENANT_ID, "Idempotency-Key": f"key-{uuid.uuid4()}"},
+        json={}
+    )
+    order_id = created.json()["id"]
+    await client.get(f"/orders/{order_id}", headers={"X-Tenant-Id": TENANT_ID})
+
+    # Confirmed through another worker: this worker's cache is not invalidated
+    await db_session.execute(
+        text("UPDATE orders SET status = 'CONFIRMED', total_cents = 500, version = 2 WHERE id = :oid"),
+        {"oid": order_id}
+    )
+
+    fresh = await client.get(
+        f"/orders/{order_id}",
+        headers={"X-Tenant-Id": TENANT_ID, "If-None-Match": '"1"', "X-Consistency-Token": "0/0"}
+    )
+    assert fresh.status_code == 200
+    assert fresh.headers["ETag"] == '"2"'
+    assert fresh.json()["totalCents"] == 500
+
+    # Token reads do not fill the cache either, so plain reads still see the cached version
+    cached = await client.get(f"/orders/{order_id}", headers={"X-Tenant-Id": TENANT_ID})
+    assert cached.headers["ETag"] == '"1"'
+
+
+@pytest.mark.asyncio
+async def test_get_order_not_found_for_other_tenant(client: AsyncClient):
+    """Test orders are not visible across tenants and bad ids are 404."""
+    created = await client.post(
+        "/orders",
+        headers={"X-Tenant-Id": TENANT_ID, "Idempotency-Key": f"key-{uuid.uuid4()}"},
+        json={}
+    )
+    other = await client.get(f"/orders/{created.json()['id']}", headers={"X-Tenant-Id": "other-tenant"})
+    invalid = await client.get("/orders/not-a-uuid", headers={"X-Tenant-Id": TENANT_ID})
+
+    assert other.status_code == 404
+    assert invalid.status_code == 404
@@ -0,0 +1,78 @@
+"""
+First-page list cache tests
+test_list_cache.py
+"""
+
+import asyncio
+import uuid
+import pytest
+from httpx import AsyncClient
+from app.utils.cache import TenantPageCache
+from app.workers.list_cache_invalidator import ListCacheInvalidator
+
+TENANT_ID = "list-cache-tenant"
+HEADERS = {"X-Tenant-Id": TENANT_ID}
+
+
+def test_tenant_page_cache_invalidation_and_generation_guard():
+    """Test invalidation hides a tenant's pages and stale computations are not stored."""
+    cache = TenantPageCache(maxsize=10, ttl=60)
+    published = []
+    cache.subscribe(published.append)
+
+    cache.set("t1", cache.generation("t1"), (10,), "page")
+    cache.set("t2", cache.generation("t2"), (10,), "other")
+    stale_generation = cache.generation("t1")
+    cache.invalidate("t1")
+    cache.set("t1", stale_generation, (10,), "stale")
+
+    assert cache.get("t1", (10,)) is None
+    assert cache.get("t2", (10,)) == "other"
+    assert published == ["t1"]
+
+    cache.invalidate("t2", broadcast=False)
+    assert published == ["t1"]
+
+
+@pytest.mark.asyncio
+async def test_first_page_is_cached_until_tenant_writes(client: AsyncClient, assert_max_queries):
+    """Test repeated cursorless lists hit the cache and creates invalidate it."""
+    await client.post("/orders", headers={**HEADERS, "Idempotency-Key": f"key-{uuid.uuid4()}"}, json={})
+    first = await client.get("/orders?limit=5", headers=HEADERS)
+
+    with assert_max_queries(0):
+        cached = await client.get("/orders?limit=5", headers=HEADERS)
+    assert cached.json() == first.json()
+
+    await client.post("/orders", headers={**HEADERS, "Idempotency-Key": f"key-{uuid.uuid4()}"}, json={})
+    refreshed = await client.get("/orders?limit=5", headers=HEADERS)
+    assert len(refreshed.json()["items"]) == len(first.json()["items"]) + 1
+
+
+@pytest.mark.asyncio
+async def test_invalidations_are_broadcast_between_workers(test_engine):
+    """Test an invalidation in one worker reaches another through LISTEN/NOTIFY."""
+    url = test_engine.url.render_as_string(hide_password=False)
+    channel = f"list_cache_test_{uuid.uuid4().hex[:8]}"
+    cache_a = TenantPageCache(maxsize=10, ttl=60)
+    cache_b = TenantPageCache(maxsize=10, ttl=60)
+    stop = asyncio.Event()
+    workers = [
+        asyncio.create_task(ListCacheInvalidator(cache, url, channel).run(stop))
+        for cache in (cache_a, cache_b)
+    ]
+    try:
+        await asyncio.sleep(0.2)
+        cache_b.set(TENANT_ID, cache_b.generation(TENANT_ID), (10,), "page")
+
+        cache_a.invalidate(TENANT_ID)
+
+        for _ in range(100):
+            if cache_b.get(TENANT_ID, (10,)) is None:
+                break
+            await asyncio.sleep(0.02)
+        assert cache_b.get(TENANT_ID, (10,)) is None
+        assert cache_a.generation(TENANT_ID) == 1
+    finally:
+        stop.set()
+        await asyncio.gather(*workers)
@@ -0,0 +1,55 @@
+"""
+Load harness tests
+test_load_harness.py
+"""
+
+import pytest
+from httpx import AsyncClient
+from benchmarks.load import LoadConfig, compare, parse_mix, run_load
+
+
+@pytest.mark.asyncio
+async def test_short_run_reports_every_route(client: AsyncClient):
+    """Test a short in-process run exercises the whole mix without unexpected responses."""
+    # One virtual user: the test client shares a single session
+    config = LoadConfig(duration=1.0, warmup=0.0, concurrency=1, tenants=2, key_reuse=0.3,
+                        mix=parse_mix("create=3,confirm=2,close=2,list=1"))
+
+    results = await run_load(client, config)
+
+    assert set(results["routes"]) == {"POST /orders", "PATCH /orders/{id}/confirm", "POST /orders/{id}/close", "GET /orders"}
+    assert results["total"]["errors"] == 0
+    assert results["total"]["count"] == sum(route["count"] for route in results["routes"].values())
+    assert "200" in results["routes"]["POST /orders"]["statuses"]
+
+
+def test_compare_flags_only_regressions_beyond_tolerance():
+    """Test latency, throughput and error regressions are reported and noise is not."""
+    def route(rps, p95, p99, errors=0):
+        return {"rps": rps, "p95_ms": p95, "p99_ms": p99, "errors": errors, "statuses": {}}
+
+    baseline = {"routes": {
+        "GET /orders": route(100, 10.0, 20.0),
+        "POST /orders": route(100, 0.5, 0.8),
+        "POST /orders/{id}/close": route(50, 10.0, 20.0),
+    }}
+    results = {"routes": {
+        "GET /orders": route(70, 14.0, 21.0),
+        "POST /orders": route(100, 0.9, 1.2),
+        "POST /orders/{id}/close": route(50, 10.0, 20.0, errors=3),
+    }}
+
+    regressions = compare(results, baseline, tolerance=0.25, min_delta_ms=1.0)
+
+    assert len(regressions) == 3
+    assert regressions[0].startswith("GET /orders: p95_ms 14.0")
+    assert regressions[1].startswith("GET /orders: rps 70")
+    assert regressions[2].startswith("POST /orders/{id}/close: 3 unexpected")
+    assert compare(baseline, baseline, tolerance=0.25, min_delta_ms=1.0) == []
+
+
+def test_parse_mix_rejects_unknown_operations():
+    """Test the mix only accepts known operations."""
+    assert parse_mix("create=1,list=2.5") == {"create": 1.0, "list": 2.5}
+    with pytest.raises(ValueError):
+        parse_mix("delete=1")
@@ -0,0 +1,71 @@
+"""
+Logging tests
+test_logging.py
+"""
+
+import io
+import json
+import logging
+import pytest
+from app.core.logging import SamplingFilter, set_correlation_id, set_tenant_id, setup_logging, shutdown_logging
+
+
+@pytest.fixture
+def restore_root_logger():
+    """Restore root handlers and level replaced by setup_logging."""
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    yield
+    shutdown_logging()
+    root.handlers[:] = handlers
+    root.setLevel(level)
+
+
+def test_async_json_logging_includes_context(restore_root_logger):
+    """Test queued JSON lines carry correlation id, tenant and extra latency fields."""
+    stream = io.StringIO()
+    setup_logging(log_format="json", async_mode=True, sample_rates={}, stream=stream)
+    set_correlation_id("corr-1")
+    set_tenant_id("tenant-1")
+
+    logging.getLogger("app.test").info("hello %s", "world", extra={"latency_ms": 1.5})
+    shutdown_logging()
+
+    entry = json.loads(stream.getvalue().strip())
+    assert entry["message"] == "hello world"
+    assert entry["correlation_id"] == "corr-1"
+    assert entry["tenant_id"] == "tenant-1"
+    assert entry["latency_ms"] == 1.5
+    assert entry["level"] == "INFO"
+
+
+@pytest.mark.parametrize("async_mode", [False, True])
+def test_json_exception_fields_match_in_both_modes(restore_root_logger, async_mode):
+    """Test a logged exception keeps the message and traceback as separate fields, queued or not."""
+    stream = io.StringIO()
+    setup_logging(log_format="json", async_mode=async_mode, sample_rates={}, stream=stream)
+
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logging.getLogger("app.test").exception("failed %s", "order")
+    shutdown_logging()
+
+    entry = json.loads(stream.getvalue().strip())
+    assert entry["message"] == "failed order"
+    assert entry["exc_info"].startswith("Traceback (most recent call last):")
+    assert entry["exc_info"].endswith("ValueError: boom")
+
+
+def test_sampling_drops_info_but_keeps_warnings():
+    """Test per-prefix sampling applies to INFO only and the longest prefix wins."""
+    sampler = SamplingFilter({"app.services": 0.0, "app.services.order_service.audit": 1.0})
+
+    def record(name: str, level: int) -> logging.LogRecord:
+        return logging.LogRecord(name, level, __file__, 1, "msg", None, None)
+
+    assert not sampler.filter(record("app.services.order_service", logging.INFO))
+    assert sampler.filter(record("app.services.order_service", logging.WARNING))
+    assert sampler.filter(record("app.services.order_service.audit", logging.INFO))
+    assert sampler.filter(record("app.servicesx", logging.INFO))
+    assert sampler.filter(record("app.workers", logging.INFO))
@@ -0,0 +1,64 @@
+"""
+Metrics tests
+test_metrics.py
+"""
+
+import pytest
+from httpx import AsyncClient
+from app.core.metrics import Counter, HistogramFamily
+from app.services.order_service import idempotency_cache
+
+TENANT_ID = "metrics-tenant"
+
+
+def test_histogram_family_renders_cumulative_buckets():
+    """Test exposition lines follow Prometheus histogram semantics."""
+    family = HistogramFamily("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+    family.observe(("/a",), 0.05)
+    family.observe(("/a",), 0.5)
+    family.observe(("/a",), 5)
+
+    lines = family.render()
+
+    assert '# TYPE latency_seconds histogram' in lines
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{route="/a",le="1.0"} 2' in lines
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3' in lines
+    assert 'latency_seconds_count{route="/a"} 3' in lines
+
+
+def test_counter_escapes_label_values():
+    """Test label values are escaped in exposition output."""
+    counter = Counter("events", "Events.", ("kind",))
+    counter.inc(('a"b',), 2)
+    assert 'events_total{kind="a\\"b"} 2' in counter.render()
+
+
+def test_counter_type_line_names_its_samples():
+    """Test the HELP/TYPE family name is the sample name, so Prometheus ingests a typed counter."""
+    counter = Counter("events", "Events.", ("kind",))
+    counter.inc(("a",))
+
+    lines = counter.render()
+
+    assert lines[:2] == ["# HELP events_total Events.", "# TYPE events_total counter"]
+    family = lines[1].split()[2]
+    assert all(line.split("{")[0] == family for line in lines[2:])
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_reports_requests_sql_and_idempotency(client: AsyncClient):
+    """Test /metrics exposes route latency, SQL per repository method and replay counts."""
+    idempotency_cache.clear()
+    headers = {"X-Tenant-Id": TENANT_ID, "Idempotency-Key": "metrics-key-1"}
+    await client.post("/orders", json={}, headers=headers)
+    await client.post("/orders", json={}, headers=headers)
+
+    response = await client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert 'http_request_duration_seconds_count{method="POST",route="/orders",status="201"}' in body
+    assert 'db_statement_duration_seconds_count{operation="OrderRepository.create_draft_with_idempotency_key"}' in body
+    assert 'idempotency_requests_total{outcome="replayed"}' in body
@@ -0,0 +1,28 @@
+"""
+Micro-benchmark tests
+test_micro_benchmarks.py
+"""
+
+import pstats
+import pytest
+from benchmarks.micro import BENCHMARKS, measure, profile
+
+
+@pytest.mark.parametrize("name", list(BENCHMARKS))
+def test_benchmark_runs_and_reports(name):
+    """Test every benchmark runs without a server or database and reports timing and allocations."""
+    result = measure(BENCHMARKS[name](), iterations=20, warmup=2, repeat=1)
+
+    assert result["ops_per_sec"] > 0
+    assert result["us_per_op"] > 0
+    assert result["alloc_peak_bytes"] >= 0
+
+
+def test_profile_dumps_loadable_stats(tmp_path):
+    """Test --profile output is a pstats file listing the code under test."""
+    report = profile("decode_cursor", BENCHMARKS["decode_cursor"](), 50, str(tmp_path), top=5)
+
+    path = tmp_path / "decode_cursor.prof"
+    assert report.startswith(str(path))
+    functions = {func for _, _, func in pstats.Stats(str(path)).stats}
+    assert "decode_cursor" in functions
@@ -0,0 +1,66 @@
+"""
+ASGI middleware tests
+test_middleware.py
+"""
+
+import uuid
+import pytest
+from httpx import ASGITransport, AsyncClient
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from app.core.logging import get_correlation_id
+from app.core.middleware import CorrelationIdMiddleware, TimingMiddleware
+
+TENANT_ID = "middleware-tenant"
+
+
+async def _echo_correlation_id(request):
+    return JSONResponse({"correlationId": get_correlation_id()})
+
+
+def _app() -> Starlette:
+    app = Starlette(routes=[Route("/echo", _echo_correlation_id)])
+    app.add_middleware(TimingMiddleware)
+    app.add_middleware(CorrelationIdMiddleware)
+    return app
+
+
+@pytest.mark.asyncio
+async def test_correlation_id_is_propagated_to_context_and_response():
+    """Test an incoming X-Correlation-ID is visible to the endpoint and echoed back."""
+    async with AsyncClient(transport=ASGITransport(app=_app()), base_url="http://test") as client:
+        response = await client.get("/echo", headers={"X-Correlation-ID": "abc-123"})
+
+    assert response.headers["X-Correlation-ID"] == "abc-123"
+    assert response.json() == {"correlationId": "abc-123"}
+    assert response.headers["Server-Timing"].startswith("db;dur=")
+
+
+@pytest.mark.asyncio
+async def test_correlation_id_is_generated_when_missing():
+    """Test a UUID correlation id is generated per request when none is sent."""
+    async with AsyncClient(transport=ASGITransport(app=_app()), base_url="http://test") as client:
+        first = await client.get("/echo")
+        second = await client.get("/echo")
+
+    generated = first.headers["X-Correlation-ID"]
+    assert uuid.UUID(generated)
+    assert first.json() == {"correlationId": generated}
+    assert second.headers["X-Correlation-ID"] != generated
+
+
+@pytest.mark.asyncio
+async def test_streaming_response_keeps_headers(client: AsyncClient):
+    """Test streamed exports carry the correlation id and timing headers."""
+    async with client.stream(
+        "GET",
+        "/orders/export",
+        headers={"X-Tenant-Id": TENANT_ID, "X-Correlation-ID": "stream-1"}
+    ) as response:
+        body = b"".join([chunk async for chunk in response.aiter_bytes()])
+
+    assert response.status_code == 200
+    assert response.headers["X-Correlation-ID"] == "stream-1"
+    assert "Server-Timing" in response.headers
+    assert body == b""
@@ -0,0 +1,140 @@
+"""
+Tenant order statistics tests
+test_order_stats.py
+"""
+
+import uuid
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import text
+from app.core.config import settings
+from app.models.order import OrderStatus
+from app.repositories.order_stats_repository import OrderStatsRepository
+
+TENANT_ID = "stats-tenant"
+HEADERS = {"X-Tenant-Id": TENANT_ID}
+
+
+async def _create(client: AsyncClient, tenant_id: str = TENANT_ID) -> str:
+    response = await client.post(
+        "/orders",
+        headers={"X-Tenant-Id": tenant_id, "Idempotency-Key": f"key-{uuid.uuid4()}"},
+        json={}
+    )
+    return response.json()["id"]
+
+
+def _by_status(stats: dict) -> dict:
+    return {status: (item["orderCount"], item["totalCents"]) for status, item in stats["byStatus"].items()}
+
+
+@pytest.mark.asyncio
+async def test_counters_follow_every_write_path(client: AsyncClient, assert_max_queries):
+    """Test single, batch and bulk writes keep per-status counts and totals exact."""
+    ids = [await _create(client) for _ in range(3)]
+    batch = await client.post("/orders:batch", headers=HEADERS, json={
+        "items": [{"idempotencyKey": f"key-{uuid.uuid4()}", "body": {}} for _ in range(3)]
+    })
+    ids += [result["order"]["id"] for result in batch.json()["results"]]
+    await _create(client, tenant_id="other-stats-tenant")
+
+    await client.patch(f"/orders/{ids[0]}/confirm", headers={**HEADERS, "If-Match": "1"}, json={"totalCents": 1000})
+    await client.post(f"/orders/{ids[0]}/close", headers=HEADERS)
+    await client.patch("/orders:confirm", headers=HEADERS, json={
+        "items": [{"id": order_id, "version": 1, "totalCents": 200} for order_id in ids[1:4]]
+    })
+    await client.post("/orders:close", headers=HEADERS, json={"ids": ids[1:3]})
+    # A stale confirm changes nothing
+    await client.patch(f"/orders/{ids[5]}/confirm", headers={**HEADERS, "If-Match": "7"}, json={"totalCents": 5})
+
+    with assert_max_queries(1):
+        response = await client.get("/orders/stats", headers=HEADERS)
+    stats = response.json()
+
+    assert response.status_code == 200
+    assert stats["estimated"] is False
+    assert _by_status(stats) == {"draft": (2, 0), "confirmed": (1, 200), "closed": (3, 1400)}
+    assert (stats["orderCount"], stats["totalCents"]) == (6, 1600)
+
+
+@pytest.mark.asyncio
+async def test_reconfirming_moves_counters_out_of_the_old_status(client: AsyncClient, db_session):
+    """Test confirming confirmed or closed orders takes them out of their old status and total."""
+    ids = [await _create(client) for _ in range(4)]
+    await client.patch(f"/orders/{ids[0]}/confirm", headers={**HEADERS, "If-Match": "1"}, json={"totalCents": 1000})
+    await client.patch(f"/orders/{ids[0]}/confirm", headers={**HEADERS, "If-Match": "2"}, json={"totalCents": 300})
+    await client.patch(f"/orders/{ids[1]}/confirm", headers={**HEADERS, "If-Match": "1"}, json={"totalCents": 500})
+    await client.post(f"/orders/{ids[1]}/close", headers=HEADERS)
+    await client.patch(f"/orders/{ids[1]}/confirm", headers={**HEADERS, "If-Match": "3"}, json={"totalCents": 40})
+    await client.patch("/orders:confirm", headers=HEADERS, json={"items": [
+        {"id": ids[0], "version": 3, "totalCents": 20},
+        {"id": ids[2], "version": 1, "totalCents": 7},
+    ]})
+
+    stats = (await client.get("/orders/stats", headers=HEADERS)).json()
+    result = await db_session.execute(
+        text(
+            "SELECT status, count(*), COALESCE(sum(total_cents), 0) FROM orders "
+            "WHERE tenant_id = :tenant GROUP BY status"
+        ),
+        {"tenant": TENANT_ID}
+    )
+    expected = {status.value: (0, 0) for status in OrderStatus}
+    expected.update({status.lower(): (count, cents) for status, count, cents in result})
+
+    assert expected == {"draft": (1, 0), "confirmed": (3, 67), "closed": (0, 0)}
+    assert _by_status(stats) == expected
+
+
+@pytest.mark.asyncio
+async def test_locked_create_path_counts_drafts(client: AsyncClient, monkeypatch):
+    """Test the advisory-lock create path increments the draft counter once per key."""
+    monkeypatch.setattr(settings, "idempotency_fast_path", False)
+    headers = {**HEADERS, "Idempotency-Key": f"key-{uuid.uuid4()}"}
+    await client.post("/orders", headers=headers, json={})
+    await client.post("/orders", headers=headers, json={})
+
+    stats = (await client.get("/orders/stats", headers=HEADERS)).json()
+
+    assert stats["byStatus"]["draft"] == {"orderCount": 1, "totalCents": 0}
+
+
+@pytest.mark.asyncio
+async def test_rebuild_repairs_drifted_counters(client: AsyncClient, db_session):
+    """Test reconciling recomputes counters from orders and reports the drift."""
+    order_id = await _create(client)
+    await _create(client)
+    await client.patch(f"/orders/{order_id}/confirm", headers={**HEADERS, "If-Match": "1"}, json={"totalCents": 700})
+    await db_session.execute(
+        text("UPDATE tenant_order_stats SET order_count = order_count + 5, total_cents = 1 WHERE tenant_id = :tenant"),
+        {"tenant": TENANT_ID}
+    )
+
+    repo = OrderStatsRepository(db_session)
+    drift = await repo.rebuild(TENANT_ID)
+
+    assert drift == {OrderStatus.DRAFT: (5, 1), OrderStatus.CONFIRMED: (5, -699)}
+    assert await repo.get(TENANT_ID) == {
+        OrderStatus.DRAFT: (1, 0),
+        OrderStatus.CONFIRMED: (1, 700),
+        OrderStatus.CLOSED: (0, 0),
+    }
+    assert await repo.rebuild(TENANT_ID) == {}
+    assert TENANT_ID in await repo.tenant_ids()
+
+
+@pytest.mark.asyncio
+async def test_estimated_stats_use_planner_statistics(client: AsyncClient, db_session):
+    """Test estimated mode derives counts from ANALYZE statistics and omits totals."""
+    for _ in range(6):
+        await _create(client)
+    for _ in range(2):
+        await _create(client, tenant_id="other-stats-tenant")
+    await db_session.execute(text("ANALYZE orders"))
+
+    stats = (await client.get("/orders/stats", headers=HEADERS, params={"estimate": "true"})).json()
+
+    assert stats["estimated"] is True
+    assert stats["orderCount"] == 6
+    assert stats["totalCents"] is None
+    assert stats["byStatus"]["draft"] == {"orderCount": 6, "totalCents": None}
@@ -0,0 +1,90 @@
+"""
+Outbox partition maintenance tests
+test_outbox_partitions.py
+"""
+
+import pytest
+import uuid
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import text
+from app.repositories.outbox_repository import OutboxRepository
+from app.workers.outbox_partitions import archive_expired, ensure_partitions, list_partitions, partition_name
+
+TENANT_ID = "partition-tenant"
+
+
+async def _insert_event(db_session, created_at: datetime, published: bool) -> None:
+    await db_session.execute(
+        text(
+            "INSERT INTO outbox (id, event_type, order_id, tenant_id, payload, published_at, created_at) "
+            "VALUES (:id, 'orders.closed', :oid, :tenant, '{}', :published_at, :created_at)"
+        ),
+        {
+            "id": uuid.uuid4(),
+            "oid": uuid.uuid4(),
+            "tenant": TENANT_ID,
+            "published_at": created_at if published else None,
+            "created_at": created_at,
+        },
+    )
+
+
+@pytest.mark.asyncio
+async def test_ensure_partitions_routes_new_events(db_session):
+    """Test created partitions receive rows written by the repository."""
+    conn = await db_session.connection()
+    today = datetime.now(timezone.utc).date()
+
+    created = await ensure_partitions(conn, today, 3)
+    assert created == [partition_name(today + timedelta(days=i)) for i in range(3)]
+    assert await ensure_partitions(conn, today, 3) == []
+
+    event = await OutboxRepository(db_session).create_event(
+        event_type="orders.closed",
+        order_id=uuid.uuid4(),
+        tenant_id=TENANT_ID,
+        payload={}
+    )
+    result = await db_session.execute(
+        text("SELECT tableoid::regclass::text FROM outbox WHERE id = :id"),
+        {"id": event.id}
+    )
+    assert result.scalar() == partition_name(today)
+
+
+@pytest.mark.asyncio
+async def test_archive_expired_keeps_unpublished_partitions(db_session):
+    """Test only fully published partitions past retention are dropped."""
+    conn = await db_session.connection()
+    old_day = datetime.now(timezone.utc).date() - timedelta(days=30)
+    await ensure_partitions(conn, old_day, 2)
+
+    first = datetime.combine(old_day, datetime.min.time(), tzinfo=timezone.utc) + timedelta(hours=1)
+    await _insert_event(db_session, first, published=True)
+    await _insert_event(db_session, first + timedelta(days=1), published=False)
+
+    archived = await archive_expired(conn, old_day + timedelta(days=2))
+
+    assert archived == [partition_name(old_day)]
+    remaining = await list_partitions(conn)
+    assert partition_name(old_day) not in remaining
+    assert partition_name(old_day + timedelta(days=1)) in remaining
+
+
+@pytest.mark.asyncio
+async def test_ensure_partitions_moves_rows_out_of_default(db_session):
+    """Test a partition can be created for a day whose rows already landed in the default partition."""
+    conn = await db_session.connection()
+    missed_day = datetime.now(timezone.utc).date() - timedelta(days=60)
+    stranded_at = datetime.combine(missed_day, datetime.min.time(), tzinfo=timezone.utc) + timedelta(hours=3)
+    await _insert_event(db_session, stranded_at, published=False)
+    await _insert_event(db_session, stranded_at + timedelta(days=1), published=False)
+
+    created = await ensure_partitions(conn, missed_day, 1)
+
+    assert created == [partition_name(missed_day)]
+    result = await db_session.execute(
+        text("SELECT tableoid::regclass::text FROM outbox WHERE tenant_id = :tenant AND created_at IN (:a, :b) ORDER BY created_at"),
+        {"tenant": TENANT_ID, "a": stranded_at, "b": stranded_at + timedelta(days=1)}
+    )
+    assert [row[0] for row in result] == [partition_name(missed_day), "outbox_default"]
@@ -0,0 +1,66 @@
+"""
+Outbox relay tests
+test_outbox_relay.py
+"""
+
+import pytest
+import uuid
+from httpx import AsyncClient
+from sqlalchemy import text
+from app.workers.outbox_relay import OutboxRelay
+from app.workers.sinks import QueueSink
+
+TENANT_ID = "relay-tenant"
+
+
+async def _create_closed_order(client: AsyncClient) -> str:
+    create_res = await client.post(
+        "/orders",
+        headers={"X-Tenant-Id": TENANT_ID, "Idempotency-Key": f"key-{uuid.uuid4()}"},
+        json={}
+    )
+    order_id = create_res.json()["id"]
+    await client.patch(
+        f"/orders/{order_id}/confirm",
+        headers={"X-Tenant-Id": TENANT_ID, "If-Match": "1"},
+        json={"totalCents": 1000}
+    )
+    await client.post(f"/orders/{order_id}/close", headers={"X-Tenant-Id": TENANT_ID})
+    return order_id
+
+
+@pytest.mark.asyncio
+async def test_relay_publishes_and_stamps_events(client: AsyncClient, db_session):
+    """Test relay hands events to the sink and sets published_at."""
+    order_ids = [await _create_closed_order(client) for _ in range(3)]
+
+    sink = QueueSink()
+    relay = OutboxRelay(session_maker=None, sink=sink, batch_size=10)
+    published = await relay.relay_batch(db_session)
+
+    assert published == 3
+    assert sink.queue.qsize() == 3
+    event = await sink.queue.get()
+    assert event["eventType"] == "orders.closed"
+    assert event["orderId"] in order_ids
+
+    result = await db_session.execute(
+        text("SELECT count(*) FROM outbox WHERE published_at IS NULL")
+    )
+    assert result.scalar() == 0
+    assert relay.metrics.snapshot()["events"] == 3
+
+
+@pytest.mark.asyncio
+async def test_relay_respects_batch_size(client: AsyncClient, db_session):
+    """Test relay claims at most batch_size rows and never republishes."""
+    for _ in range(3):
+        await _create_closed_order(client)
+
+    sink = QueueSink()
+    relay = OutboxRelay(session_maker=None, sink=sink, batch_size=2)
+
+    assert await relay.relay_batch(db_session) == 2
+    assert await relay.relay_batch(db_session) == 1
+    assert await relay.relay_batch(db_session) == 0
+    assert sink.queue.qsize() == 3
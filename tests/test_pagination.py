@@ -0,0 +1,137 @@
+"""
+Pagination cursor tests
+test_pagination.py
+"""
+
+import base64
+import json
+import logging
+import uuid
+from datetime import datetime, timezone
+import pytest
+from httpx import AsyncClient
+from app.core.config import settings
+from app.core.exceptions import ValidationError
+from app.utils.pagination import decode_cursor, encode_cursor, warn_if_default_cursor_secret
+
+TENANT_ID = "pagination-tenant"
+HEADERS = {"X-Tenant-Id": TENANT_ID}
+
+
+def test_cursor_round_trip_is_compact():
+    """Test cursors decode to the encoded position and stay short."""
+    created_at = datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=timezone.utc)
+    order_id = str(uuid.uuid4())
+
+    cursor = encode_cursor(created_at, order_id)
+
+    assert len(cursor) == 50
+    assert decode_cursor(cursor) == (created_at, order_id)
+
+
+def test_tampered_cursor_is_rejected():
+    """Test a cursor with a modified payload fails signature verification."""
+    cursor = encode_cursor(datetime.now(timezone.utc), str(uuid.uuid4()))
+    raw = bytearray(base64.urlsafe_b64decode(cursor + "=="))
+    raw[5] ^= 0x01
+    tampered = base64.urlsafe_b64encode(bytes(raw)).rstrip(b"=").decode()
+
+    with pytest.raises(ValidationError, match="signature"):
+        decode_cursor(tampered)
+
+
+def test_legacy_cursor_is_accepted_only_when_enabled(monkeypatch):
+    """Test base64 JSON cursors from the previous format still decode."""
+    created_at = datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc)
+    order_id = str(uuid.uuid4())
+    legacy = base64.b64encode(json.dumps({"ts": created_at.isoformat(), "id": order_id}).encode()).decode()
+
+    assert decode_cursor(legacy) == (created_at, order_id)
+
+    monkeypatch.setattr(settings, "accept_legacy_cursors", False)
+    with pytest.raises(ValidationError):
+        decode_cursor(legacy)
+
+
+def test_default_cursor_secret_is_warned_about(monkeypatch, caplog):
+    """Test startup warns only while cursors are signed with the built-in secret."""
+    with caplog.at_level(logging.WARNING, logger="app.utils.pagination"):
+        warn_if_default_cursor_secret()
+        assert any("CURSOR_SECRET is the built-in default" in r.getMessage() for r in caplog.records)
+
+        caplog.clear()
+        monkeypatch.setattr(settings, "cursor_secret", "s3cret-shared-by-workers")
+        warn_if_default_cursor_secret()
+        assert not caplog.records
+
+
+@pytest.mark.asyncio
+async def test_pages_follow_cursors_without_gaps(client: AsyncClient):
+    """Test walking pages by cursor returns every order exactly once in order."""
+    created = []
+    for _ in range(5):
+        response = await client.post("/orders", headers={**HEADERS, "Idempotency-Key": f"key-{uuid.uuid4()}"}, json={})
+        created.append(response.json()["id"])
+
+    seen = []
+    params = {"limit": 2}
+    while True:
+        page = (await client.get("/orders", headers=HEADERS, params=params)).json()
+        seen.extend(item["id"] for item in page["items"])
+        if not page["nextCursor"]:
+            break
+        params["cursor"] = page["nextCursor"]
+
+    assert seen == list(reversed(created))
+
+    cursor = params["cursor"]
+    forged = cursor[:10] + ("B" if cursor[10] != "B" else "C") + cursor[11:]
+    invalid = await client.get("/orders", headers=HEADERS, params={"cursor": forged})
+    assert invalid.status_code == 400
+
+
+async def _walk(client: AsyncClient, params: dict) -> list:
+    """Collect order ids across all pages for the given filters."""
+    seen = []
+    params = {**params, "limit": 2}
+    while True:
+        page = (await client.get("/orders", headers=HEADERS, params=params)).json()
+        seen.extend(item["id"] for item in page["items"])
+        if not page["nextCursor"]:
+            return seen
+        params["cursor"] = page["nextCursor"]
+
+
+@pytest.mark.asyncio
+async def test_filters_combine_with_keyset_pagination(client: AsyncClient):
+    """Test status, date and amount filters return exactly the matching orders across pages."""
+    marks = []
+    for total in [None, 500, 1500, None, 2500, 3500]:
+        marks.append(datetime.now(timezone.utc).isoformat())
+        response = await client.post("/orders", headers={**HEADERS, "Idempotency-Key": f"key-{uuid.uuid4()}"}, json={})
+        if total is not None:
+            await client.patch(
+                f"/orders/{response.json()['id']}/confirm",
+                headers={**HEADERS, "If-Match": "1"},
+                json={"totalCents": total}
+            )
+    newest_first = (await client.get("/orders", headers=HEADERS, params={"limit": 100})).json()["items"]
+
+    def expected(predicate):
+        return [order["id"] for order in newest_first if predicate(order)]
+
+    def priced(order, low=0, high=float("inf")):
+        return order["totalCents"] is not None and low <= order["totalCents"] <= high
+
+    assert await _walk(client, {"status": "confirmed"}) == expected(lambda o: o["status"] == "confirmed")
+    assert await _walk(client, {"status": "draft"}) == expected(lambda o: o["status"] == "draft")
+    assert await _walk(client, {"minTotalCents": 1000, "maxTotalCents": 3000}) == expected(
+        lambda o: priced(o, 1000, 3000)
+    )
+    assert await _walk(client, {"status": "confirmed", "minTotalCents": 1000}) == expected(lambda o: priced(o, 1000))
+    # The third to fifth orders were created between the third and sixth marks
+    in_range = await _walk(client, {"createdFrom": marks[2], "createdTo": marks[5]})
+    assert in_range == [order["id"] for order in newest_first[1:4]]
+
+    invalid = await client.get("/orders", headers=HEADERS, params={"minTotalCents": 10, "maxTotalCents": 5})
+    assert invalid.status_code == 400
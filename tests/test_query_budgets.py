@@ -0,0 +1,152 @@
+"""
+Per-route query budget tests
+test_query_budgets.py
+
+Each test pins the maximum number of SQL statements one request to a route
+in app/api/routers/orders.py may issue, so extra queries fail loudly.
+"""
+
+import logging
+import uuid
+import pytest
+from httpx import AsyncClient
+from app.core.config import settings
+from app.services.order_service import idempotency_cache, order_cache
+
+TENANT_ID = "budget-tenant"
+HEADERS = {"X-Tenant-Id": TENANT_ID}
+
+
+async def _create_order(client: AsyncClient) -> dict:
+    response = await client.post(
+        "/orders",
+        headers={**HEADERS, "Idempotency-Key": f"key-{uuid.uuid4()}"},
+        json={}
+    )
+    return response.json()
+
+
+async def _confirmed_order(client: AsyncClient) -> dict:
+    order = await _create_order(client)
+    await client.patch(
+        f"/orders/{order['id']}/confirm",
+        headers={**HEADERS, "If-Match": "1"},
+        json={"totalCents": 1000}
+    )
+    return order
+
+
+@pytest.mark.asyncio
+async def test_create_order_query_budget(client: AsyncClient, assert_max_queries):
+    """Test POST /orders uses one statement on a new key and none on a cached replay."""
+    idempotency_cache.clear()
+    headers = {**HEADERS, "Idempotency-Key": f"key-{uuid.uuid4()}"}
+    with assert_max_queries(1):
+        response = await client.post("/orders", headers=headers, json={})
+    assert response.status_code == 201
+
+    with assert_max_queries(0):
+        response = await client.post("/orders", headers=headers, json={})
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_batch_create_query_budget(client: AsyncClient, assert_max_queries):
+    """Test POST /orders:batch statement count does not grow with item count."""
+    items = [{"idempotencyKey": f"key-{uuid.uuid4()}", "body": {}} for _ in range(50)]
+    with assert_max_queries(3):
+        response = await client.post("/orders:batch", headers=HEADERS, json={"items": items})
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_confirm_order_query_budget(client: AsyncClient, assert_max_queries):
+    """Test PATCH /orders/{id}/confirm query budget."""
+    order = await _create_order(client)
+    with assert_max_queries(1):
+        response = await client.patch(
+            f"/orders/{order['id']}/confirm",
+            headers={**HEADERS, "If-Match": "1"},
+            json={"totalCents": 1000}
+        )
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_close_order_query_budget(client: AsyncClient, assert_max_queries):
+    """Test POST /orders/{id}/close query budget."""
+    order = await _confirmed_order(client)
+    with assert_max_queries(1):
+        response = await client.post(f"/orders/{order['id']}/close", headers=HEADERS)
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_bulk_transitions_query_budget(client: AsyncClient, assert_max_queries):
+    """Test PATCH /orders:confirm and POST /orders:close budgets for a small batch."""
+    orders = [await _create_order(client) for _ in range(5)]
+    with assert_max_queries(1):
+        response = await client.patch(
+            "/orders:confirm",
+            headers=HEADERS,
+            json={"items": [{"id": o["id"], "version": 1, "totalCents": 100} for o in orders]}
+        )
+    assert response.status_code == 200
+
+    with assert_max_queries(1):
+        response = await client.post(
+            "/orders:close",
+            headers=HEADERS,
+            json={"ids": [o["id"] for o in orders]}
+        )
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_list_and_export_query_budget(client: AsyncClient, assert_max_queries):
+    """Test GET /orders and GET /orders/export budgets."""
+    for _ in range(3):
+        await _create_order(client)
+    with assert_max_queries(1):
+        response = await client.get("/orders?limit=2", headers=HEADERS)
+    assert response.status_code == 200
+
+    with assert_max_queries(1):
+        response = await client.get("/orders/export", headers=HEADERS)
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_get_order_query_budget(client: AsyncClient, assert_max_queries):
+    """Test GET /orders/{id} uses one statement on a cache miss and none on a hit."""
+    order = await _create_order(client)
+    order_cache.clear()
+    with assert_max_queries(1):
+        response = await client.get(f"/orders/{order['id']}", headers=HEADERS)
+    assert response.status_code == 200
+
+    with assert_max_queries(0):
+        response = await client.get(f"/orders/{order['id']}", headers=HEADERS)
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_server_timing_header(client: AsyncClient):
+    """Test responses carry db, serialize and app Server-Timing entries."""
+    order = await _create_order(client)
+    response = await client.get("/orders", headers=HEADERS)
+
+    timing = response.headers["Server-Timing"]
+    assert timing.startswith("db;dur=")
+    assert "serialize;dur=" in timing
+    assert "app;dur=" in timing
+    assert order["id"]
+
+
+@pytest.mark.asyncio
+async def test_over_budget_request_is_logged(client: AsyncClient, monkeypatch, caplog):
+    """Test requests exceeding the query budget are logged with their counts."""
+    monkeypatch.setattr(settings, "request_query_budget", 0)
+    with caplog.at_level(logging.WARNING, logger="app.core.middleware"):
+        await client.get("/orders", headers=HEADERS)
+    assert any("Request over budget: GET /orders queries=1" in r.getMessage() for r in caplog.records)
@@ -0,0 +1,57 @@
+"""
+Multi-worker server tests
+test_server.py
+"""
+
+import pytest
+from app.server import MAX_RESTART_DELAY_SECONDS, Supervisor, build_config, resolve_http, resolve_loop, worker_pool_limits
+
+
+def test_worker_pool_limits_split_budget():
+    """Test the budget is shared evenly, configured sizes stay upper bounds and reserved slots come first."""
+    assert worker_pool_limits(100, 4, pool_size=10, max_overflow=10) == (10, 10)
+    assert worker_pool_limits(80, 4, pool_size=10, max_overflow=10, reserved=1) == (10, 9)
+    assert worker_pool_limits(20, 4, pool_size=10, max_overflow=10, reserved=1) == (4, 0)
+    assert worker_pool_limits(1000, 2, pool_size=10, max_overflow=5) == (10, 5)
+
+    for workers in (1, 3, 7, 16):
+        size, overflow = worker_pool_limits(50, workers, pool_size=10, max_overflow=10, reserved=1)
+        assert workers * (size + overflow + 1) <= 50
+
+    with pytest.raises(ValueError):
+        worker_pool_limits(4, 4, pool_size=10, max_overflow=10, reserved=1)
+
+
+def test_worker_pool_limits_leave_room_for_reload():
+    """Test splitting for workers + 1 keeps a reload's extra worker within the budget."""
+    for workers in (1, 2, 4, 8):
+        size, overflow = worker_pool_limits(80, workers + 1, pool_size=20, max_overflow=20, reserved=1)
+        assert (workers + 1) * (size + overflow + 1) <= 80
+
+    assert worker_pool_limits(80, 4 + 1, pool_size=10, max_overflow=10, reserved=1) == (10, 5)
+
+
+def test_restart_delay_backs_off_crash_loops():
+    """Test consecutive crashes double the restart delay up to the cap."""
+    supervisor = Supervisor(build_config("127.0.0.1", 0), workers=1)
+    delays = []
+    for crashes in range(10):
+        supervisor._crashes = crashes
+        delays.append(supervisor.restart_delay())
+
+    assert delays[:5] == [0.0, 1.0, 2.0, 4.0, 8.0]
+    assert delays[-1] == MAX_RESTART_DELAY_SECONDS
+
+
+def test_config_uses_fast_loop_and_parser_when_installed():
+    """Test "auto" resolves to uvloop/httptools here and explicit choices pass through."""
+    pytest.importorskip("uvloop")
+    pytest.importorskip("httptools")
+
+    assert resolve_loop("auto") == "uvloop"
+    assert resolve_http("auto") == "httptools"
+    assert resolve_loop("asyncio") == "asyncio"
+    assert resolve_http("h11") == "h11"
+
+    config = build_config("127.0.0.1", 0)
+    assert (config.loop, config.http, config.lifespan) == ("uvloop", "httptools", "on")
@@ -0,0 +1,73 @@
+"""
+Single-flight tests
+test_single_flight.py
+"""
+
+import asyncio
+import pytest
+from app.utils.cache import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_followers_share_the_leader_result():
+    """Test concurrent callers for a key run the function once."""
+    flights = SingleFlight()
+    calls = []
+
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "value"
+
+    results = await asyncio.gather(*(flights.do("key", load) for _ in range(3)))
+
+    assert results == [("value", False), ("value", True), ("value", True)]
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_leader_hands_over_to_a_follower():
+    """Test followers of a cancelled leader are not cancelled and one of them reloads."""
+    flights = SingleFlight()
+    started = asyncio.Event()
+    calls = []
+
+    async def load(name):
+        calls.append(name)
+        started.set()
+        await asyncio.sleep(0.05)
+        return name
+
+    leader = asyncio.create_task(flights.do("key", lambda: load("leader")))
+    await started.wait()
+    followers = [asyncio.create_task(flights.do("key", lambda i=i: load(f"follower-{i}"))) for i in range(3)]
+    await asyncio.sleep(0)
+
+    leader.cancel()
+    results = await asyncio.gather(*followers)
+
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+    assert calls == ["leader", "follower-0"]
+    assert results == [("follower-0", False), ("follower-0", True), ("follower-0", True)]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_follower_leaves_the_leader_running():
+    """Test cancelling a follower cancels only that follower."""
+    flights = SingleFlight()
+
+    async def load():
+        await asyncio.sleep(0.02)
+        return "value"
+
+    leader = asyncio.create_task(flights.do("key", load))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(flights.do("key", load))
+    await asyncio.sleep(0)
+
+    follower.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await follower
+    assert await leader == ("value", False)